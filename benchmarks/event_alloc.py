@@ -0,0 +1,63 @@
+"""
+事件对象开销基准 (Event Allocation Benchmark)
+测量 Tick/普通事件的构造耗时与单个对象内存占用
+
+用法:
+    python -m benchmarks.event_alloc [事件数]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from qtf.core.events import Event, EventType, TickEvent
+
+
+def make_ticks(n: int) -> list:
+    """构造 n 个 Tick 事件"""
+    return [
+        TickEvent(
+            type=EventType.TICK,
+            symbol="000001.SZ",
+            last_price=10.5,
+            bid_price=10.49,
+            ask_price=10.51,
+            volume=100,
+        )
+        for _ in range(n)
+    ]
+
+
+def make_events(n: int) -> list:
+    """构造 n 个普通事件"""
+    return [Event(type=EventType.BAR, data=i) for i in range(n)]
+
+
+def measure(factory, n: int) -> tuple:
+    """
+    Returns:
+        tuple: (每个事件构造耗时 ns, 每个事件内存字节数)
+    """
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        factory(n)
+        best = min(best, time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    events = factory(n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return best / n, size / n
+
+
+def main(n: int) -> None:
+    print(f"{'event':<10}{'ns/event':>12}{'bytes/event':>14}")
+    for name, factory in (("TickEvent", make_ticks), ("Event", make_events)):
+        per_event, per_bytes = measure(factory, n)
+        print(f"{name:<10}{per_event:>12,.0f}{per_bytes:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
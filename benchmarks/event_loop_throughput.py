@@ -0,0 +1,75 @@
+"""
+事件循环吞吐量基准 (Event Loop Throughput Benchmark)
+对比旧版轮询循环 (每个事件一次 wait_for(timeout=0.1)) 与批量处理循环的 events/sec
+
+用法:
+    python -m benchmarks.event_loop_throughput [事件数]
+"""
+
+import asyncio
+import sys
+import time
+from typing import Type
+
+from qtf.core.events import Event, EventType
+from qtf.engine.event_loop import EventLoop
+
+
+class PollingEventLoop(EventLoop):
+    """旧版实现: 每个事件用 wait_for 包装 queue.get()"""
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            try:
+                event = await asyncio.wait_for(self._queue.get(), timeout=0.1)
+                await self._process_event(event)
+            except asyncio.TimeoutError:
+                continue
+
+
+async def measure(loop_cls: Type[EventLoop], n_events: int, burst: bool) -> float:
+    """
+    测量吞吐量
+    Args:
+        loop_cls: 事件循环类
+        n_events: 事件数
+        burst: True 为一次性发布全部事件, False 为生产者每发布一个事件让出一次
+    Returns:
+        float: 每秒处理事件数
+    """
+    loop = loop_cls()
+    done = asyncio.Event()
+    count = 0
+
+    def handler(event: Event) -> None:
+        nonlocal count
+        count += 1
+        if count == n_events:
+            done.set()
+
+    loop.register(EventType.TICK, handler)
+    await loop.start()
+    events = [Event(type=EventType.TICK, data=i) for i in range(n_events)]
+
+    start = time.perf_counter()
+    for event in events:
+        loop.put_nowait(event)
+        if not burst:
+            await asyncio.sleep(0)
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await loop.stop()
+    return n_events / elapsed
+
+
+async def main(n_events: int) -> None:
+    print(f"{'scenario':<10}{'polling':>14}{'batched':>14}{'speedup':>10}")
+    for burst in (True, False):
+        before = await measure(PollingEventLoop, n_events, burst)
+        after = await measure(EventLoop, n_events, burst)
+        name = "burst" if burst else "trickle"
+        print(f"{name:<10}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
@@ -15,6 +15,7 @@ from qtf.core.exceptions import QTFError
 # 数据层
 from qtf.data.base import MarketDataAdapter
 from qtf.data.models import Quote, Bar
+from qtf.data.series import BarSeries
 
 # 执行层
 from qtf.execution.base import BrokerDriver
@@ -40,6 +41,7 @@ __all__ = [
     "MarketDataAdapter",
     "Quote",
     "Bar",
+    "BarSeries",
     # 执行
     "BrokerDriver",
     "Order",
@@ -23,6 +23,9 @@ STRATEGY_SYSTEM_PROMPT = """
 - self.context.get_position(symbol): 获取持仓
 - self.context.get_account(): 获取账户
 - self.context.log(message): 记录日志
+- qtf.engine.indicators 中的增量指标 (SMA、EMA、RSI、MACD、BollingerBands、ATR、RollingMax、RollingMin)：
+  在 on_init 中创建，在 on_bar 中调用 indicator.update_bar(bar) 逐根更新 (每根K线 O(1))，
+  indicator.ready 为 True 后使用 indicator.value；不要在 on_bar 中对全部历史重新计算均线等指标
 
 请确保生成的代码：
 1. 语法正确
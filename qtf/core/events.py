@@ -3,16 +3,20 @@
 定义系统中使用的各类事件及事件循环
 """
 
+import time
 from enum import Enum
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qtf.data.batch import QuoteBatch
 
 
 class EventType(Enum):
     """事件类型枚举"""
     # 行情事件
     TICK = "tick"              # 实时行情
+    TICK_BATCH = "tick_batch"  # 批量行情快照
     BAR = "bar"                # K线数据
     
     # 交易事件
@@ -31,64 +35,273 @@ class EventType(Enum):
     ENGINE_STOP = "engine_stop"
     STRATEGY_START = "strategy_start"
     STRATEGY_STOP = "strategy_stop"
+    
+    # 成员是单例，按对象哈希即可 (Enum 默认的 __hash__ 为 Python 实现，分发时开销明显)
+    __hash__ = object.__hash__
+
+
+# ============ 时间戳 ============
+# 全框架统一的时间戳约定: epoch 纳秒整数，无时区 datetime 按字面值换算
+# (与 numpy.datetime64 一致，事件 ts_ns 与 BarSeries/QuoteBatch 的时间列可直接比较)；
+# 带时区的 datetime 换算为 UTC 时刻
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+# 单调时钟与本地墙上时间 (字面值) 的偏移，每 _RESYNC_NS 重新对齐一次
+_RESYNC_NS = 1_000_000_000
+_sync_mono = 0
+_sync_offset = 0
+
+
+def _resync(mono: int) -> int:
+    """按当前系统时间与本地时区重新计算偏移"""
+    global _sync_mono, _sync_offset
+    wall = time.time_ns()
+    gmtoff = time.localtime(wall // 1_000_000_000).tm_gmtoff
+    _sync_offset = wall + gmtoff * 1_000_000_000 - mono
+    _sync_mono = mono
+    return _sync_offset
+
+
+def now_ns() -> int:
+    """
+    当前本地时间 (epoch 纳秒，字面值，与 datetime.now() 一致)
+    由单调时钟推算，每秒与系统时间重新对齐一次：
+    两次对齐之间不受系统校时影响且单调递增，漂移不会累积；
+    对齐时若系统时间被回拨 (或夏令时结束)，返回值会随之回退
+    """
+    mono = time.monotonic_ns()
+    if mono - _sync_mono >= _RESYNC_NS:
+        return mono + _resync(mono)
+    return mono + _sync_offset
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """epoch 纳秒转换为无时区 datetime (字面值，精度到微秒)"""
+    return _EPOCH + timedelta(microseconds=int(ns) // 1000)
+
+
+def datetime_to_ns(dt: Union[datetime, int]) -> int:
+    """
+    datetime 转换为 epoch 纳秒
+    无时区的 datetime 按字面值换算 (与 numpy.datetime64 一致)，整数原样返回
+    """
+    if not isinstance(dt, datetime):
+        return int(dt)
+    epoch = _EPOCH if dt.tzinfo is None else _EPOCH_UTC
+    return (dt - epoch) // _ONE_US * 1000
+
+
+def _resolve_ns(ts_ns: Optional[int], timestamp: Optional[datetime]) -> int:
+    """构造参数中的事件时间 (默认为当前时间)"""
+    if ts_ns is not None:
+        return ts_ns
+    if timestamp is not None:
+        return datetime_to_ns(timestamp)
+    return now_ns()
 
 
-@dataclass
 class Event:
     """
     事件基类
-    所有事件都继承自此类
+    所有事件都继承自此类。
+    使用 __slots__ 存储，时间戳为纪元纳秒整数 (ts_ns)，
+    timestamp 属性按需转换为 datetime；metadata 在首次访问时创建
     """
-    type: EventType
-    data: Any = None
-    timestamp: datetime = field(default_factory=datetime.now)
-    source: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    __slots__ = ("type", "data", "ts_ns", "source", "_metadata", "enqueue_ns")
+    
+    def __init__(
+        self,
+        type: Union[EventType, str],
+        data: Any = None,
+        timestamp: Optional[datetime] = None,
+        source: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        ts_ns: Optional[int] = None,
+    ):
+        """
+        Args:
+            type: 事件类型
+            data: 事件数据
+            timestamp: 事件时间 (可选)
+            source: 事件来源
+            metadata: 附加信息
+            ts_ns: 事件时间的纪元纳秒 (可选，优先于 timestamp，默认为当前时间)
+        """
+        self.type = type if type.__class__ is EventType else EventType(type)
+        self.data = data
+        self.ts_ns = _resolve_ns(ts_ns, timestamp)
+        self.source = source
+        self._metadata = metadata
+        self.enqueue_ns = 0                 # 入队时刻 (监控用)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """事件时间"""
+        return ns_to_datetime(self.ts_ns)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.ts_ns = datetime_to_ns(value)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """附加信息 (首次访问时创建)"""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
     
-    def __post_init__(self):
-        if isinstance(self.type, str):
-            self.type = EventType(self.type)
+    def _fields(self) -> Dict[str, Any]:
+        """用于 repr 的字段"""
+        fields = {"type": self.type, "data": self.data, "ts_ns": self.ts_ns}
+        if self.source is not None:
+            fields["source"] = self.source
+        for cls in type(self).__mro__[:-2]:
+            for name in cls.__slots__:
+                fields[name] = getattr(self, name)
+        return fields
+    
+    def __repr__(self) -> str:
+        args = ", ".join(f"{k}={v!r}" for k, v in self._fields().items())
+        return f"{type(self).__name__}({args})"
 
 
-@dataclass
 class TickEvent(Event):
     """Tick 行情事件"""
-    symbol: str = ""
-    last_price: float = 0.0
-    bid_price: float = 0.0
-    ask_price: float = 0.0
-    bid_volume: int = 0
-    ask_volume: int = 0
-    volume: int = 0
-    
-    def __post_init__(self):
+    __slots__ = (
+        "symbol", "last_price", "bid_price", "ask_price",
+        "bid_volume", "ask_volume", "volume",
+    )
+    
+    def __init__(
+        self,
+        type: Union[EventType, str] = EventType.TICK,
+        data: Any = None,
+        timestamp: Optional[datetime] = None,
+        source: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        symbol: str = "",
+        last_price: float = 0.0,
+        bid_price: float = 0.0,
+        ask_price: float = 0.0,
+        bid_volume: int = 0,
+        ask_volume: int = 0,
+        volume: int = 0,
+        *,
+        ts_ns: Optional[int] = None,
+    ):
         self.type = EventType.TICK
+        self.data = data
+        self.ts_ns = _resolve_ns(ts_ns, timestamp)
+        self.source = source
+        self._metadata = metadata
+        self.enqueue_ns = 0
+        self.symbol = symbol
+        self.last_price = last_price
+        self.bid_price = bid_price
+        self.ask_price = ask_price
+        self.bid_volume = bid_volume
+        self.ask_volume = ask_volume
+        self.volume = volume
+
+
+class TickBatchEvent(Event):
+    """批量行情事件 (一次推送的全市场/多标的快照)"""
+    __slots__ = ("batch",)
+    
+    def __init__(
+        self,
+        batch: "QuoteBatch",
+        source: Optional[str] = None,
+        *,
+        ts_ns: Optional[int] = None,
+    ):
+        self.type = EventType.TICK_BATCH
+        self.data = None
+        self.ts_ns = _resolve_ns(ts_ns, None)
+        self.source = source
+        self._metadata = None
+        self.enqueue_ns = 0
+        self.batch = batch
+    
+    def __len__(self) -> int:
+        return len(self.batch)
 
 
-@dataclass 
 class OrderEvent(Event):
     """订单事件"""
-    order_id: str = ""
-    symbol: str = ""
-    direction: str = ""  # BUY/SELL
-    price: float = 0.0
-    volume: int = 0
-    status: str = ""     # PENDING/FILLED/CANCELLED/REJECTED
-    
-    def __post_init__(self):
+    __slots__ = ("order_id", "symbol", "direction", "price", "volume", "status")
+    
+    def __init__(
+        self,
+        type: Union[EventType, str] = EventType.ORDER,
+        data: Any = None,
+        timestamp: Optional[datetime] = None,
+        source: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        order_id: str = "",
+        symbol: str = "",
+        direction: str = "",    # BUY/SELL
+        price: float = 0.0,
+        volume: int = 0,
+        status: str = "",       # PENDING/FILLED/CANCELLED/REJECTED
+        *,
+        ts_ns: Optional[int] = None,
+    ):
         self.type = EventType.ORDER
+        self.data = data
+        self.ts_ns = _resolve_ns(ts_ns, timestamp)
+        self.source = source
+        self._metadata = metadata
+        self.enqueue_ns = 0
+        self.order_id = order_id
+        self.symbol = symbol
+        self.direction = direction
+        self.price = price
+        self.volume = volume
+        self.status = status
 
 
-@dataclass
 class TradeEvent(Event):
     """成交事件"""
-    trade_id: str = ""
-    order_id: str = ""
-    symbol: str = ""
-    direction: str = ""
-    price: float = 0.0
-    volume: int = 0
-    commission: float = 0.0
-    
-    def __post_init__(self):
+    __slots__ = (
+        "trade_id", "order_id", "symbol", "direction", "price", "volume", "commission",
+    )
+    
+    def __init__(
+        self,
+        type: Union[EventType, str] = EventType.TRADE,
+        data: Any = None,
+        timestamp: Optional[datetime] = None,
+        source: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        trade_id: str = "",
+        order_id: str = "",
+        symbol: str = "",
+        direction: str = "",
+        price: float = 0.0,
+        volume: int = 0,
+        commission: float = 0.0,
+        *,
+        ts_ns: Optional[int] = None,
+    ):
         self.type = EventType.TRADE
+        self.data = data
+        self.ts_ns = _resolve_ns(ts_ns, timestamp)
+        self.source = source
+        self._metadata = metadata
+        self.enqueue_ns = 0
+        self.trade_id = trade_id
+        self.order_id = order_id
+        self.symbol = symbol
+        self.direction = direction
+        self.price = price
+        self.volume = volume
+        self.commission = commission
@@ -27,6 +27,11 @@ class StrategyError(QTFError):
     pass
 
 
+class CheckpointError(QTFError):
+    """回测快照相关异常"""
+    pass
+
+
 class BrokerError(QTFError):
     """券商接口相关异常"""
     pass
@@ -4,10 +4,23 @@ QTF Data Ingestion Layer
 """
 
 from qtf.data.base import MarketDataAdapter
-from qtf.data.models import Quote, Bar
+from qtf.data.models import Quote, Bar, DEPTH_LEVELS, quote_dtype
+from qtf.data.batch import QuoteBatch, SymbolTable
+from qtf.data.series import BarSeries
+from qtf.data.cache import CachedAdapter
+from qtf.data.aggregator import BarAggregator, TradingSession, CN_STOCK
 
 __all__ = [
     "MarketDataAdapter",
     "Quote",
     "Bar",
+    "DEPTH_LEVELS",
+    "quote_dtype",
+    "QuoteBatch",
+    "BarSeries",
+    "CachedAdapter",
+    "BarAggregator",
+    "TradingSession",
+    "CN_STOCK",
+    "SymbolTable",
 ]
@@ -0,0 +1,300 @@
+"""
+K线合成 (Bar Aggregator)
+由逐笔行情增量合成多周期K线，按交易时段划分K线边界，收盘时发布 BAR 事件
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from qtf.core.events import Event, EventType, datetime_to_ns
+from qtf.data.batch import QuoteBatch
+from qtf.data.models import Bar, Quote
+
+
+# 一天的微秒数
+DAY_US = 86_400_000_000
+
+_UNIT_US = {"s": 1_000_000, "m": 60_000_000, "h": 3_600_000_000, "d": DAY_US}
+
+
+def parse_interval(interval: str) -> int:
+    """
+    K线周期转换为微秒
+    Args:
+        interval: 周期 (如 30s, 1m, 5m, 1h, 1d；日线只支持 1d)
+    Returns:
+        int: 周期长度 (微秒)
+    """
+    match = re.fullmatch(r"(\d+)([smhd])", interval)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid interval: {interval}")
+    length = int(match.group(1)) * _UNIT_US[match.group(2)]
+    if length > DAY_US or (length < DAY_US and match.group(2) == "d"):
+        raise ValueError(f"Unsupported interval: {interval}")
+    return length
+
+
+def _parse_time(value: str) -> int:
+    """HH:MM[:SS] 转换为当日微秒数"""
+    parts = [int(p) for p in value.split(":")]
+    while len(parts) < 3:
+        parts.append(0)
+    hours, minutes, seconds = parts
+    return ((hours * 60 + minutes) * 60 + seconds) * 1_000_000
+
+
+@dataclass(frozen=True)
+class TradingSession:
+    """
+    交易时段
+    由若干日内连续交易段组成 (当日微秒数，闭区间)；日内K线从各段起点对齐且不跨段，
+    段末时刻 (如 11:30:00、15:00:00 的收盘快照) 计入该段最后一根K线
+    """
+    segments: Tuple[Tuple[int, int], ...]
+
+    @classmethod
+    def parse(cls, *segments: Tuple[str, str]) -> "TradingSession":
+        """
+        由 ("09:30", "11:30") 形式的时间段构造
+        Returns:
+            TradingSession: 交易时段
+        """
+        parsed = tuple(sorted((_parse_time(a), _parse_time(b)) for a, b in segments))
+        for (_, end), (start, _) in zip(parsed, parsed[1:]):
+            if start <= end:
+                raise ValueError("Trading segments overlap")
+        return cls(parsed)
+
+    @property
+    def close(self) -> int:
+        """收盘时刻 (当日微秒数)"""
+        return self.segments[-1][1]
+
+    def locate(self, us: int) -> Optional[Tuple[int, int]]:
+        """
+        时刻所在的交易段
+        Args:
+            us: 当日微秒数
+        Returns:
+            Optional[Tuple[int, int]]: (段起点, 段终点)，不在交易时段内为 None
+        """
+        for start, end in self.segments:
+            if us < start:
+                return None
+            if us <= end:
+                return start, end
+        return None
+
+
+# 全天连续交易 (日内K线按零点对齐)
+FULL_DAY = TradingSession(((0, DAY_US - 1),))
+
+# A 股连续竞价时段
+CN_STOCK = TradingSession.parse(("09:30", "11:30"), ("13:00", "15:00"))
+
+
+class _BarBuilder:
+    """合成中的K线"""
+    __slots__ = (
+        "start", "end", "accept_until",
+        "open", "high", "low", "close", "volume", "amount",
+    )
+
+    def __init__(self, start: datetime, end: datetime, accept_until: datetime, price: float):
+        self.start = start                  # 开始时间 (K线时间戳)
+        self.end = end                      # 结束时间
+        self.accept_until = accept_until    # 归入本K线的行情时间上界 (不含)
+        self.open = self.high = self.low = self.close = price
+        self.volume = 0
+        self.amount = 0.0
+
+
+class BarAggregator:
+    """
+    多周期K线合成器
+    每笔行情对每个周期 O(1) 更新 OHLCV、成交额与 VWAP；
+    行情时间越过K线边界 (或调用 advance 推进时间) 时该K线收盘，
+    通过 post 发布 BAR 事件 (data 为 Bar，事件时间为K线结束时间)。
+    交易时段外的行情不计入K线；没有成交的时段不生成空K线
+    """
+
+    def __init__(
+        self,
+        intervals: Sequence[str] = ("1m",),
+        session: TradingSession = FULL_DAY,
+        post: Optional[Callable[[Event], Any]] = None,
+        cumulative_volume: bool = False,
+    ):
+        """
+        Args:
+            intervals: K线周期列表
+            session: 交易时段
+            post: BAR 事件发布函数 (如 EventLoop.put_nowait)
+            cumulative_volume: 行情的成交量/成交额是否为当日累计值
+                (累计值取相邻两笔之差；每个标的的第一笔只作为基准)
+        """
+        lengths = {interval: parse_interval(interval) for interval in intervals}
+        self.intervals: List[str] = sorted(lengths, key=lengths.get)
+        self._lengths = [lengths[i] for i in self.intervals]
+        self.session = session
+        self.post = post
+        self.cumulative_volume = cumulative_volume
+        self._builders: Dict[str, List[Optional[_BarBuilder]]] = {}
+        self._sources: Dict[str, str] = {}
+        self._totals: Dict[str, Tuple[int, float]] = {}     # 标的 -> 上一笔累计 (量, 额)
+        self.late_ticks = 0                                 # 早于当前K线的行情数
+
+    # ============ 行情输入 ============
+
+    def on_quote(self, quote: Quote) -> List[Bar]:
+        """
+        处理一笔行情 (可直接注册为适配器的行情回调)
+        Args:
+            quote: 行情数据
+        Returns:
+            List[Bar]: 因本笔行情收盘的K线 (按周期从短到长)
+        """
+        symbol = quote.symbol
+        ts = quote.timestamp
+        price = quote.last_price
+        volume, amount = quote.volume, quote.amount
+        if self.cumulative_volume:
+            last = self._totals.get(symbol)
+            self._totals[symbol] = (volume, amount)
+            if last is None:
+                volume, amount = 0, 0.0
+            elif volume >= last[0]:
+                volume, amount = volume - last[0], amount - last[1]
+        if not amount:
+            amount = price * volume
+
+        builders = self._builders.get(symbol)
+        if builders is None:
+            builders = self._builders[symbol] = [None] * len(self._lengths)
+            self._sources[symbol] = quote.source
+        closed: List[Bar] = []
+        day: Optional[datetime] = None
+        segment: Optional[Tuple[int, int]] = None
+        us = 0
+        for i, length in enumerate(self._lengths):
+            builder = builders[i]
+            if builder is not None:
+                if builder.start <= ts < builder.accept_until:
+                    if price > builder.high:
+                        builder.high = price
+                    elif price < builder.low:
+                        builder.low = price
+                    builder.close = price
+                    builder.volume += volume
+                    builder.amount += amount
+                    continue
+                if ts < builder.start:
+                    self.late_ticks += 1
+                    continue
+                bar = self._finish(symbol, i, builder)
+                self._emit(bar, builder.end)
+                closed.append(bar)
+                builders[i] = None
+            if day is None:
+                day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+                us = (ts - day) // timedelta(microseconds=1)
+                segment = self.session.locate(us)
+            if segment is None:
+                continue
+            builder = builders[i] = self._open(day, us, segment, length, price)
+            builder.volume = volume
+            builder.amount = amount
+        return closed
+
+    def on_batch(self, batch: QuoteBatch) -> List[Bar]:
+        """
+        处理批量行情 (可直接注册为适配器的批量回调)
+        Returns:
+            List[Bar]: 收盘的K线
+        """
+        closed: List[Bar] = []
+        for quote in batch.quotes():
+            closed.extend(self.on_quote(quote))
+        return closed
+
+    def advance(self, now: datetime) -> List[Bar]:
+        """
+        推进时间，收盘所有已过结束时间的K线 (用于行情稀疏时按时钟收盘，如定时器中调用)
+        Args:
+            now: 当前时间
+        Returns:
+            List[Bar]: 收盘的K线
+        """
+        return self._close_where(lambda builder: builder.accept_until <= now)
+
+    def flush(self) -> List[Bar]:
+        """收盘所有未完成的K线 (如数据回放结束时)"""
+        return self._close_where(lambda builder: True)
+
+    # ============ 内部 ============
+
+    def _open(
+        self,
+        day: datetime,
+        us: int,
+        segment: Tuple[int, int],
+        length: int,
+        price: float,
+    ) -> _BarBuilder:
+        """按交易时段创建行情所在的K线"""
+        if length == DAY_US:
+            close = self.session.close
+            return _BarBuilder(
+                day,
+                day + timedelta(microseconds=close),
+                day + timedelta(microseconds=close + 1),
+                price,
+            )
+        seg_start, seg_end = segment
+        start = seg_start + (us - seg_start) // length * length
+        if start >= seg_end:
+            start -= length         # 段末时刻计入最后一根K线
+        end = min(start + length, seg_end)
+        accept_until = end + 1 if end == seg_end else end
+        return _BarBuilder(
+            day + timedelta(microseconds=start),
+            day + timedelta(microseconds=end),
+            day + timedelta(microseconds=accept_until),
+            price,
+        )
+
+    def _finish(self, symbol: str, index: int, builder: _BarBuilder) -> Bar:
+        """完成的K线"""
+        return Bar(
+            symbol=symbol,
+            interval=self.intervals[index],
+            timestamp=builder.start,
+            open=builder.open,
+            high=builder.high,
+            low=builder.low,
+            close=builder.close,
+            volume=builder.volume,
+            amount=builder.amount,
+            vwap=builder.amount / builder.volume if builder.volume else builder.close,
+            source=self._sources.get(symbol, ""),
+        )
+
+    def _close_where(self, predicate: Callable[[_BarBuilder], bool]) -> List[Bar]:
+        """收盘满足条件的K线"""
+        closed: List[Tuple[datetime, int, Bar]] = []
+        for symbol, builders in self._builders.items():
+            for i, builder in enumerate(builders):
+                if builder is not None and predicate(builder):
+                    closed.append((builder.end, i, self._finish(symbol, i, builder)))
+                    builders[i] = None
+        closed.sort(key=lambda item: (item[0], item[1]))
+        for end, _, bar in closed:
+            self._emit(bar, end)
+        return [bar for _, _, bar in closed]
+
+    def _emit(self, bar: Bar, end: datetime) -> None:
+        """发布 BAR 事件 (事件时间为K线结束时间)"""
+        if self.post is not None:
+            self.post(Event(EventType.BAR, bar, source=bar.source, ts_ns=datetime_to_ns(end)))
@@ -5,8 +5,12 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional, Callable, Any
+from typing import List, Optional, Callable, Any, TYPE_CHECKING
 from qtf.data.models import Quote, Bar
+from qtf.data.series import BarSeries
+
+if TYPE_CHECKING:
+    from qtf.data.batch import QuoteBatch
 
 
 class MarketDataAdapter(ABC):
@@ -18,6 +22,7 @@ class MarketDataAdapter(ABC):
     def __init__(self, name: str = ""):
         self.name = name
         self._callbacks: List[Callable] = []
+        self._batch_callbacks: List[Callable] = []
         self._connected: bool = False
     
     @property
@@ -68,7 +73,7 @@ class MarketDataAdapter(ABC):
         start: datetime,
         end: datetime,
         interval: str = "1d"
-    ) -> List[Bar]:
+    ) -> BarSeries:
         """
         获取历史K线数据
         Args:
@@ -77,7 +82,7 @@ class MarketDataAdapter(ABC):
             end: 结束时间
             interval: K线周期 (1m, 5m, 15m, 30m, 1h, 1d)
         Returns:
-            List[Bar]: K线数据列表
+            BarSeries: K线序列 (列式，可按 Bar 序列使用)
         """
         pass
     
@@ -102,11 +107,34 @@ class MarketDataAdapter(ABC):
         if callback in self._callbacks:
             self._callbacks.remove(callback)
     
+    def add_batch_callback(self, callback: Callable[["QuoteBatch"], None]) -> None:
+        """注册批量行情回调函数"""
+        if callback not in self._batch_callbacks:
+            self._batch_callbacks.append(callback)
+    
+    def remove_batch_callback(self, callback: Callable[["QuoteBatch"], None]) -> None:
+        """移除批量行情回调函数"""
+        if callback in self._batch_callbacks:
+            self._batch_callbacks.remove(callback)
+    
+    async def _on_quotes(self, batch: "QuoteBatch") -> None:
+        """
+        触发批量行情回调
+        批量回调收到整个快照；逐笔回调仍按行收到 Quote
+        """
+        for callback in self._batch_callbacks:
+            try:
+                callback(batch)
+            except Exception as e:
+                print(f"Error in quote batch callback: {e}")
+        if self._callbacks:
+            for quote in batch.quotes():
+                await self._on_quote(quote)
+    
     async def _on_quote(self, quote: Quote) -> None:
         """触发行情回调"""
         for callback in self._callbacks:
             try:
                 callback(quote)
             except Exception as e:
-                # TODO: 添加日志记录
-                pass
+                print(f"Error in quote callback: {e}")
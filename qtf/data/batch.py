@@ -0,0 +1,253 @@
+"""
+批量行情 (Quote Batch)
+全市场快照的列式表示：每个字段一个 NumPy 数组，标的以整数 ID 表示
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from qtf.core.events import now_ns, ns_to_datetime
+from qtf.data.models import Quote
+
+
+class SymbolTable:
+    """
+    标的代码表
+    标的代码与整数 ID 双向映射，ID 按首次出现顺序分配且不会改变
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._array: np.ndarray = np.empty(0, dtype=object)    # _names 的数组缓存
+        for symbol in symbols:
+            self.id(symbol)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def id(self, symbol: str) -> int:
+        """获取 (或分配) 标的 ID"""
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = self._ids[symbol] = len(self._names)
+            self._names.append(symbol)
+        return sid
+
+    def ids(self, symbols: Iterable[str]) -> np.ndarray:
+        """批量获取 (或分配) 标的 ID"""
+        return np.fromiter((self.id(s) for s in symbols), dtype=np.int32)
+
+    def name(self, sid: int) -> str:
+        """标的代码"""
+        return self._names[sid]
+
+    def names(self, ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        标的代码数组
+        Args:
+            ids: 标的 ID 数组 (可选，不传则返回全部)
+        """
+        if len(self._array) != len(self._names):
+            self._array = np.array(self._names, dtype=object)
+        return self._array.copy() if ids is None else self._array[ids]
+
+
+@dataclass
+class QuoteBatch:
+    """
+    批量行情 (列式)
+    各数组等长，第 i 行为一个标的的快照；时间戳为 epoch 纳秒
+    (无时区时间按字面值，与 numpy.datetime64 一致)
+    """
+    table: SymbolTable                  # 标的代码表
+    symbol_id: np.ndarray               # 标的 ID (int32)
+    last: np.ndarray                    # 最新价
+    bid: np.ndarray                     # 买一价
+    ask: np.ndarray                     # 卖一价
+    bid_volume: np.ndarray              # 买一量 (int64)
+    ask_volume: np.ndarray              # 卖一量 (int64)
+    volume: np.ndarray                  # 成交量 (int64)
+    amount: np.ndarray                  # 成交额
+    open: np.ndarray                    # 开盘价
+    high: np.ndarray                    # 最高价
+    low: np.ndarray                     # 最低价
+    pre_close: np.ndarray               # 昨收价
+    ts: np.ndarray                      # 时间戳 (int64, epoch 纳秒)
+    source: str = ""                    # 数据来源
+
+    def __len__(self) -> int:
+        return len(self.symbol_id)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        table: SymbolTable,
+        symbols: Sequence[str],
+        last: Sequence[float],
+        bid: Optional[Sequence[float]] = None,
+        ask: Optional[Sequence[float]] = None,
+        bid_volume: Optional[Sequence[int]] = None,
+        ask_volume: Optional[Sequence[int]] = None,
+        volume: Optional[Sequence[int]] = None,
+        ts: Optional[Sequence[int]] = None,
+        source: str = "",
+        amount: Optional[Sequence[float]] = None,
+        open: Optional[Sequence[float]] = None,
+        high: Optional[Sequence[float]] = None,
+        low: Optional[Sequence[float]] = None,
+        pre_close: Optional[Sequence[float]] = None,
+    ) -> "QuoteBatch":
+        """
+        由原始数组构造 (缺省的买卖价、数量、成交额、开高低与昨收取 0 (与 Quote 一致)，
+        时间取当前时间)
+        Args:
+            table: 标的代码表
+            symbols: 标的代码
+            last: 最新价
+            ts: 时间戳 (epoch 纳秒)
+        Returns:
+            QuoteBatch: 批量行情
+        """
+        last = np.asarray(last, dtype=np.float64)
+        n = len(last)
+        zeros = np.zeros(n, dtype=np.int64)
+        nil = np.zeros(n, dtype=np.float64)
+
+        def column(values: Optional[Sequence], default: np.ndarray, dtype: type) -> np.ndarray:
+            return default.copy() if values is None else np.asarray(values, dtype=dtype)
+
+        if ts is None:
+            ts = np.full(n, now_ns(), dtype=np.int64)
+        return cls(
+            table=table,
+            symbol_id=table.ids(symbols),
+            last=last,
+            bid=column(bid, nil, np.float64),
+            ask=column(ask, nil, np.float64),
+            bid_volume=column(bid_volume, zeros, np.int64),
+            ask_volume=column(ask_volume, zeros, np.int64),
+            volume=column(volume, zeros, np.int64),
+            amount=column(amount, nil, np.float64),
+            open=column(open, nil, np.float64),
+            high=column(high, nil, np.float64),
+            low=column(low, nil, np.float64),
+            pre_close=column(pre_close, nil, np.float64),
+            ts=np.asarray(ts, dtype=np.int64),
+            source=source,
+        )
+
+    @classmethod
+    def from_quotes(
+        cls,
+        quotes: Sequence[Quote],
+        table: Optional[SymbolTable] = None,
+    ) -> "QuoteBatch":
+        """
+        由 Quote 列表构造
+        Args:
+            quotes: 行情列表
+            table: 标的代码表 (可选，默认新建)
+        Returns:
+            QuoteBatch: 批量行情
+        """
+        table = table if table is not None else SymbolTable()
+        n = len(quotes)
+        return cls(
+            table=table,
+            symbol_id=table.ids(q.symbol for q in quotes),
+            last=np.fromiter((q.last_price for q in quotes), np.float64, n),
+            bid=np.fromiter((q.bid_prices[0] for q in quotes), np.float64, n),
+            ask=np.fromiter((q.ask_prices[0] for q in quotes), np.float64, n),
+            bid_volume=np.fromiter((q.bid_volumes[0] for q in quotes), np.int64, n),
+            ask_volume=np.fromiter((q.ask_volumes[0] for q in quotes), np.int64, n),
+            volume=np.fromiter((q.volume for q in quotes), np.int64, n),
+            amount=np.fromiter((q.amount for q in quotes), np.float64, n),
+            open=np.fromiter((q.open_price for q in quotes), np.float64, n),
+            high=np.fromiter((q.high_price for q in quotes), np.float64, n),
+            low=np.fromiter((q.low_price for q in quotes), np.float64, n),
+            pre_close=np.fromiter((q.pre_close for q in quotes), np.float64, n),
+            ts=np.array([q.timestamp for q in quotes], dtype="datetime64[ns]").view(np.int64),
+            source=quotes[0].source if quotes else "",
+        )
+
+    @property
+    def symbols(self) -> np.ndarray:
+        """标的代码数组"""
+        return self.table.names(self.symbol_id)
+
+    @property
+    def mid(self) -> np.ndarray:
+        """中间价"""
+        return (self.bid + self.ask) / 2.0
+
+    def take(self, index: np.ndarray) -> "QuoteBatch":
+        """
+        按行选取 (布尔掩码或下标)
+        Returns:
+            QuoteBatch: 子集 (共享代码表)
+        """
+        return QuoteBatch(
+            table=self.table,
+            symbol_id=self.symbol_id[index],
+            last=self.last[index],
+            bid=self.bid[index],
+            ask=self.ask[index],
+            bid_volume=self.bid_volume[index],
+            ask_volume=self.ask_volume[index],
+            volume=self.volume[index],
+            amount=self.amount[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            pre_close=self.pre_close[index],
+            ts=self.ts[index],
+            source=self.source,
+        )
+
+    def quote(self, i: int) -> Quote:
+        """第 i 行转换为 Quote"""
+        return Quote(
+            symbol=self.table.name(int(self.symbol_id[i])),
+            last_price=float(self.last[i]),
+            timestamp=ns_to_datetime(int(self.ts[i])),
+            bid_prices=(float(self.bid[i]),),
+            bid_volumes=(int(self.bid_volume[i]),),
+            ask_prices=(float(self.ask[i]),),
+            ask_volumes=(int(self.ask_volume[i]),),
+            volume=int(self.volume[i]),
+            amount=float(self.amount[i]),
+            open_price=float(self.open[i]),
+            high_price=float(self.high[i]),
+            low_price=float(self.low[i]),
+            pre_close=float(self.pre_close[i]),
+            source=self.source,
+        )
+
+    def quotes(self) -> Iterator[Quote]:
+        """逐行生成 Quote (兼容逐笔处理的代码)"""
+        for i in range(len(self)):
+            yield self.quote(i)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """转换为 DataFrame (按标的代码索引)"""
+        return pd.DataFrame({
+            "last": self.last,
+            "bid": self.bid,
+            "ask": self.ask,
+            "bid_volume": self.bid_volume,
+            "ask_volume": self.ask_volume,
+            "volume": self.volume,
+            "amount": self.amount,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "pre_close": self.pre_close,
+            "timestamp": self.ts.view("datetime64[ns]"),
+        }, index=pd.Index(self.symbols, name="symbol"))
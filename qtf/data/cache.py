@@ -0,0 +1,303 @@
+"""
+历史数据缓存 (History Cache)
+包装任意数据适配器，将K线按 标的/周期 存为可内存映射的列式文件，
+并记录已覆盖的时间区间，重复请求只向上游拉取缺失部分
+"""
+
+import asyncio
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from qtf.core.events import datetime_to_ns, now_ns, ns_to_datetime
+from qtf.data.aggregator import DAY_US, parse_interval
+from qtf.data.base import MarketDataAdapter
+from qtf.data.models import Quote
+from qtf.data.series import BAR_COLUMNS, BarSeries
+
+
+# 区间边界精度 (纳秒)：请求时间为 datetime，精度到微秒
+_STEP = 1000
+
+# 时间区间 (epoch 纳秒，闭区间)
+Range = Tuple[int, int]
+
+
+def settled_until(interval: str) -> int:
+    """
+    已收盘K线的最晚时间戳 (当前时间减一个周期；更晚的K线可能尚未发布或仍在变化)
+    Args:
+        interval: K线周期 (周线、月线等无法解析的周期按 31 天计)
+    Returns:
+        int: epoch 纳秒
+    """
+    try:
+        length = parse_interval(interval)
+    except ValueError:
+        length = 31 * DAY_US
+    return now_ns() - length * 1000
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """
+    合并重叠或相邻的区间
+    Args:
+        ranges: 区间列表
+    Returns:
+        List[Range]: 按起点排序且互不相邻的区间
+    """
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + _STEP:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: List[Range], start: int, end: int) -> List[Range]:
+    """
+    [start, end] 中未被覆盖的部分
+    Args:
+        covered: 已覆盖区间 (已合并)
+        start: 开始时间
+        end: 结束时间
+    Returns:
+        List[Range]: 缺失区间
+    """
+    gaps: List[Range] = []
+    cursor = start
+    for lo, hi in covered:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo - _STEP))
+        cursor = hi + _STEP
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class CachedAdapter(MarketDataAdapter):
+    """
+    带磁盘缓存的数据适配器
+    每个 标的/周期 一个 .npy 文件 (7×n 的 int64 数组，按列存储，价格列按位存放 float64)，
+    读取时以内存映射打开，返回的 BarSeries 为文件上的零拷贝视图；
+    同名 .json 记录已覆盖的请求区间 (无数据的时段如休市同样计为已覆盖)。
+    实时行情、订阅与回调直接转交上游适配器
+    """
+
+    def __init__(
+        self,
+        upstream: MarketDataAdapter,
+        cache_dir: str,
+        name: str = "",
+    ):
+        """
+        Args:
+            upstream: 上游数据适配器
+            cache_dir: 缓存目录
+            name: 适配器名称 (默认取上游名称)
+        """
+        super().__init__(name or upstream.name)
+        self.upstream = upstream
+        self.cache_dir = cache_dir
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ============ 转交上游 ============
+
+    @property
+    def connected(self) -> bool:
+        """上游是否已连接"""
+        return self.upstream.connected
+
+    async def connect(self) -> bool:
+        return await self.upstream.connect()
+
+    async def disconnect(self) -> None:
+        await self.upstream.disconnect()
+
+    async def subscribe(self, symbols: List[str]) -> bool:
+        return await self.upstream.subscribe(symbols)
+
+    async def unsubscribe(self, symbols: List[str]) -> bool:
+        return await self.upstream.unsubscribe(symbols)
+
+    async def get_quote(self, symbol: str) -> Optional[Quote]:
+        return await self.upstream.get_quote(symbol)
+
+    def add_callback(self, callback: Callable[[Any], None]) -> None:
+        self.upstream.add_callback(callback)
+
+    def remove_callback(self, callback: Callable[[Any], None]) -> None:
+        self.upstream.remove_callback(callback)
+
+    def add_batch_callback(self, callback: Callable) -> None:
+        self.upstream.add_batch_callback(callback)
+
+    def remove_batch_callback(self, callback: Callable) -> None:
+        self.upstream.remove_batch_callback(callback)
+
+    # ============ 历史数据 ============
+
+    async def get_history(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "1d"
+    ) -> BarSeries:
+        """
+        获取历史K线 (缓存未覆盖的区间向上游拉取后写入缓存)
+        只缓存并记录已收盘的部分 (见 settled_until)，更近的K线每次向上游重新拉取
+        Args:
+            symbol: 标的代码
+            start: 开始时间
+            end: 结束时间
+            interval: K线周期
+        Returns:
+            BarSeries: K线序列 (缓存文件上的只读视图；含未收盘的K线时为拷贝)
+        """
+        lo, hi = datetime_to_ns(start), datetime_to_ns(end)
+        key = (symbol, interval)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        recent: List[BarSeries] = []
+        async with lock:
+            covered = self._load_ranges(symbol, interval)
+            gaps = missing_ranges(covered, lo, hi)
+            if gaps:
+                fetched = await asyncio.gather(*(
+                    self.upstream.get_history(
+                        symbol, ns_to_datetime(a), ns_to_datetime(b), interval
+                    )
+                    for a, b in gaps
+                ))
+                settled = settled_until(interval) // _STEP * _STEP
+                done: List[Range] = []
+                parts = []
+                for (a, b), bars in zip(gaps, fetched):
+                    series = BarSeries.from_bars(bars, symbol, interval)
+                    if a <= settled:
+                        done.append((a, min(b, settled)))
+                        parts.append(series.between(a, min(b, settled)))
+                    if b > settled:
+                        recent.append(series.between(max(a, settled + _STEP), b))
+                if done:
+                    self._store(symbol, interval, parts, merge_ranges(covered + done))
+            result = self.load(symbol, interval).between(lo, hi)
+        if any(len(part) for part in recent):
+            # 未收盘部分不写入缓存，直接拼接在缓存数据之后
+            result = BarSeries(
+                symbol=symbol,
+                interval=interval,
+                source=self.upstream.name,
+                **{
+                    name: np.concatenate([getattr(s, name) for s in [result] + recent])
+                    for name, _ in BAR_COLUMNS
+                },
+            )
+        return result
+
+    def coverage(self, symbol: str, interval: str = "1d") -> List[Tuple[datetime, datetime]]:
+        """
+        已缓存的时间区间
+        Returns:
+            List[Tuple[datetime, datetime]]: (开始, 结束) 列表
+        """
+        return [
+            (ns_to_datetime(a), ns_to_datetime(b))
+            for a, b in self._load_ranges(symbol, interval)
+        ]
+
+    def invalidate(self, symbol: str, interval: str = "1d") -> None:
+        """删除指定 标的/周期 的缓存"""
+        for path in (self._index_path(symbol, interval), self._data_path(symbol, interval)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load(self, symbol: str, interval: str = "1d") -> BarSeries:
+        """
+        以内存映射读取已缓存的全部K线
+        Returns:
+            BarSeries: K线序列 (只读视图)
+        """
+        path = self._data_path(symbol, interval)
+        if not os.path.exists(path):
+            return BarSeries.empty(symbol, interval, self.upstream.name)
+        data = np.load(path, mmap_mode="r")
+        return self._series(symbol, interval, data)
+
+    # ============ 文件读写 ============
+
+    def _key(self, symbol: str, interval: str) -> str:
+        """文件名 (去除路径分隔符等字符)"""
+        return re.sub(r"[^\w.\-]", "_", f"{symbol}_{interval}")
+
+    def _data_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(symbol, interval)}.npy")
+
+    def _index_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(symbol, interval)}.json")
+
+    def _load_ranges(self, symbol: str, interval: str) -> List[Range]:
+        """读取已覆盖区间 (数据文件缺失时视为未覆盖)"""
+        path = self._index_path(symbol, interval)
+        if not os.path.exists(path) or not os.path.exists(self._data_path(symbol, interval)):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return [tuple(r) for r in json.load(f)["ranges"]]
+
+    def _series(self, symbol: str, interval: str, data: np.ndarray) -> BarSeries:
+        """7×n 数组的各行视图组成K线序列"""
+        columns = {
+            name: data[i] if dtype is np.int64 else data[i].view(np.float64)
+            for i, (name, dtype) in enumerate(BAR_COLUMNS)
+        }
+        return BarSeries(symbol=symbol, interval=interval, source=self.upstream.name, **columns)
+
+    def _store(
+        self,
+        symbol: str,
+        interval: str,
+        parts: List[BarSeries],
+        ranges: List[Range],
+    ) -> None:
+        """
+        合并新数据并写入缓存 (同一时间戳以新数据为准)
+        先写数据文件再写索引，均为原子替换；中途崩溃只会少记覆盖区间
+        """
+        series = [self.load(symbol, interval)] + parts
+        columns = [
+            np.concatenate([getattr(s, name) for s in series]).astype(dtype, copy=False)
+            for name, dtype in BAR_COLUMNS
+        ]
+        ts = columns[0]
+        order = np.argsort(ts, kind="stable")
+        keep = np.ones(len(ts), dtype=bool)
+        keep[:-1] = ts[order][1:] != ts[order][:-1]     # 重复时间戳保留最后一条
+        rows = order[keep]
+        data = np.empty((len(BAR_COLUMNS), len(rows)), dtype=np.int64)
+        for i, column in enumerate(columns):
+            data[i] = column[rows].view(np.int64)
+
+        path = self._data_path(symbol, interval)
+        with open(f"{path}.tmp", "wb") as f:
+            np.save(f, data)
+        os.replace(f"{path}.tmp", path)
+
+        index = self._index_path(symbol, interval)
+        with open(f"{index}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"symbol": symbol, "interval": interval, "ranges": ranges}, f)
+        os.replace(f"{index}.tmp", index)
@@ -3,57 +3,287 @@
 定义行情相关的数据结构
 """
 
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from math import isnan
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# 默认盘口档数
+DEPTH_LEVELS = 5
+
+_NAN = float("nan")
+_BOOK_ATTRS = ("bid_prices", "bid_volumes", "ask_prices", "ask_volumes")
+
+
+def quote_dtype(levels: int = DEPTH_LEVELS) -> np.dtype:
+    """
+    原始行情记录的结构化类型 (小端，紧凑排列，可直接映射行情源缓冲区)
+    时间戳为 epoch 纳秒 (无时区时间按字面值，与 numpy.datetime64 一致)；
+    缺失的档位价格为 NaN
+    Args:
+        levels: 盘口档数
+    Returns:
+        np.dtype: 记录类型
+    """
+    return np.dtype([
+        ("symbol", "S16"),
+        ("ts", "<i8"),
+        ("last_price", "<f8"),
+        ("bid_price", "<f8", (levels,)),
+        ("bid_volume", "<i8", (levels,)),
+        ("ask_price", "<f8", (levels,)),
+        ("ask_volume", "<i8", (levels,)),
+        ("open_price", "<f8"),
+        ("high_price", "<f8"),
+        ("low_price", "<f8"),
+        ("pre_close", "<f8"),
+        ("volume", "<i8"),
+        ("amount", "<f8"),
+    ])
+
+
+# 各档数的空盘口模板: 一档价格为 0.0，其余档为 NaN (缺失)
+_EMPTY_PRICES: Dict[int, array] = {}
+
+
+def _empty_prices(levels: int) -> array:
+    """空盘口价格数组 (副本)"""
+    template = _EMPTY_PRICES.get(levels)
+    if template is None:
+        template = _EMPTY_PRICES[levels] = array("d", [0.0] + [_NAN] * (levels - 1))
+    return array("d", template)
+
+
+def _book(values: Optional[Sequence], levels: int, typecode: str) -> array:
+    """按档数截断/补齐为定长数组 (价格补 NaN，数量补 0)"""
+    if values is None:
+        return _empty_prices(levels) if typecode == "d" else array("q", bytes(8 * levels))
+    if typecode == "d":
+        book = array("d", values[:levels])
+    else:
+        book = array("q", [int(v) for v in values[:levels]])
+    if len(book) < levels:
+        book.extend([_NAN if typecode == "d" else 0] * (levels - len(book)))
+    return book
 
 
-@dataclass
 class Quote:
     """
     实时行情数据
+    买卖盘为定长数组 (bid_prices/bid_volumes/ask_prices/ask_volumes，第 i 个元素为第 i+1 档)，
+    缺失档位价格为 NaN；兼容原字段名 bid_price_1 ... ask_volume_5 (缺失的 2 档以上返回 None)
     """
-    symbol: str                          # 标的代码
-    last_price: float                    # 最新价
-    timestamp: datetime = field(default_factory=datetime.now)
+    __slots__ = (
+        "symbol", "last_price", "timestamp",
+        "bid_prices", "bid_volumes", "ask_prices", "ask_volumes",
+        "open_price", "high_price", "low_price", "pre_close", "volume", "amount",
+        "source",
+    )
     
-    # 买卖盘
-    bid_price_1: float = 0.0            # 买一价
-    bid_volume_1: int = 0               # 买一量
-    ask_price_1: float = 0.0            # 卖一价
-    ask_volume_1: int = 0               # 卖一量
+    def __init__(
+        self,
+        symbol: str,                                # 标的代码
+        last_price: float,                          # 最新价
+        timestamp: Optional[datetime] = None,
+        bid_price_1: Optional[float] = None,        # 兼容字段 (沿用原位置参数顺序)
+        bid_volume_1: Optional[int] = None,
+        ask_price_1: Optional[float] = None,
+        ask_volume_1: Optional[int] = None,
+        bid_price_2: Optional[float] = None,
+        bid_volume_2: Optional[int] = None,
+        ask_price_2: Optional[float] = None,
+        ask_volume_2: Optional[int] = None,
+        bid_price_3: Optional[float] = None,
+        bid_volume_3: Optional[int] = None,
+        ask_price_3: Optional[float] = None,
+        ask_volume_3: Optional[int] = None,
+        bid_price_4: Optional[float] = None,
+        bid_volume_4: Optional[int] = None,
+        ask_price_4: Optional[float] = None,
+        ask_volume_4: Optional[int] = None,
+        bid_price_5: Optional[float] = None,
+        bid_volume_5: Optional[int] = None,
+        ask_price_5: Optional[float] = None,
+        ask_volume_5: Optional[int] = None,
+        open_price: float = 0.0,                    # 开盘价
+        high_price: float = 0.0,                    # 最高价
+        low_price: float = 0.0,                     # 最低价
+        pre_close: float = 0.0,                     # 昨收价
+        volume: int = 0,                            # 成交量
+        amount: float = 0.0,                        # 成交额
+        source: str = "",                           # 数据来源
+        *,
+        bid_prices: Optional[Sequence[float]] = None,   # 各档买价
+        bid_volumes: Optional[Sequence[int]] = None,    # 各档买量
+        ask_prices: Optional[Sequence[float]] = None,   # 各档卖价
+        ask_volumes: Optional[Sequence[int]] = None,    # 各档卖量
+        levels: int = DEPTH_LEVELS,                 # 盘口档数
+    ):
+        self.symbol = symbol
+        self.last_price = last_price
+        self.timestamp = timestamp if timestamp is not None else datetime.now()
+        self.bid_prices = _book(bid_prices, levels, "d")
+        self.bid_volumes = _book(bid_volumes, levels, "q")
+        self.ask_prices = _book(ask_prices, levels, "d")
+        self.ask_volumes = _book(ask_volumes, levels, "q")
+        self.open_price = open_price
+        self.high_price = high_price
+        self.low_price = low_price
+        self.pre_close = pre_close
+        self.volume = volume
+        self.amount = amount
+        self.source = source
+        depth = (
+            bid_price_1, bid_volume_1, ask_price_1, ask_volume_1,
+            bid_price_2, bid_volume_2, ask_price_2, ask_volume_2,
+            bid_price_3, bid_volume_3, ask_price_3, ask_volume_3,
+            bid_price_4, bid_volume_4, ask_price_4, ask_volume_4,
+            bid_price_5, bid_volume_5, ask_price_5, ask_volume_5,
+        )
+        for name, value in zip(_DEPTH_FIELDS, depth):
+            if value is not None:
+                setattr(self, name, value)
     
-    # 五档行情 (可选)
-    bid_price_2: Optional[float] = None
-    bid_volume_2: Optional[int] = None
-    ask_price_2: Optional[float] = None
-    ask_volume_2: Optional[int] = None
+    @property
+    def levels(self) -> int:
+        """盘口档数"""
+        return len(self.bid_prices)
     
-    bid_price_3: Optional[float] = None
-    bid_volume_3: Optional[int] = None
-    ask_price_3: Optional[float] = None
-    ask_volume_3: Optional[int] = None
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: Union[bytes, bytearray, memoryview, np.ndarray],
+        levels: int = DEPTH_LEVELS,
+        source: str = "",
+    ) -> List["Quote"]:
+        """
+        由原始行情缓冲区批量构造 (记录格式见 quote_dtype)
+        Args:
+            buffer: 连续的记录缓冲区或 quote_dtype 结构化数组
+            levels: 盘口档数
+            source: 数据来源
+        Returns:
+            List[Quote]: 行情列表
+        """
+        dtype = quote_dtype(levels)
+        if isinstance(buffer, np.ndarray):
+            records = buffer.astype(dtype, copy=False)
+        else:
+            records = np.frombuffer(buffer, dtype=dtype)
+        n = len(records)
+        symbols = np.char.decode(records["symbol"], "ascii").tolist()
+        timestamps = records["ts"].astype("datetime64[ns]").astype("datetime64[us]").tolist()
+        # 各档数组按行取连续字节，直接构造定长数组
+        books = [
+            np.ascontiguousarray(records[name]).tobytes()
+            for name in ("bid_price", "bid_volume", "ask_price", "ask_volume")
+        ]
+        stride = 8 * levels
+        columns = zip(
+            symbols, timestamps,
+            records["last_price"].tolist(),
+            records["open_price"].tolist(),
+            records["high_price"].tolist(),
+            records["low_price"].tolist(),
+            records["pre_close"].tolist(),
+            records["volume"].tolist(),
+            records["amount"].tolist(),
+        )
+        new = cls.__new__
+        quotes = []
+        for i, (symbol, ts, last, open_, high, low, pre_close, volume, amount) in enumerate(columns):
+            quote = new(cls)
+            offset = i * stride
+            quote.symbol = symbol
+            quote.timestamp = ts
+            quote.last_price = last
+            for attr, typecode, raw in zip(_BOOK_ATTRS, "dqdq", books):
+                book = array(typecode)
+                book.frombytes(raw[offset:offset + stride])
+                setattr(quote, attr, book)
+            quote.open_price = open_
+            quote.high_price = high
+            quote.low_price = low
+            quote.pre_close = pre_close
+            quote.volume = volume
+            quote.amount = amount
+            quote.source = source
+            quotes.append(quote)
+        return quotes
     
-    bid_price_4: Optional[float] = None
-    bid_volume_4: Optional[int] = None
-    ask_price_4: Optional[float] = None
-    ask_volume_4: Optional[int] = None
+    def _state(self) -> Tuple:
+        """比较用的字段值 (缺失档位的 NaN 视为相等)"""
+        state = []
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, array):
+                value = tuple(None if v != v else v for v in value)
+            state.append(value)
+        return tuple(state)
     
-    bid_price_5: Optional[float] = None
-    bid_volume_5: Optional[int] = None
-    ask_price_5: Optional[float] = None
-    ask_volume_5: Optional[int] = None
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Quote):
+            return NotImplemented
+        return self._state() == other._state()
     
-    # 统计数据
-    open_price: float = 0.0             # 开盘价
-    high_price: float = 0.0             # 最高价
-    low_price: float = 0.0              # 最低价
-    pre_close: float = 0.0              # 昨收价
-    volume: int = 0                     # 成交量
-    amount: float = 0.0                 # 成交额
+    __hash__ = None  # type: ignore[assignment]
     
-    # 数据源
-    source: str = ""                    # 数据来源
+    def __repr__(self) -> str:
+        return (
+            f"Quote(symbol={self.symbol!r}, last_price={self.last_price!r}, "
+            f"timestamp={self.timestamp!r}, bid_prices={self.bid_prices.tolist()!r}, "
+            f"bid_volumes={self.bid_volumes.tolist()!r}, ask_prices={self.ask_prices.tolist()!r}, "
+            f"ask_volumes={self.ask_volumes.tolist()!r}, open_price={self.open_price!r}, "
+            f"high_price={self.high_price!r}, low_price={self.low_price!r}, "
+            f"pre_close={self.pre_close!r}, volume={self.volume!r}, amount={self.amount!r}, "
+            f"source={self.source!r})"
+        )
+
+
+def _depth_property(attr: str, index: int, is_volume: bool) -> property:
+    """原字段名 (如 bid_price_2) 到定长数组元素的兼容属性"""
+    price_attr = attr.replace("volumes", "prices")
+    
+    def getter(self: Quote) -> Any:
+        book = getattr(self, attr)
+        if index >= len(book):
+            return None
+        if index and isnan(getattr(self, price_attr)[index]):
+            return None
+        return book[index]
+    
+    def setter(self: Quote, value: Any) -> None:
+        if index >= len(getattr(self, attr)):
+            if value is None:
+                return
+            raise ValueError(
+                f"Quote has {len(getattr(self, attr))} depth levels, cannot set level {index + 1}"
+            )
+        if value is None:
+            if is_volume:
+                getattr(self, attr)[index] = 0
+            else:
+                getattr(self, attr)[index] = 0.0 if index == 0 else _NAN
+        else:
+            getattr(self, attr)[index] = int(value) if is_volume else value
+    
+    return property(getter, setter)
+
+
+# 兼容字段: 名称 -> 属性
+_DEPTH_FIELDS: Dict[str, property] = {}
+for _level in range(1, DEPTH_LEVELS + 1):
+    for _side in ("bid", "ask"):
+        for _kind in ("price", "volume"):
+            _DEPTH_FIELDS[f"{_side}_{_kind}_{_level}"] = _depth_property(
+                f"{_side}_{_kind}s", _level - 1, _kind == "volume"
+            )
+for _name, _prop in _DEPTH_FIELDS.items():
+    setattr(Quote, _name, _prop)
 
 
 @dataclass
@@ -0,0 +1,283 @@
+"""
+K线序列 (Bar Series)
+单个标的K线的列式表示：每个字段一个连续 NumPy 数组，
+切片为零拷贝视图，逐根访问时按需生成 Bar
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+import numpy as np
+import pandas as pd
+
+from qtf.core.events import datetime_to_ns
+from qtf.data.models import Bar
+
+
+# 列名及类型 (时间戳为 epoch 纳秒)
+BAR_COLUMNS = (
+    ("ts", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.int64),
+    ("amount", np.float64),
+)
+
+# 逐根迭代时每次转换的行数
+_ITER_CHUNK = 4096
+
+
+def _to_ns(value: Union[datetime, np.datetime64, int]) -> int:
+    """时间转换为 epoch 纳秒 (无时区时间按字面值)"""
+    if isinstance(value, np.datetime64):
+        return int(value.astype("datetime64[ns]").astype(np.int64))
+    return datetime_to_ns(value)
+
+
+@dataclass(eq=False)
+class BarSeries:
+    """
+    K线序列 (列式)
+    各数组等长且按时间升序；时间戳为 epoch 纳秒
+    (无时区时间按字面值，与 numpy.datetime64 一致)。
+    可当作 Bar 序列使用 (len/下标/迭代)，兼容按 List[Bar] 处理的代码
+    """
+    symbol: str                         # 标的代码
+    interval: str                       # 周期
+    ts: np.ndarray                      # 时间戳 (int64, epoch 纳秒)
+    open: np.ndarray                    # 开盘价
+    high: np.ndarray                    # 最高价
+    low: np.ndarray                     # 最低价
+    close: np.ndarray                   # 收盘价
+    volume: np.ndarray                  # 成交量 (int64)
+    amount: np.ndarray                  # 成交额
+    source: str = ""                    # 数据来源
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbol: str,
+        interval: str,
+        ts: Sequence,
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Optional[Sequence[int]] = None,
+        amount: Optional[Sequence[float]] = None,
+        source: str = "",
+    ) -> "BarSeries":
+        """
+        由原始数组构造 (缺省的成交量/成交额取 0)
+        Args:
+            symbol: 标的代码
+            interval: 周期
+            ts: 时间戳 (epoch 纳秒整数、datetime64 或 datetime)
+        Returns:
+            BarSeries: K线序列
+        """
+        ts = np.asarray(ts)
+        if ts.dtype != np.int64:
+            ts = ts.astype("datetime64[ns]").view(np.int64)
+        n = len(ts)
+        return cls(
+            symbol=symbol,
+            interval=interval,
+            ts=ts,
+            open=np.asarray(open, dtype=np.float64),
+            high=np.asarray(high, dtype=np.float64),
+            low=np.asarray(low, dtype=np.float64),
+            close=np.asarray(close, dtype=np.float64),
+            volume=np.zeros(n, np.int64) if volume is None else np.asarray(volume, dtype=np.int64),
+            amount=np.zeros(n, np.float64) if amount is None else np.asarray(amount, dtype=np.float64),
+            source=source,
+        )
+
+    @classmethod
+    def from_bars(
+        cls,
+        bars: Iterable[Bar],
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None,
+    ) -> "BarSeries":
+        """
+        由 Bar 列表构造
+        Args:
+            bars: K线列表 (按时间升序)
+            symbol: 标的代码 (可选，默认取第一根K线)
+            interval: 周期 (可选，默认取第一根K线)
+        Returns:
+            BarSeries: K线序列
+        """
+        if isinstance(bars, BarSeries):
+            return bars
+        bars = list(bars)
+        n = len(bars)
+        first = bars[0] if bars else None
+        return cls(
+            symbol=symbol if symbol is not None else (first.symbol if first else ""),
+            interval=interval if interval is not None else (first.interval if first else ""),
+            ts=np.array([b.timestamp for b in bars], dtype="datetime64[ns]").view(np.int64),
+            open=np.fromiter((b.open for b in bars), np.float64, n),
+            high=np.fromiter((b.high for b in bars), np.float64, n),
+            low=np.fromiter((b.low for b in bars), np.float64, n),
+            close=np.fromiter((b.close for b in bars), np.float64, n),
+            volume=np.fromiter((b.volume for b in bars), np.int64, n),
+            amount=np.fromiter((b.amount for b in bars), np.float64, n),
+            source=first.source if first else "",
+        )
+
+    @classmethod
+    def from_pandas(
+        cls,
+        df: pd.DataFrame,
+        symbol: str,
+        interval: str,
+        source: str = "",
+    ) -> "BarSeries":
+        """
+        由 DataFrame 构造 (按时间索引，列为 open/high/low/close/volume/amount)
+        Args:
+            df: K线数据
+            symbol: 标的代码
+            interval: 周期
+        Returns:
+            BarSeries: K线序列
+        """
+        return cls.from_arrays(
+            symbol,
+            interval,
+            df.index.values,
+            df["open"].to_numpy(),
+            df["high"].to_numpy(),
+            df["low"].to_numpy(),
+            df["close"].to_numpy(),
+            df["volume"].to_numpy() if "volume" in df else None,
+            df["amount"].to_numpy() if "amount" in df else None,
+            source=source,
+        )
+
+    @classmethod
+    def empty(cls, symbol: str = "", interval: str = "", source: str = "") -> "BarSeries":
+        """空序列"""
+        return cls(symbol, interval, *(np.empty(0, dtype) for _, dtype in BAR_COLUMNS), source=source)
+
+    # ============ 序列接口 ============
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @overload
+    def __getitem__(self, index: int) -> Bar: ...
+
+    @overload
+    def __getitem__(self, index: Union[slice, np.ndarray]) -> "BarSeries": ...
+
+    def __getitem__(self, index):
+        """
+        下标取单根 Bar；切片返回零拷贝视图，布尔掩码/下标数组返回副本
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.bar(int(index))
+        return self._take(index)
+
+    def __iter__(self) -> Iterator[Bar]:
+        """逐根生成 Bar (分块转换，不整体展开)"""
+        for start in range(0, len(self), _ITER_CHUNK):
+            yield from self[start:start + _ITER_CHUNK].to_bars()
+
+    def _take(self, index: Union[slice, np.ndarray]) -> "BarSeries":
+        """按行选取"""
+        return BarSeries(
+            symbol=self.symbol,
+            interval=self.interval,
+            ts=self.ts[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            amount=self.amount[index],
+            source=self.source,
+        )
+
+    def bar(self, i: int) -> Bar:
+        """第 i 根K线"""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("BarSeries index out of range")
+        return Bar(
+            symbol=self.symbol,
+            interval=self.interval,
+            timestamp=np.datetime64(int(self.ts[i]), "ns").astype("datetime64[us]").item(),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+            amount=float(self.amount[i]),
+            source=self.source,
+        )
+
+    def to_bars(self) -> List[Bar]:
+        """转换为 Bar 列表"""
+        rows = zip(
+            self.ts.view("datetime64[ns]").astype("datetime64[us]").tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            self.amount.tolist(),
+        )
+        symbol, interval, source = self.symbol, self.interval, self.source
+        return [
+            Bar(symbol=symbol, interval=interval, timestamp=t, open=o, high=h,
+                low=l, close=c, volume=v, amount=a, source=source)
+            for t, o, h, l, c, v, a in rows
+        ]
+
+    # ============ 查询 ============
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """时间戳 (datetime64[ns] 视图)"""
+        return self.ts.view("datetime64[ns]")
+
+    def between(
+        self,
+        start: Optional[Union[datetime, np.datetime64, int]] = None,
+        end: Optional[Union[datetime, np.datetime64, int]] = None,
+    ) -> "BarSeries":
+        """
+        按时间范围切片 (闭区间，零拷贝)
+        Args:
+            start: 开始时间 (可选)
+            end: 结束时间 (可选)
+        Returns:
+            BarSeries: 视图
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.ts, _to_ns(start)))
+        hi = len(self) if end is None else int(
+            np.searchsorted(self.ts, _to_ns(end), side="right")
+        )
+        return self[lo:hi]
+
+    def to_pandas(self) -> pd.DataFrame:
+        """转换为 DataFrame (按时间索引)"""
+        return pd.DataFrame(
+            {
+                "open": self.open,
+                "high": self.high,
+                "low": self.low,
+                "close": self.close,
+                "volume": self.volume,
+                "amount": self.amount,
+            },
+            index=pd.DatetimeIndex(self.timestamps, name="timestamp"),
+            copy=False,
+        )
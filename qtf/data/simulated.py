@@ -8,8 +8,12 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+import numpy as np
+
 from qtf.data.base import MarketDataAdapter
+from qtf.data.batch import QuoteBatch, SymbolTable
 from qtf.data.models import Quote, Bar
+from qtf.data.series import BarSeries
 
 
 class SimulatedAdapter(MarketDataAdapter):
@@ -59,27 +63,31 @@ class SimulatedAdapter(MarketDataAdapter):
         start: datetime,
         end: datetime,
         interval: str = "1d"
-    ) -> List[Bar]:
+    ) -> BarSeries:
         """获取历史 (模拟)"""
-        bars = []
+        dates = []
+        prices = []
+        volumes = []
         current = start
         price = 100.0
         while current <= end:
             price = price * (1 + random.uniform(-0.02, 0.02))
-            bar = Bar(
-                symbol=symbol,
-                interval=interval,
-                timestamp=current,
-                open=price,
-                high=price * 1.01,
-                low=price * 0.99,
-                close=price,
-                volume=random.randint(1000, 10000),
-                source=self.name
-            )
-            bars.append(bar)
+            dates.append(current)
+            prices.append(price)
+            volumes.append(random.randint(1000, 10000))
             current += timedelta(days=1)
-        return bars
+        close = np.array(prices)
+        return BarSeries.from_arrays(
+            symbol,
+            interval,
+            np.array(dates, dtype="datetime64[ns]"),
+            open=close,
+            high=close * 1.01,
+            low=close * 0.99,
+            close=close,
+            volume=volumes,
+            source=self.name,
+        )
     
     async def get_quote(self, symbol: str) -> Optional[Quote]:
         """获取快照"""
@@ -92,28 +100,32 @@ class SimulatedAdapter(MarketDataAdapter):
         )
 
     async def _run_simulation(self):
-        """运行模拟生成器"""
+        """运行模拟生成器 (每轮推送一次全部标的的批量快照)"""
+        table = SymbolTable()
         while self._running:
-            for symbol in list(self._prices.keys()):
+            symbols = list(self._prices.keys())
+            if symbols:
                 # 随机波动
-                old_price = self._prices[symbol]
-                change = random.uniform(-0.005, 0.005)
-                new_price = old_price * (1 + change)
-                self._prices[symbol] = new_price
+                old_prices = np.array([self._prices[s] for s in symbols])
+                changes = np.array([random.uniform(-0.005, 0.005) for _ in symbols])
+                new_prices = old_prices * (1 + changes)
+                self._prices.update(zip(symbols, new_prices.tolist()))
                 
-                # 生成 Quote
-                quote = Quote(
-                    symbol=symbol,
-                    last_price=new_price,
-                    open_price=old_price,
-                    high_price=max(old_price, new_price),
-                    low_price=min(old_price, new_price),
-                    volume=random.randint(1, 100),
-                    timestamp=datetime.now(),
-                    source=self.name
+                # 生成批量快照并推送
+                volumes = np.array([random.randint(1, 100) for _ in symbols])
+                batch = QuoteBatch.from_arrays(
+                    table,
+                    symbols,
+                    last=new_prices,
+                    bid=new_prices,
+                    ask=new_prices,
+                    volume=volumes,
+                    source=self.name,
+                    amount=new_prices * volumes,
+                    open=old_prices,
+                    high=np.maximum(old_prices, new_prices),
+                    low=np.minimum(old_prices, new_prices),
                 )
-                
-                # 推送
-                await self._on_quote(quote)
+                await self._on_quotes(batch)
             
             await asyncio.sleep(1)  # 1秒推送一次
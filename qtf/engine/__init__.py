@@ -5,12 +5,76 @@ QTF Strategy Engine
 
 from qtf.engine.base import BaseStrategy
 from qtf.engine.context import StrategyContext
+from qtf.engine.clock import Clock, WallClock, VirtualClock
 from qtf.engine.event_loop import EventLoop
-from qtf.engine.backtest import BacktestEngine
+from qtf.engine.event_queue import (
+    PriorityEventQueue,
+    DEFAULT_LANES,
+    OverflowPolicy,
+    QueueLimit,
+)
+from qtf.engine.sharded import ShardedEventLoop
+from qtf.engine.timer_wheel import TimerWheel, WheelTimer, timer_router
+from qtf.engine.instrumentation import EventLoopStats, LogHistogram
+from qtf.engine.backtest import BacktestEngine, BacktestResult
+from qtf.engine.columnar import GrowableArray, TradeLog, TRADE_DTYPE
+from qtf.engine.feed import merge_bars, amerge_bars
+from qtf.engine.metrics import MetricsAccumulator
+from qtf.engine.optimize import ParameterSweep, SharedBarData
+from qtf.engine.robustness import run_monte_carlo, RobustnessReport
+from qtf.engine.walkforward import WalkForwardOptimizer
+from qtf.engine.vectorized import vectorized_backtest, VectorizedResult
+from qtf.engine.indicators import (
+    Indicator,
+    SMA,
+    EMA,
+    RSI,
+    MACD,
+    BollingerBands,
+    ATR,
+    RollingMax,
+    RollingMin,
+)
 
 __all__ = [
     "BaseStrategy",
     "StrategyContext",
+    "Clock",
+    "WallClock",
+    "VirtualClock",
     "EventLoop",
+    "PriorityEventQueue",
+    "DEFAULT_LANES",
+    "OverflowPolicy",
+    "QueueLimit",
+    "ShardedEventLoop",
+    "TimerWheel",
+    "WheelTimer",
+    "timer_router",
+    "EventLoopStats",
+    "LogHistogram",
     "BacktestEngine",
+    "BacktestResult",
+    "GrowableArray",
+    "TradeLog",
+    "TRADE_DTYPE",
+    "merge_bars",
+    "amerge_bars",
+    "MetricsAccumulator",
+    "ParameterSweep",
+    "SharedBarData",
+    "run_monte_carlo",
+    "RobustnessReport",
+    "WalkForwardOptimizer",
+    "vectorized_backtest",
+    "VectorizedResult",
+    "Indicator",
+    "SMA",
+    "EMA",
+    "RSI",
+    "MACD",
+    "BollingerBands",
+    "ATR",
+    "RollingMax",
+    "RollingMin",
 ]
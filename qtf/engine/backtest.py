@@ -3,15 +3,48 @@
 历史数据驱动的回测系统
 """
 
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Optional, Any, Sequence, TYPE_CHECKING
 from datetime import datetime
 from dataclasses import dataclass, field
 
+import numpy as np
+import pandas as pd
+
+from qtf.core.events import Event, datetime_to_ns
+from qtf.core.exceptions import CheckpointError
+from qtf.data.series import BarSeries
+from qtf.engine.checkpoint import save_snapshot, load_snapshot
+from qtf.engine.clock import VirtualClock
+from qtf.engine.timer_wheel import TimerWheel
+from qtf.engine.columnar import (
+    TRADE_DTYPE,
+    check_symbol,
+    datetimes_to_ns,
+    trades_to_records,
+)
+from qtf.engine.context import StrategyContext
+from qtf.engine.feed import (
+    BarSource,
+    merge_bars,
+    amerge_bars,
+    is_async_source,
+    skip_bars,
+)
+from qtf.engine.metrics import MetricsAccumulator
+from qtf.engine.vectorized import vectorized_backtest, signals_to_positions
+from qtf.execution.matching import MatchingEngine, Fill
+from qtf.execution.models import OrderDirection
+from qtf.execution.simulated import SimulatedAccount
+
 if TYPE_CHECKING:
     from qtf.engine.base import BaseStrategy
     from qtf.data.models import Bar
 
 
+# 快照中不保存的策略属性
+_STRATEGY_EXCLUDED_STATE = ("context", "name", "params")
+
+
 @dataclass
 class BacktestResult:
     """回测结果"""
@@ -31,18 +64,185 @@ class BacktestResult:
     lose_trades: int = 0                # 亏损次数
     win_rate: float = 0.0               # 胜率
     
-    # 资金曲线
-    equity_curve: List[float] = field(default_factory=list)
-    dates: List[datetime] = field(default_factory=list)
+    # 资金曲线 (float64 权益, int64 epoch 纳秒时间戳)
+    equity_curve: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64)
+    )
+    dates: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.int64)
+    )
+    curve_stride: int = 1               # 资金曲线抽样步长 (1 为逐根K线，大于 1 时相邻点间隔多根K线)
+    
+    # 详细交易记录 (结构化数组, 字段见 TRADE_DTYPE)
+    trades: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=TRADE_DTYPE)
+    )
+    
+    # ============ 导出 ============
+    
+    def to_pandas(self) -> pd.DataFrame:
+        """资金曲线转 DataFrame (以时间为索引, 不复制数据)"""
+        index = pd.DatetimeIndex(self.dates.view("datetime64[ns]"), name="timestamp")
+        return pd.DataFrame({"equity": self.equity_curve}, index=index, copy=False)
+    
+    def trades_to_pandas(self) -> pd.DataFrame:
+        """成交记录转 DataFrame"""
+        frame = pd.DataFrame(self.trades, copy=False)
+        frame["timestamp"] = self.trades["timestamp"].view("datetime64[ns]")
+        return frame
+    
+    def trade_records(self) -> List[Dict[str, Any]]:
+        """成交记录转字典列表"""
+        return trades_to_records(self.trades)
+    
+    def save_npz(self, path: str) -> None:
+        """
+        保存为 .npz 文件
+        Args:
+            path: 文件路径
+        """
+        np.savez(
+            path,
+            equity_curve=self.equity_curve,
+            dates=self.dates,
+            trades=self.trades,
+            curve_stride=np.array(self.curve_stride),
+            meta=np.array([
+                self.strategy_name,
+                self.start_date.isoformat(),
+                self.end_date.isoformat(),
+            ]),
+            metrics=np.array([
+                self.total_return, self.annual_return,
+                self.max_drawdown, self.sharpe_ratio,
+                self.total_trades, self.win_trades,
+                self.lose_trades, self.win_rate,
+            ]),
+        )
+    
+    @classmethod
+    def load_npz(cls, path: str) -> "BacktestResult":
+        """
+        从 .npz 文件加载
+        Args:
+            path: 文件路径
+        """
+        with np.load(path) as data:
+            name, start, end = data["meta"].tolist()
+            metrics = data["metrics"].tolist()
+            return cls(
+                strategy_name=name,
+                start_date=datetime.fromisoformat(start),
+                end_date=datetime.fromisoformat(end),
+                total_return=metrics[0],
+                annual_return=metrics[1],
+                max_drawdown=metrics[2],
+                sharpe_ratio=metrics[3],
+                total_trades=int(metrics[4]),
+                win_trades=int(metrics[5]),
+                lose_trades=int(metrics[6]),
+                win_rate=metrics[7],
+                equity_curve=data["equity_curve"],
+                dates=data["dates"],
+                trades=data["trades"],
+                curve_stride=int(data["curve_stride"]) if "curve_stride" in data else 1,
+            )
+    
+    def to_parquet(self, path: str, trades_path: Optional[str] = None) -> None:
+        """
+        保存为 Parquet 文件 (需要安装 pyarrow)
+        Args:
+            path: 资金曲线文件路径
+            trades_path: 成交记录文件路径 (可选)
+        """
+        self.to_pandas().to_parquet(path)
+        if trades_path:
+            self.trades_to_pandas().to_parquet(trades_path)
+
+
+class StrategySlot:
+    """
+    组合回测中单个策略的运行状态
+    每个策略拥有独立的上下文、模拟撮合、子账户和绩效统计
+    """
+    
+    def __init__(
+        self,
+        strategy: "BaseStrategy",
+        capital: float,
+        engine: "BacktestEngine",
+    ):
+        self.strategy = strategy
+        self.capital = capital
+        if strategy.context is None:
+            strategy.set_context(StrategyContext(strategy_id=strategy.name))
+        self.context: StrategyContext = strategy.context
+        self.clock = engine.clock
+        self.timer_wheel = engine.timer_wheel
+        self.matcher = MatchingEngine(engine.commission, engine.slippage)
+        self.account = SimulatedAccount(capital, account_id=strategy.name)
+        self.metrics = engine._new_metrics(capital)
+        self.bind()
+    
+    def bind(self) -> None:
+        """将虚拟时钟、定时器、模拟撮合和子账户注入策略上下文"""
+        self.context.clock = self.clock
+        self.context.timer_wheel = self.timer_wheel
+        self.context.matching_engine = self.matcher
+        self.context.sim_account = self.account
+    
+    def on_fill(self, fill: Fill) -> None:
+        """处理成交回报"""
+        pnl = self.account.apply_fill(fill)
+        self.metrics.record_trade(
+            fill.timestamp,
+            fill.symbol,
+            1 if fill.direction == OrderDirection.BUY else -1,
+            fill.price,
+            fill.volume,
+            fill.commission,
+            pnl,
+        )
+        self.strategy.on_trade(fill)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """快照状态"""
+        return {
+            "matcher": self.matcher,
+            "account": self.account,
+            "metrics": self.metrics,
+            "variables": self.context._variables,
+            # 等待中的定时器: 定时器ID -> (周期起点, 周期, 下次到期时间)，纪元纳秒
+            "timers": {
+                timer_id: (timer.start_ns, timer.interval_ns, timer.deadline_ns)
+                for timer_id, timer in self.context._timers.items()
+                if timer.pending
+            },
+            "strategy_state": {
+                key: value for key, value in self.strategy.__dict__.items()
+                if key not in _STRATEGY_EXCLUDED_STATE
+            },
+        }
     
-    # 详细交易记录
-    trades: List[Dict[str, Any]] = field(default_factory=list)
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """从快照恢复"""
+        self.matcher = state["matcher"]
+        self.account = state["account"]
+        self.metrics = state["metrics"]
+        self.strategy.__dict__.update(state["strategy_state"])
+        self.context._variables = state["variables"]
+        self.bind()
+        # 定时器重新加入当前时间轮 (周期起点不变，恢复后按原节奏继续触发)
+        self.context._timers = {
+            timer_id: self.timer_wheel.restore(timer_id, self.context.strategy_id, *timer)
+            for timer_id, timer in state.get("timers", {}).items()
+        }
 
 
 class BacktestEngine:
     """
     回测引擎
-    基于历史数据驱动策略运行
+    基于历史数据驱动策略运行；可同时挂载多个策略，一次遍历数据分发给所有策略
     """
     
     def __init__(
@@ -50,29 +250,93 @@ class BacktestEngine:
         initial_capital: float = 100000.0,
         commission: float = 0.0003,     # 手续费率
         slippage: float = 0.0001,       # 滑点
+        periods_per_year: int = 252,    # 每年K线数量
+        keep_equity_curve: bool = True, # 是否保留资金曲线
+        keep_trades: bool = True,       # 是否保留逐笔成交记录
+        curve_downsample: int = 1,      # 资金曲线抽样步长
+        max_curve_points: Optional[int] = None,  # 资金曲线最大点数
+        checkpoint_path: Optional[str] = None,   # 快照文件路径
+        checkpoint_every: int = 0,      # 每处理 N 根K线保存快照 (0 为不保存)
     ):
         self.initial_capital = initial_capital
         self.commission = commission
         self.slippage = slippage
+        self.periods_per_year = periods_per_year
+        self.keep_equity_curve = keep_equity_curve
+        self.keep_trades = keep_trades
+        self.curve_downsample = curve_downsample
+        self.max_curve_points = max_curve_points
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
         
-        self._strategy: Optional["BaseStrategy"] = None
-        self._data: Dict[str, List["Bar"]] = {}
+        self._strategies: List["BaseStrategy"] = []
+        self._capitals: List[float] = []
+        self._data: Dict[str, BarSource] = {}
         self._current_index: int = 0
         self._result: Optional[BacktestResult] = None
+        self._results: Dict[str, BacktestResult] = {}
+        
+        # 回测运行状态
+        self._start_date: Optional[datetime] = None
+        self._end_date: Optional[datetime] = None
+        self._first_time: Optional[datetime] = None
+        self._last_time: Optional[datetime] = None
+        self._slots: List[StrategySlot] = []
+        self._portfolio: Optional[MetricsAccumulator] = None
+        self._cursors: Dict[str, int] = {}      # 各标的已消费K线数
+        self._resume_state: Optional[Dict[str, Any]] = None
+        self.clock = VirtualClock()             # 回测时钟 (随K线时间推进)
+        self.timer_wheel = TimerWheel(self.clock, self._on_timer_event)
+    
+    @property
+    def _strategy(self) -> Optional["BaseStrategy"]:
+        """第一个策略 (单策略回测)"""
+        return self._strategies[0] if self._strategies else None
     
     def set_strategy(self, strategy: "BaseStrategy") -> None:
-        """设置回测策略"""
-        self._strategy = strategy
+        """设置回测策略 (替换已添加的所有策略)"""
+        self._strategies = [strategy]
+        self._capitals = [self.initial_capital]
+    
+    def add_strategy(
+        self,
+        strategy: "BaseStrategy",
+        capital: Optional[float] = None,
+    ) -> None:
+        """
+        添加策略 (组合回测)
+        Args:
+            strategy: 策略
+            capital: 子账户初始资金 (可选, 默认 initial_capital)
+        """
+        if any(s.name == strategy.name for s in self._strategies):
+            raise ValueError(f"Duplicate strategy name: {strategy.name}")
+        self._strategies.append(strategy)
+        self._capitals.append(self.initial_capital if capital is None else capital)
     
-    def add_data(self, symbol: str, bars: List["Bar"]) -> None:
+    def add_data(self, symbol: str, bars: BarSource) -> None:
         """
         添加历史数据
+        可传入 BarSeries (逐根按需生成 Bar，向量化回测直接使用其列数组)；
+        除列表外也可传入按时间升序的迭代器或异步生成器，回测时按需拉取，
+        不会整体载入内存 (迭代器只能被回测消费一次)
         Args:
             symbol: 标的代码
-            bars: K线数据列表
+            bars: K线序列、K线数据列表、迭代器或异步迭代器
         """
         self._data[symbol] = bars
     
+    def _new_metrics(self, capital: float) -> MetricsAccumulator:
+        """创建绩效统计器"""
+        return MetricsAccumulator(
+            capital,
+            periods_per_year=self.periods_per_year,
+            keep_curve=self.keep_equity_curve,
+            keep_trades=self.keep_trades,
+            downsample=self.curve_downsample,
+            max_points=self.max_curve_points,
+        )
+    
     async def run(
         self,
         start_date: Optional[datetime] = None,
@@ -80,31 +344,330 @@ class BacktestEngine:
     ) -> BacktestResult:
         """
         运行回测
+        多策略时返回组合结果，各策略结果通过 get_results() 获取
         Args:
             start_date: 开始日期 (可选)
             end_date: 结束日期 (可选)
         Returns:
             BacktestResult: 回测结果
         """
-        if not self._strategy:
+        if not self._strategies:
             raise ValueError("Strategy not set")
         
         if not self._data:
             raise ValueError("No data loaded")
         
-        # TODO: 实现完整的回测逻辑
-        # 1. 初始化策略
-        # 2. 按时间顺序遍历历史数据
-        # 3. 触发策略的 on_bar 回调
-        # 4. 模拟订单撮合
-        # 5. 计算绩效指标
+        state = self._resume_state
+        sources = self._data
+        if state is not None:
+            # 从快照恢复: 各数据源跳过已消费部分，不重放历史
+            sources = {
+                symbol: skip_bars(source, state["cursors"].get(symbol, 0))
+                for symbol, source in self._data.items()
+            }
         
-        self._result = BacktestResult(
-            strategy_name=self._strategy.name,
-            start_date=start_date or datetime.now(),
-            end_date=end_date or datetime.now(),
+        # 按时间归并各标的数据流；预读第一根K线以确定虚拟时钟起点
+        is_async = any(is_async_source(source) for source in sources.values())
+        feed = amerge_bars(sources) if is_async else merge_bars(sources)
+        first = await self._peek(feed, is_async)
+        if state is not None and state["last_time"] is not None:
+            origin: Optional[datetime] = state["last_time"]
+        else:
+            # 未指定开始日期时从第一根K线起步 (on_init 中设置的定时器不会从纪元零点补触发)
+            times = [t for t in (start_date, first.timestamp if first else None) if t is not None]
+            origin = max(times) if times else None
+        
+        self.clock = VirtualClock(datetime_to_ns(origin) if origin else 0)
+        self.timer_wheel = TimerWheel(self.clock, self._on_timer_event)
+        self._slots = [
+            StrategySlot(strategy, capital, self)
+            for strategy, capital in zip(self._strategies, self._capitals)
+        ]
+        if state is not None:
+            self._restore(state, start_date, end_date)
+            self._resume_state = None
+        else:
+            self._cursors = {}
+            self._current_index = 0
+            self._start_date = start_date
+            self._end_date = end_date
+            self._first_time = None
+            self._last_time = None
+            self._portfolio = (
+                self._new_metrics(sum(self._capitals)) if len(self._slots) > 1 else None
+            )
+            for slot in self._slots:
+                slot.strategy.on_init()
+                slot.strategy._initialized = True
+        
+        for slot in self._slots:
+            slot.strategy.on_start()
+            slot.strategy._running = True
+        
+        try:
+            # 逐根推送给策略
+            if first is not None and self._on_bar(first):
+                if is_async:
+                    async for bar in feed:
+                        if not self._on_bar(bar):
+                            break
+                else:
+                    for bar in feed:
+                        if not self._on_bar(bar):
+                            break
+        finally:
+            for slot in self._slots:
+                slot.strategy.on_stop()
+                slot.strategy._running = False
+        
+        self._result = self._build_result()
+        return self._result
+    
+    @staticmethod
+    async def _peek(feed: Any, is_async: bool) -> Optional["Bar"]:
+        """取出数据流的第一根K线 (数据流为空时返回 None)"""
+        if is_async:
+            try:
+                return await feed.__anext__()
+            except StopAsyncIteration:
+                return None
+        return next(feed, None)
+    
+    def _on_bar(self, bar: "Bar") -> bool:
+        """
+        处理单根K线
+        Returns:
+            bool: 是否继续回测
+        """
+        if self._end_date and bar.timestamp > self._end_date:
+            return False
+        self._cursors[bar.symbol] = self._cursors.get(bar.symbol, 0) + 1
+        if self._start_date and bar.timestamp < self._start_date:
+            return True
+        
+        if bar.timestamp != self._last_time:
+            # 新时间点: 记录上一时间点的权益
+            if self._last_time is not None:
+                self._record_equity(self._last_time)
+            else:
+                self._first_time = bar.timestamp
+            self._last_time = bar.timestamp
+            # 推进虚拟时钟，先触发到期的定时器
+            self.clock.advance(datetime_to_ns(bar.timestamp))
+        
+        self._current_index += 1
+        
+        # 先撮合此前挂出的委托，再推送本根K线
+        for slot in self._slots:
+            for fill in slot.matcher.match_bar(bar):
+                slot.on_fill(fill)
+            slot.account.update_price(bar.symbol, bar.close)
+            slot.strategy.on_bar(bar)
+        
+        if self.checkpoint_every and self._current_index % self.checkpoint_every == 0:
+            self.save_checkpoint()
+        return True
+    
+    def _on_timer_event(self, event: Event) -> None:
+        """定时器到期: 调用所属策略的 on_timer"""
+        for slot in self._slots:
+            if slot.context.strategy_id == event.source:
+                slot.strategy.on_timer(event.data)
+    
+    # ============ 快照 ============
+    
+    def save_checkpoint(self, path: Optional[str] = None) -> None:
+        """
+        保存回测快照
+        包括数据游标、策略上下文变量与策略属性、模拟委托与持仓、累计绩效；
+        策略属性需可被 pickle 序列化
+        Args:
+            path: 文件路径 (可选, 默认 checkpoint_path)
+        """
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("Checkpoint path not set")
+        save_snapshot(path, {
+            "current_index": self._current_index,
+            "cursors": self._cursors,
+            "start_date": self._start_date,
+            "end_date": self._end_date,
+            "first_time": self._first_time,
+            "last_time": self._last_time,
+            "portfolio": self._portfolio,
+            "slots": {slot.strategy.name: slot.get_state() for slot in self._slots},
+        })
+    
+    def load_checkpoint(self, path: Optional[str] = None) -> None:
+        """
+        加载回测快照，下一次 run() 从快照位置继续
+        需先设置同名策略并以相同顺序加载同样的数据；
+        策略 name/params 不会被快照覆盖，可用于从中途分叉 "what if" 回测
+        Args:
+            path: 文件路径 (可选, 默认 checkpoint_path)
+        """
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("Checkpoint path not set")
+        self._resume_state = load_snapshot(path)
+    
+    def _restore(
+        self,
+        state: Dict[str, Any],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> None:
+        """从快照恢复运行状态"""
+        self._current_index = state["current_index"]
+        self._cursors = state["cursors"]
+        self._start_date = start_date or state["start_date"]
+        self._end_date = end_date or state["end_date"]
+        self._first_time = state["first_time"]
+        self._last_time = state["last_time"]
+        self._portfolio = state["portfolio"]
+        if self._last_time is not None:
+            self.clock.set_time(datetime_to_ns(self._last_time))
+        
+        slots = state["slots"]
+        for slot in self._slots:
+            if slot.strategy.name not in slots:
+                raise CheckpointError(f"Strategy not in checkpoint: {slot.strategy.name}")
+            slot.set_state(slots[slot.strategy.name])
+    
+    def _record_equity(self, timestamp: datetime) -> None:
+        """记录资金曲线"""
+        total = 0.0
+        for slot in self._slots:
+            equity = slot.account.equity
+            slot.metrics.update(timestamp, equity)
+            total += equity
+        if self._portfolio is not None:
+            self._portfolio.update(timestamp, total)
+    
+    def _build_result(self) -> BacktestResult:
+        """汇总回测结果"""
+        if self._last_time is not None:
+            self._record_equity(self._last_time)
+        
+        start = self._start_date or self._first_time or datetime.now()
+        end = self._end_date or self._last_time or datetime.now()
+        self._results = {
+            slot.strategy.name: slot.metrics.fill_result(
+                BacktestResult(strategy_name=slot.strategy.name, start_date=start, end_date=end)
+            )
+            for slot in self._slots
+        }
+        if self._portfolio is None:
+            return self._results[self._slots[0].strategy.name]
+        
+        # 组合结果: 合并各子账户的成交记录与胜负统计
+        result = self._portfolio.fill_result(
+            BacktestResult(strategy_name="portfolio", start_date=start, end_date=end)
         )
+        children = list(self._results.values())
+        result.total_trades = sum(r.total_trades for r in children)
+        result.win_trades = sum(r.win_trades for r in children)
+        result.lose_trades = sum(r.lose_trades for r in children)
+        closed = result.win_trades + result.lose_trades
+        result.win_rate = result.win_trades / closed if closed else 0.0
+        trades = np.concatenate([r.trades for r in children])
+        result.trades = trades[np.argsort(trades["timestamp"], kind="stable")]
+        return result
+    
+    def get_results(self) -> Dict[str, BacktestResult]:
+        """获取各策略的回测结果"""
+        return self._results
+    
+    def run_vectorized(
+        self,
+        prices: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+        signals: Optional[np.ndarray] = None,
+        dates: Optional[Sequence[datetime]] = None,
+        symbol: str = "",
+        periods_per_year: Optional[int] = None,
+    ) -> BacktestResult:
+        """
+        向量化模式运行回测
+        由整列信号/持仓数组一次性计算成交、手续费、滑点、资金曲线和绩效指标，
+        不逐根K线回调策略
+        Args:
+            prices: 收盘价数组 (可选, 不传则取 add_data 加载的 symbol 数据)
+            positions: 目标持仓数量数组
+            signals: 目标仓位比例数组 (与 positions 二选一, NaN 表示维持)
+            dates: 时间序列 (可选)
+            symbol: 标的代码
+            periods_per_year: 每年K线数量 (可选, 默认取引擎设置)
+        Returns:
+            BacktestResult: 回测结果
+        """
+        if prices is None:
+            bars = self._data.get(symbol)
+            if bars is None or is_async_source(bars):
+                raise ValueError(f"No synchronous data loaded for {symbol}")
+            if not isinstance(bars, BarSeries):
+                bars = self._data[symbol] = BarSeries.from_bars(bars, symbol)
+            if not len(bars):
+                raise ValueError(f"No data loaded for {symbol}")
+            prices = bars.close
+            if dates is None:
+                dates = bars.ts
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 1:
+            raise ValueError("run_vectorized expects 1-D prices, use vectorized_backtest")
+
+        if positions is None:
+            if signals is None:
+                raise ValueError("Either positions or signals is required")
+            positions = signals_to_positions(signals, prices, self.initial_capital)
+
+        vr = vectorized_backtest(
+            prices,
+            positions,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            slippage=self.slippage,
+            periods_per_year=periods_per_year or self.periods_per_year,
+        )
+
+        # 未提供时间时以K线序号代替
+        start = end = datetime.now()
+        if dates is not None:
+            dates = np.asarray(dates)
+            if dates.dtype != np.int64:
+                dates = datetimes_to_ns(dates)
+            start, end = dates[[0, -1]].astype("datetime64[ns]").astype(
+                "datetime64[us]"
+            ).tolist()
+        else:
+            dates = np.arange(len(prices), dtype=np.int64)
+        
+        index = np.flatnonzero(vr.trade_volume)
+        trades = np.zeros(len(index), dtype=TRADE_DTYPE)
+        trades["timestamp"] = dates[index]
+        trades["symbol"] = check_symbol(symbol)
+        trades["direction"] = np.sign(vr.trade_volume[index])
+        trades["price"] = vr.fill_price[index]
+        trades["volume"] = np.abs(vr.trade_volume[index])
+        trades["commission"] = vr.commission[index]
+        trades["pnl"] = np.nan
         
+        self._result = BacktestResult(
+            strategy_name=self._strategy.name if self._strategy else "vectorized",
+            start_date=start,
+            end_date=end,
+            total_return=float(vr.total_return),
+            annual_return=float(vr.annual_return),
+            max_drawdown=float(vr.max_drawdown),
+            sharpe_ratio=float(vr.sharpe_ratio),
+            total_trades=int(vr.total_trades),
+            win_trades=int(vr.win_trades),
+            lose_trades=int(vr.lose_trades),
+            win_rate=float(vr.win_rate),
+            equity_curve=vr.equity,
+            dates=dates,
+            trades=trades,
+        )
         return self._result
     
     def get_result(self) -> Optional[BacktestResult]:
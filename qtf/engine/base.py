@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from qtf.engine.context import StrategyContext
     from qtf.core.events import Event
+    from qtf.data.batch import QuoteBatch
     from qtf.data.models import Quote, Bar
     from qtf.execution.models import Order
 
@@ -76,6 +77,16 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def on_ticks(self, batch: "QuoteBatch") -> None:
+        """
+        处理批量行情 (可选)
+        默认逐行转换为 Quote 调用 on_tick；横截面策略可重写为向量化处理
+        Args:
+            batch: 批量行情
+        """
+        for quote in batch.quotes():
+            self.on_tick(quote)
+    
     def on_bar(self, bar: "Bar") -> None:
         """
         处理K线数据
@@ -123,7 +134,8 @@ class BaseStrategy(ABC):
         symbol: str,
         price: float,
         volume: int,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        stop_price: Optional[float] = None,
     ) -> Optional[str]:
         """
         买入
@@ -131,12 +143,15 @@ class BaseStrategy(ABC):
             symbol: 标的代码
             price: 价格
             volume: 数量
-            order_type: 订单类型
+            order_type: 订单类型 (LIMIT, MARKET, STOP, STOP_LIMIT)
+            stop_price: 止损触发价 (STOP 单缺省时取 price)
         Returns:
             Optional[str]: 订单ID
         """
         if self.context:
-            return self.context.buy(symbol, price, volume, order_type)
+            return self.context.buy(
+                symbol, price, volume, order_type, stop_price
+            )
         return None
     
     def sell(
@@ -144,7 +159,8 @@ class BaseStrategy(ABC):
         symbol: str,
         price: float,
         volume: int,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        stop_price: Optional[float] = None,
     ) -> Optional[str]:
         """
         卖出
@@ -152,12 +168,15 @@ class BaseStrategy(ABC):
             symbol: 标的代码
             price: 价格
             volume: 数量
-            order_type: 订单类型
+            order_type: 订单类型 (LIMIT, MARKET, STOP, STOP_LIMIT)
+            stop_price: 止损触发价 (STOP 单缺省时取 price)
         Returns:
             Optional[str]: 订单ID
         """
         if self.context:
-            return self.context.sell(symbol, price, volume, order_type)
+            return self.context.sell(
+                symbol, price, volume, order_type, stop_price
+            )
         return None
     
     def cancel(self, order_id: str) -> bool:
@@ -0,0 +1,52 @@
+"""
+回测快照 (Backtest Checkpoint)
+回测状态的二进制快照读写，用于断点续跑和从中途分叉
+"""
+
+import os
+import pickle
+import zlib
+from typing import Any, Dict
+
+from qtf.core.exceptions import CheckpointError
+
+
+# 文件头: 魔数 + 格式版本
+_MAGIC = b"QTFCKPT"
+_VERSION = 1
+
+
+def save_snapshot(path: str, state: Dict[str, Any]) -> None:
+    """
+    保存快照 (pickle + zlib 压缩)
+    先写临时文件再原子替换，写入中途崩溃不会损坏已有快照
+    Args:
+        path: 文件路径
+        state: 状态字典
+    """
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(bytes([_VERSION]))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """
+    读取快照
+    Args:
+        path: 文件路径
+    Returns:
+        Dict: 状态字典
+    """
+    with open(path, "rb") as f:
+        header = f.read(len(_MAGIC) + 1)
+        if header[:len(_MAGIC)] != _MAGIC:
+            raise CheckpointError(f"Not a checkpoint file: {path}")
+        if header[-1] != _VERSION:
+            raise CheckpointError(f"Unsupported checkpoint version: {header[-1]}")
+        return pickle.loads(zlib.decompress(f.read()))
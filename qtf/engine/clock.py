@@ -0,0 +1,169 @@
+"""
+时钟 (Clock)
+实盘使用系统时钟；回放/回测使用由事件时间戳驱动的虚拟时钟，
+定时器按到期时间排入堆中，随虚拟时间推进依次触发
+"""
+
+import asyncio
+import heapq
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from qtf.core.events import now_ns, ns_to_datetime
+
+
+class TimerHandle:
+    """定时器句柄"""
+    __slots__ = ("when", "callback", "args", "cancelled", "_handle")
+
+    def __init__(self, when: int, callback: Callable, args: Tuple[Any, ...]):
+        self.when = when                    # 到期时间 (纪元纳秒)
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def cancel(self) -> None:
+        """取消定时器"""
+        self.cancelled = True
+        if self._handle is not None:
+            self._handle.cancel()
+
+
+class Clock(ABC):
+    """
+    时钟抽象基类
+    时间为纪元纳秒整数，与 Event.ts_ns 一致
+    """
+
+    @abstractmethod
+    def now_ns(self) -> int:
+        """当前时间 (纪元纳秒)"""
+        pass
+
+    def now(self) -> datetime:
+        """当前时间"""
+        return ns_to_datetime(self.now_ns())
+
+    @abstractmethod
+    def call_at(self, when_ns: int, callback: Callable, *args: Any) -> TimerHandle:
+        """
+        在指定时间调用
+        Args:
+            when_ns: 到期时间 (纪元纳秒)
+            callback: 回调函数 (返回协程时由调度方等待)
+        Returns:
+            TimerHandle: 定时器句柄
+        """
+        pass
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> TimerHandle:
+        """
+        延迟调用
+        Args:
+            delay: 延迟秒数
+            callback: 回调函数
+        Returns:
+            TimerHandle: 定时器句柄
+        """
+        return self.call_at(self.now_ns() + int(delay * 1_000_000_000), callback, *args)
+
+
+class WallClock(Clock):
+    """
+    系统时钟 (实盘)
+    定时器交给 asyncio 事件循环调度，需在运行中的事件循环内调用 call_at
+    """
+
+    def now_ns(self) -> int:
+        return now_ns()
+
+    def call_at(self, when_ns: int, callback: Callable, *args: Any) -> TimerHandle:
+        timer = TimerHandle(when_ns, callback, args)
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, (when_ns - self.now_ns()) / 1_000_000_000)
+        timer._handle = loop.call_later(delay, self._fire, timer)
+        return timer
+
+    @staticmethod
+    def _fire(timer: TimerHandle) -> None:
+        """触发定时器 (协程回调包装为任务)"""
+        if timer.cancelled:
+            return
+        result = timer.callback(*timer.args)
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+
+class VirtualClock(Clock):
+    """
+    虚拟时钟 (回放/回测)
+    时间只在 advance 时前进，不会回退；到期的定时器按到期时间顺序触发，
+    触发时虚拟时间恰好等于其到期时间
+    """
+
+    def __init__(self, start_ns: int = 0):
+        """
+        Args:
+            start_ns: 初始时间 (纪元纳秒)
+        """
+        self._now = start_ns
+        self._timers: List[Tuple[int, int, TimerHandle]] = []
+        self._seq = 0
+
+    def now_ns(self) -> int:
+        return self._now
+
+    def call_at(self, when_ns: int, callback: Callable, *args: Any) -> TimerHandle:
+        timer = TimerHandle(when_ns, callback, args)
+        self._seq += 1
+        heapq.heappush(self._timers, (when_ns, self._seq, timer))
+        return timer
+
+    def next_timer_ns(self) -> Optional[int]:
+        """最近一个未取消定时器的到期时间"""
+        timers = self._timers
+        while timers and timers[0][2].cancelled:
+            heapq.heappop(timers)
+        return timers[0][0] if timers else None
+
+    def pop_due(self, until_ns: int) -> Optional[TimerHandle]:
+        """
+        弹出不晚于 until_ns 的最早定时器，并把虚拟时间推进到其到期时间
+        Returns:
+            Optional[TimerHandle]: 到期的定时器 (由调用方执行回调)
+        """
+        when = self.next_timer_ns()
+        if when is None or when > until_ns:
+            return None
+        _, _, timer = heapq.heappop(self._timers)
+        if when > self._now:
+            self._now = when
+        return timer
+
+    def set_time(self, ts_ns: int) -> None:
+        """推进虚拟时间 (不触发定时器，早于当前时间时忽略)"""
+        if ts_ns > self._now:
+            self._now = ts_ns
+
+    def advance(self, until_ns: int) -> int:
+        """
+        推进虚拟时间并同步执行所有到期定时器 (回调中新增的到期定时器同样会触发)
+        Args:
+            until_ns: 目标时间 (纪元纳秒)
+        Returns:
+            int: 触发的定时器数
+        """
+        fired = 0
+        while True:
+            timer = self.pop_due(until_ns)
+            if timer is None:
+                break
+            result = timer.callback(*timer.args)
+            if asyncio.iscoroutine(result):
+                result.close()
+                raise TypeError("VirtualClock.advance cannot await coroutine callbacks")
+            fired += 1
+        self.set_time(until_ns)
+        return fired
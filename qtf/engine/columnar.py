@@ -0,0 +1,131 @@
+"""
+列式存储 (Columnar Storage)
+基于 NumPy 的可增长数组，用于资金曲线和成交记录的紧凑存储
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Union
+
+import numpy as np
+
+from qtf.core.events import datetime_to_ns, ns_to_datetime
+
+
+# 成交记录中标的代码的最大长度 (可容纳期权等长代码)
+SYMBOL_WIDTH = 32
+
+# 成交记录结构化类型
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "i8"),                # 成交时间 (epoch 纳秒)
+    ("symbol", f"U{SYMBOL_WIDTH}"),     # 标的代码
+    ("direction", "i1"),                # 方向 (1 买入, -1 卖出)
+    ("price", "f8"),                    # 成交价
+    ("volume", "f8"),                   # 成交数量
+    ("commission", "f8"),               # 手续费
+    ("pnl", "f8"),                      # 平仓盈亏 (开仓为 NaN)
+])
+
+
+def check_symbol(symbol: str) -> str:
+    """
+    检查标的代码长度 (超长代码写入结构化数组会被静默截断，导致不同标的混淆)
+    Returns:
+        str: 标的代码
+    """
+    if len(symbol) > SYMBOL_WIDTH:
+        raise ValueError(f"Symbol longer than {SYMBOL_WIDTH} characters: {symbol}")
+    return symbol
+
+
+def datetimes_to_ns(values: Iterable[Union[datetime, int]]) -> np.ndarray:
+    """批量转换为 epoch 纳秒数组"""
+    return np.fromiter((datetime_to_ns(v) for v in values), dtype=np.int64)
+
+
+class GrowableArray:
+    """
+    可增长的 NumPy 数组
+    容量按倍数扩展，追加为均摊 O(1)；values 返回有效部分的视图 (零拷贝)
+    """
+
+    def __init__(self, dtype: Any = np.float64, capacity: int = 256):
+        self._data = np.empty(max(capacity, 1), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def values(self) -> np.ndarray:
+        """有效数据视图"""
+        return self._data[:self._size]
+
+    def _reserve(self, size: int) -> None:
+        """确保容量"""
+        if size > len(self._data):
+            capacity = max(size, len(self._data) * 2)
+            data = np.empty(capacity, dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    def append(self, value: Any) -> None:
+        """追加一个元素"""
+        if self._size == len(self._data):
+            self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: Any) -> None:
+        """追加多个元素"""
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        self._reserve(end)
+        self._data[self._size:end] = values
+        self._size = end
+
+    def decimate(self, step: int = 2) -> None:
+        """原地抽稀，保留下标为 step 倍数的元素"""
+        kept = self._data[:self._size:step].copy()
+        self._data[:len(kept)] = kept
+        self._size = len(kept)
+
+    def clear(self) -> None:
+        """清空"""
+        self._size = 0
+
+    def copy(self) -> np.ndarray:
+        """复制为紧凑数组"""
+        return self.values.copy()
+
+
+class TradeLog(GrowableArray):
+    """成交记录 (结构化数组)"""
+
+    def __init__(self, capacity: int = 64):
+        super().__init__(TRADE_DTYPE, capacity)
+
+    def record(
+        self,
+        timestamp: Union[datetime, int],
+        symbol: str,
+        direction: int,
+        price: float,
+        volume: float,
+        commission: float = 0.0,
+        pnl: float = float("nan"),
+    ) -> None:
+        """追加一笔成交"""
+        self.append((
+            datetime_to_ns(timestamp), check_symbol(symbol), direction,
+            price, volume, commission, pnl,
+        ))
+
+
+def trades_to_records(trades: np.ndarray) -> List[Dict[str, Any]]:
+    """结构化成交数组转字典列表"""
+    records = []
+    for row in trades.tolist():
+        record = dict(zip(TRADE_DTYPE.names, row))
+        record["timestamp"] = ns_to_datetime(record["timestamp"])
+        records.append(record)
+    return records
@@ -6,10 +6,16 @@
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from datetime import datetime
 
+from qtf.execution.models import Order, OrderDirection, OrderType
+
 if TYPE_CHECKING:
     from qtf.data.base import MarketDataAdapter
+    from qtf.engine.clock import Clock
+    from qtf.engine.timer_wheel import TimerWheel, WheelTimer
     from qtf.execution.base import BrokerDriver
-    from qtf.execution.models import Account, Position, Order
+    from qtf.execution.matching import MatchingEngine
+    from qtf.execution.models import Account, Position
+    from qtf.execution.simulated import SimulatedAccount
 
 
 class StrategyContext:
@@ -23,36 +29,52 @@ class StrategyContext:
         strategy_id: str,
         data_adapter: Optional["MarketDataAdapter"] = None,
         broker: Optional["BrokerDriver"] = None,
+        clock: Optional["Clock"] = None,
+        timer_wheel: Optional["TimerWheel"] = None,
     ):
         self.strategy_id = strategy_id
         self.data_adapter = data_adapter
         self.broker = broker
+        self.clock = clock              # 时钟 (回放/回测时为虚拟时钟)
+        self.timer_wheel = timer_wheel  # 定时器时间轮 (各策略共享)
+        
+        # 模拟撮合与模拟账户 (回测时由 BacktestEngine 注入)
+        self.matching_engine: Optional["MatchingEngine"] = None
+        self.sim_account: Optional["SimulatedAccount"] = None
         
         self._variables: Dict[str, Any] = {}
-        self._timers: Dict[str, Any] = {}
+        self._timers: Dict[str, "WheelTimer"] = {}
     
     # ============ 数据查询 ============
     
     def get_current_time(self) -> datetime:
-        """获取当前时间"""
+        """获取当前时间 (有时钟时取时钟时间)"""
+        if self.clock is not None:
+            return self.clock.now()
         return datetime.now()
     
     def get_account(self) -> Optional["Account"]:
         """获取账户信息"""
         if self.broker:
             return self.broker.account
+        if self.sim_account:
+            return self.sim_account.to_account()
         return None
     
     async def get_positions(self) -> List["Position"]:
         """获取所有持仓"""
         if self.broker:
             return await self.broker.get_positions()
+        if self.sim_account:
+            return self.sim_account.get_positions()
         return []
     
     async def get_position(self, symbol: str) -> Optional["Position"]:
         """获取指定标的持仓"""
         if self.broker:
             return await self.broker.get_position(symbol)
+        if self.sim_account:
+            return self.sim_account.positions.get(symbol)
         return None
     
     async def get_orders(
@@ -63,6 +85,13 @@ class StrategyContext:
         """获取订单列表"""
         if self.broker:
             return await self.broker.get_orders(symbol, status)
+        if self.matching_engine:
+            return [
+                order for order in self.matching_engine.open_orders
+                if order.strategy_id == self.strategy_id
+                and (symbol is None or order.symbol == symbol)
+                and (status is None or order.status.value == status)
+            ]
         return []
     
     # ============ 交易接口 ============
@@ -72,30 +101,63 @@ class StrategyContext:
         symbol: str,
         price: float,
         volume: int,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        stop_price: Optional[float] = None,
     ) -> Optional[str]:
         """
         买入下单
         Returns:
             Optional[str]: 订单ID
         """
-        # TODO: 实现下单逻辑
-        return None
+        return self._submit_order(
+            symbol, OrderDirection.BUY, price, volume, order_type, stop_price
+        )
     
     def sell(
         self,
         symbol: str,
         price: float,
         volume: int,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        stop_price: Optional[float] = None,
     ) -> Optional[str]:
         """
         卖出下单
         Returns:
             Optional[str]: 订单ID
         """
-        # TODO: 实现下单逻辑
-        return None
+        return self._submit_order(
+            symbol, OrderDirection.SELL, price, volume, order_type, stop_price
+        )
+    
+    def _submit_order(
+        self,
+        symbol: str,
+        direction: OrderDirection,
+        price: float,
+        volume: int,
+        order_type: str,
+        stop_price: Optional[float],
+    ) -> Optional[str]:
+        """
+        提交订单到模拟撮合
+        Returns:
+            Optional[str]: 订单ID
+        """
+        if self.matching_engine is None:
+            # TODO: 实现实盘下单逻辑
+            return None
+        order = Order(
+            symbol=symbol,
+            direction=direction,
+            price=price,
+            volume=volume,
+            order_type=OrderType(order_type),
+            strategy_id=self.strategy_id,
+            create_time=self.get_current_time(),
+            stop_price=stop_price,
+        )
+        return self.matching_engine.submit(order)
     
     def cancel_order(self, order_id: str) -> bool:
         """
@@ -103,8 +165,10 @@ class StrategyContext:
         Returns:
             bool: 是否成功
         """
-        # TODO: 实现撤单逻辑
-        return False
+        if self.matching_engine is None:
+            # TODO: 实现实盘撤单逻辑
+            return False
+        return self.matching_engine.cancel(order_id)
     
     # ============ 变量管理 ============
     
@@ -118,20 +182,32 @@ class StrategyContext:
     
     # ============ 定时器 ============
     
-    def set_timer(self, timer_id: str, interval_seconds: int) -> None:
+    def set_timer(
+        self,
+        timer_id: str,
+        interval_seconds: float,
+        periodic: bool = True,
+    ) -> None:
         """
-        设置定时器
+        设置定时器 (同名定时器会被替换)
+        到期时发布 TIMER 事件 (data 为 timer_id, source 为策略ID)，由引擎调用策略的 on_timer
         Args:
             timer_id: 定时器ID
             interval_seconds: 间隔秒数
+            periodic: 是否周期触发 (按 起点 + k * 间隔 触发，不累积漂移)
         """
-        # TODO: 实现定时器逻辑
-        pass
+        if self.timer_wheel is None:
+            raise RuntimeError("Timer wheel not set")
+        self.cancel_timer(timer_id)
+        self._timers[timer_id] = self.timer_wheel.schedule(
+            timer_id, interval_seconds, source=self.strategy_id, periodic=periodic
+        )
     
     def cancel_timer(self, timer_id: str) -> None:
         """取消定时器"""
-        if timer_id in self._timers:
-            del self._timers[timer_id]
+        timer = self._timers.pop(timer_id, None)
+        if timer is not None:
+            timer.cancel()
     
     # ============ 日志 ============
     
@@ -4,28 +4,119 @@
 """
 
 import asyncio
-from typing import Dict, List, Callable, Any, Optional
-from collections import defaultdict
+import inspect
+from time import perf_counter_ns
+from typing import Dict, Callable, Any, Coroutine, Optional, Sequence, Tuple, Union
 from qtf.core.events import Event, EventType
+from qtf.engine.clock import Clock, TimerHandle, VirtualClock, WallClock
+from qtf.engine.event_queue import OverflowPolicy, PriorityEventQueue, QueueLimit
+from qtf.engine.instrumentation import EventLoopStats, LogHistogram
+
+
+# 分发表: (同步处理器, 异步处理器)
+Dispatch = Tuple[Tuple[Callable, ...], Tuple[Callable, ...]]
+_NO_HANDLERS: Dispatch = ((), ())
 
 
 class EventLoop:
     """
     事件循环
-    负责事件的分发和处理
+    负责事件的分发和处理，事件按类型进入不同优先级通道。
+    注册/注销时为每个事件类型预编译不可变分发表，分发时不再做反射判断；
+    同步处理器按注册顺序直接调用，之后再依次 await 异步处理器
     """
     
-    def __init__(self):
-        self._handlers: Dict[EventType, List[Callable]] = defaultdict(list)
-        self._queue: asyncio.Queue = asyncio.Queue()
+    def __init__(
+        self,
+        max_batch: int = 1024,
+        lanes: Optional[Sequence[Sequence[EventType]]] = None,
+        weights: Optional[Sequence[int]] = None,
+        limits: Optional[Dict[EventType, Union[QueueLimit, OverflowPolicy]]] = None,
+        instrument: bool = False,
+        clock: Optional[Clock] = None,
+    ):
+        """
+        Args:
+            max_batch: 单次唤醒连续处理的最大事件数
+            lanes: 优先级通道划分 (从高到低，默认 交易/账户 > 定时器 > K线 > Tick)
+            weights: 各通道权重 (可选，不传则为严格优先级)
+            limits: 事件类型 -> 队列容量与溢出策略 (可选，如 TICK 按标的合并)
+            instrument: 是否开启延迟/吞吐监控
+            clock: 时钟 (默认系统时钟；VirtualClock 时按事件时间戳推进并触发定时器)
+        """
+        self.max_batch = max_batch
+        self._handlers: Dict[EventType, Dict[Callable, bool]] = {}   # 处理器 -> 是否异步
+        self._dispatch: Dict[EventType, Dispatch] = {}
+        self._queue = PriorityEventQueue(lanes, weights, limits)
         self._running: bool = False
         self._task: Optional[asyncio.Task] = None
+        self.stats: Optional[EventLoopStats] = EventLoopStats() if instrument else None
+        self.clock: Clock = clock or WallClock()
     
     @property
     def running(self) -> bool:
         """是否运行中"""
         return self._running
     
+    def qsize(self) -> int:
+        """待处理事件数"""
+        return self._queue.qsize()
+    
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """各事件类型的合并/丢弃计数"""
+        return self._queue.counters()
+    
+    # ============ 监控 ============
+    
+    def enable_instrumentation(self) -> EventLoopStats:
+        """
+        开启监控 (已开启时保留现有统计)
+        Returns:
+            EventLoopStats: 统计对象
+        """
+        if self.stats is None:
+            self.stats = EventLoopStats()
+        return self.stats
+    
+    def disable_instrumentation(self) -> None:
+        """关闭监控"""
+        self.stats = None
+    
+    def depth(self, event_type: EventType) -> int:
+        """
+        事件类型的排队深度 (需开启监控)
+        入队数 - 分发数 - 被合并数 - 被丢弃数
+        """
+        if self.stats is None or event_type not in self.stats.types:
+            return 0
+        stats = self.stats.types[event_type]
+        queue = self._queue
+        return max(0, (
+            stats.enqueued
+            - stats.dispatched
+            - queue.conflated.get(event_type, 0)
+            - queue.dropped.get(event_type, 0)
+        ))
+    
+    def snapshot(self, buckets: bool = False, export: bool = False) -> Dict[str, Any]:
+        """
+        监控快照
+        Args:
+            buckets: 直方图是否包含分桶明细
+            export: 是否同时交给已注册的导出回调
+        Returns:
+            Dict[str, Any]: 各事件类型的入队/分发数、排队深度、排队延迟，以及各处理器耗时
+        """
+        if self.stats is None:
+            return {}
+        depths = {event_type: self.depth(event_type) for event_type in self.stats.types}
+        snapshot = self.stats.snapshot(depths, buckets)
+        snapshot["qsize"] = self._queue.qsize()
+        snapshot["counters"] = self.counters()
+        if export:
+            self.stats.export(snapshot)
+        return snapshot
+    
     # ============ 事件注册 ============
     
     def register(self, event_type: EventType, handler: Callable) -> None:
@@ -35,8 +126,10 @@ class EventLoop:
             event_type: 事件类型
             handler: 处理函数
         """
-        if handler not in self._handlers[event_type]:
-            self._handlers[event_type].append(handler)
+        handlers = self._handlers.setdefault(event_type, {})
+        if handler not in handlers:
+            handlers[handler] = inspect.iscoroutinefunction(handler)
+            self._compile(event_type)
     
     def unregister(self, event_type: EventType, handler: Callable) -> None:
         """
@@ -45,8 +138,9 @@ class EventLoop:
             event_type: 事件类型
             handler: 处理函数
         """
-        if handler in self._handlers[event_type]:
-            self._handlers[event_type].remove(handler)
+        handlers = self._handlers.get(event_type)
+        if handlers and handlers.pop(handler, None) is not None:
+            self._compile(event_type)
     
     def unregister_all(self, event_type: Optional[EventType] = None) -> None:
         """
@@ -55,9 +149,30 @@ class EventLoop:
             event_type: 事件类型 (可选，不传则注销所有)
         """
         if event_type:
-            self._handlers[event_type].clear()
+            self._handlers.pop(event_type, None)
+            self._dispatch.pop(event_type, None)
         else:
             self._handlers.clear()
+            self._dispatch.clear()
+    
+    def _compile(self, event_type: EventType) -> None:
+        """重建事件类型的分发表"""
+        handlers = self._handlers.get(event_type)
+        if not handlers:
+            self._dispatch.pop(event_type, None)
+            return
+        self._dispatch[event_type] = (
+            tuple(h for h, is_async in handlers.items() if not is_async),
+            tuple(h for h, is_async in handlers.items() if is_async),
+        )
+    
+    def get_handlers(self, event_type: EventType) -> Dispatch:
+        """
+        获取分发表
+        Returns:
+            Dispatch: (同步处理器, 异步处理器)
+        """
+        return self._dispatch.get(event_type, _NO_HANDLERS)
     
     # ============ 事件发布 ============
     
@@ -67,15 +182,106 @@ class EventLoop:
         Args:
             event: 事件对象
         """
+        if self.stats is None:
+            await self._queue.put(event)
+            return
+        event.enqueue_ns = perf_counter_ns()
         await self._queue.put(event)
+        self._on_enqueue(event.type)
     
     def put_nowait(self, event: Event) -> None:
         """
         非阻塞发布事件
         Args:
             event: 事件对象
+        Raises:
+            asyncio.QueueFull: 事件类型为 BLOCK 策略且队列已满
         """
+        if self.stats is None:
+            self._queue.put_nowait(event)
+            return
+        event.enqueue_ns = perf_counter_ns()
         self._queue.put_nowait(event)
+        self._on_enqueue(event.type)
+    
+    def _on_enqueue(self, event_type: EventType) -> None:
+        """记录入队统计"""
+        if self.stats is not None:
+            queue = self._queue
+            type_stats = self.stats.type_stats(event_type)
+            type_stats.enqueued += 1
+            depth = type_stats.enqueued - type_stats.dispatched
+            if event_type in queue.limits:
+                depth -= queue.conflated.get(event_type, 0) + queue.dropped.get(event_type, 0)
+            if depth > type_stats.max_depth:
+                type_stats.max_depth = depth
+    
+    # ============ 定时事件 ============
+    
+    def post_at(self, when_ns: int, event: Event) -> TimerHandle:
+        """
+        在指定时间发布事件
+        虚拟时钟下事件在时间推进到 when_ns 时立即分发 (先于同一时刻及之后的事件)
+        Args:
+            when_ns: 发布时间 (纪元纳秒)
+            event: 事件对象 (发布时 ts_ns 更新为触发时间)
+        Returns:
+            TimerHandle: 定时器句柄 (可取消)
+        """
+        return self.clock.call_at(when_ns, self.post_due, event)
+    
+    def post_later(self, delay: float, event: Event) -> TimerHandle:
+        """
+        延迟发布事件
+        Args:
+            delay: 延迟秒数
+            event: 事件对象
+        Returns:
+            TimerHandle: 定时器句柄 (可取消)
+        """
+        return self.clock.call_later(delay, self.post_due, event)
+    
+    def post_due(self, event: Event) -> Optional[Coroutine]:
+        """
+        发布到期的定时事件 (时钟回调)
+        系统时钟下入队；虚拟时钟下返回立即分发的协程，由推进时钟的一方等待
+        Args:
+            event: 事件对象 (ts_ns 更新为当前时钟时间)
+        Returns:
+            Optional[Coroutine]: 虚拟时钟下的分发协程
+        """
+        event.ts_ns = self.clock.now_ns()
+        if isinstance(self.clock, VirtualClock):
+            return self._process_event(event)
+        self.put_nowait(event)
+        return None
+    
+    async def advance_clock(self, until_ns: int) -> int:
+        """
+        推进虚拟时钟并依次执行到期定时器 (协程回调会被等待)
+        事件循环在分发每个事件前自动推进到该事件的时间戳；回放结束时可手动调用
+        Args:
+            until_ns: 目标时间 (纪元纳秒)
+        Returns:
+            int: 触发的定时器数
+        """
+        clock = self.clock
+        if not isinstance(clock, VirtualClock):
+            raise TypeError("advance_clock requires a VirtualClock")
+        fired = 0
+        while True:
+            timer = clock.pop_due(until_ns)
+            if timer is None:
+                break
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Error firing timer: {e}")
+            fired += 1
+        clock.set_time(until_ns)
+        return fired
     
     # ============ 事件处理 ============
     
@@ -85,30 +291,110 @@ class EventLoop:
         Args:
             event: 事件对象
         """
-        handlers = self._handlers.get(event.type, [])
-        for handler in handlers:
+        sync_handlers, async_handlers = self._dispatch.get(event.type, _NO_HANDLERS)
+        for handler in sync_handlers:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
+                handler(event)
             except Exception as e:
                 # TODO: 添加错误日志
                 print(f"Error handling event {event.type}: {e}")
+        if async_handlers:
+            await self._process_async(event, async_handlers)
+    
+    async def _process_async(self, event: Event, handlers: Tuple[Callable, ...]) -> None:
+        """依次执行异步处理器"""
+        for handler in handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                print(f"Error handling event {event.type}: {e}")
     
     async def _run_loop(self) -> None:
-        """运行事件循环"""
+        """
+        运行事件循环
+        阻塞等待首个事件，唤醒后批量处理队列中所有已就绪的事件；
+        每处理 max_batch 个事件让出一次控制权，避免饿死生产者。
+        同步处理器在循环内直接调用，不创建协程；
+        虚拟时钟下分发事件前先把时钟推进到事件时间戳，触发其间到期的定时器
+        """
+        queue = self._queue
+        dispatch = self._dispatch
+        virtual = self.clock if isinstance(self.clock, VirtualClock) else None
         while self._running:
+            event = await queue.get()
+            count = 0
+            while True:
+                try:
+                    if virtual is not None and event.ts_ns > virtual.now_ns():
+                        await self.advance_clock(event.ts_ns)
+                    if self.stats is not None:
+                        pending = self._process_instrumented(event, self.stats)
+                        if pending is not None:
+                            await pending
+                    else:
+                        sync_handlers, async_handlers = dispatch.get(event.type, _NO_HANDLERS)
+                        for handler in sync_handlers:
+                            try:
+                                handler(event)
+                            except Exception as e:
+                                print(f"Error handling event {event.type}: {e}")
+                        if async_handlers:
+                            await self._process_async(event, async_handlers)
+                except Exception as e:
+                    print(f"Event loop error: {e}")
+                finally:
+                    queue.task_done()
+                count += 1
+                if count >= self.max_batch:
+                    await asyncio.sleep(0)
+                    count = 0
+                try:
+                    event = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+    
+    def _process_instrumented(self, event: Event, stats: EventLoopStats) -> Optional[Coroutine]:
+        """
+        记录排队延迟，执行同步处理器并记录耗时
+        Returns:
+            Optional[Coroutine]: 有异步处理器时返回待 await 的协程
+        """
+        start = perf_counter_ns()
+        type_stats = stats.type_stats(event.type)
+        type_stats.dispatched += 1
+        if event.enqueue_ns:
+            type_stats.latency.record(start - event.enqueue_ns)
+        
+        sync_handlers, async_handlers = self._dispatch.get(event.type, _NO_HANDLERS)
+        histograms = stats.handler_histograms(sync_handlers, async_handlers)
+        index = 0
+        for handler in sync_handlers:
             try:
-                event = await asyncio.wait_for(
-                    self._queue.get(),
-                    timeout=0.1
-                )
-                await self._process_event(event)
-            except asyncio.TimeoutError:
-                continue
+                handler(event)
             except Exception as e:
-                print(f"Event loop error: {e}")
+                print(f"Error handling event {event.type}: {e}")
+            end = perf_counter_ns()
+            histograms[index].record(end - start)
+            start = end
+            index += 1
+        if async_handlers:
+            return self._process_async_instrumented(event, async_handlers, histograms[index:])
+        return None
+    
+    async def _process_async_instrumented(
+        self,
+        event: Event,
+        handlers: Tuple[Callable, ...],
+        histograms: Tuple[LogHistogram, ...],
+    ) -> None:
+        """依次执行异步处理器并记录耗时 (含 await 等待时间)"""
+        for handler, histogram in zip(handlers, histograms):
+            start = perf_counter_ns()
+            try:
+                await handler(event)
+            except Exception as e:
+                print(f"Error handling event {event.type}: {e}")
+            histogram.record(perf_counter_ns() - start)
     
     # ============ 生命周期 ============
     
@@ -131,11 +417,11 @@ class EventLoop:
                 pass
             self._task = None
     
-    async def wait_empty(self, timeout: float = 5.0) -> bool:
+    async def wait_empty(self, timeout: Optional[float] = 5.0) -> bool:
         """
         等待队列清空
         Args:
-            timeout: 超时时间（秒）
+            timeout: 超时时间（秒，None 为不限）
         Returns:
             bool: 是否成功清空
         """
@@ -0,0 +1,298 @@
+"""
+事件队列 (Event Queue)
+按事件类型分优先级通道的队列，接口与 asyncio.Queue 一致；
+可按事件类型设置容量上限与溢出策略 (阻塞 / 丢弃最旧 / 按标的合并)
+"""
+
+import asyncio
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, Hashable, List, Optional, Sequence, Union
+
+from qtf.core.events import Event, EventType
+
+
+# 默认通道 (优先级从高到低): 交易/账户/系统 > 定时器 > K线 > Tick
+DEFAULT_LANES: Sequence[Sequence[EventType]] = (
+    (
+        EventType.ORDER,
+        EventType.TRADE,
+        EventType.POSITION,
+        EventType.ACCOUNT,
+        EventType.ERROR,
+        EventType.ENGINE_START,
+        EventType.ENGINE_STOP,
+        EventType.STRATEGY_START,
+        EventType.STRATEGY_STOP,
+    ),
+    (EventType.TIMER, EventType.LOG),
+    (EventType.BAR,),
+    (EventType.TICK, EventType.TICK_BATCH),
+)
+
+
+class OverflowPolicy(Enum):
+    """队列溢出策略"""
+    BLOCK = "block"                 # put 等待空位, put_nowait 抛出 QueueFull
+    DROP_OLDEST = "drop_oldest"     # 丢弃同类型最旧的事件
+    CONFLATE = "conflate"           # 同一标的只保留最新一条待处理事件
+
+
+@dataclass
+class QueueLimit:
+    """
+    单个事件类型的队列限制
+    CONFLATE 下 maxsize 限制待处理的标的数，超出时丢弃最旧的标的
+    """
+    policy: OverflowPolicy = OverflowPolicy.BLOCK
+    maxsize: int = 0                    # 待处理事件上限 (0 为不限)
+
+
+class _Slot:
+    """受限事件在通道中的占位 (event 为 None 表示已丢弃)"""
+    __slots__ = ("event", "key")
+
+    def __init__(self, event: Event, key: Hashable = None):
+        self.event: Optional[Event] = event
+        self.key = key
+
+
+def event_symbol(event: Event) -> Optional[str]:
+    """事件对应的标的代码 (事件自身或 data 的 symbol 属性)"""
+    symbol = getattr(event, "symbol", None)
+    if symbol:
+        return symbol
+    return getattr(event.data, "symbol", None)
+
+
+class PriorityEventQueue:
+    """
+    优先级事件队列
+    每个通道一个 FIFO，同一通道内保持发布顺序。
+    调度方式:
+        严格优先级 (weights 为 None): 总是先取最高优先级的非空通道，
+            高优先级事件最多等待一个正在执行的处理器
+        加权公平 (weights): 每轮按权重从各通道依次取事件，
+            低优先级通道不会被完全饿死
+    设置了 limits 的事件类型以占位对象入队，合并与丢弃均为 O(1)
+    """
+
+    def __init__(
+        self,
+        lanes: Optional[Sequence[Sequence[EventType]]] = None,
+        weights: Optional[Sequence[int]] = None,
+        limits: Optional[Dict[EventType, Union[QueueLimit, OverflowPolicy]]] = None,
+    ):
+        """
+        Args:
+            lanes: 通道划分 (优先级从高到低)，未列出的事件类型进入最低优先级通道
+            weights: 各通道权重 (可选，不传则为严格优先级)
+            limits: 事件类型 -> 队列限制 (可直接传溢出策略，表示不限容量)
+        """
+        lanes = DEFAULT_LANES if lanes is None else lanes
+        if not lanes:
+            raise ValueError("At least one lane is required")
+        if weights is not None:
+            if len(weights) != len(lanes) or min(weights) <= 0:
+                raise ValueError("weights must be positive, one per lane")
+            weights = list(weights)
+
+        self.lanes = [tuple(lane) for lane in lanes]
+        self.weights = weights
+        self._lane_of: Dict[EventType, int] = {
+            event_type: index
+            for index, lane in enumerate(self.lanes)
+            for event_type in lane
+        }
+        self._default_lane = len(self.lanes) - 1
+        self._queues: List[Deque[Event]] = [deque() for _ in self.lanes]
+        self._credits: List[int] = list(weights) if weights else []
+        self._size = 0
+        self._unfinished = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+        # 受限事件类型
+        self.limits: Dict[EventType, QueueLimit] = {
+            event_type: limit if isinstance(limit, QueueLimit) else QueueLimit(limit)
+            for event_type, limit in (limits or {}).items()
+        }
+        self._pending: Dict[EventType, Deque[_Slot]] = {
+            event_type: deque() for event_type in self.limits
+        }
+        self._latest: Dict[Hashable, _Slot] = {}       # (类型, 标的) -> 待处理占位
+
+        # 计数
+        self.conflated: Dict[EventType, int] = defaultdict(int)
+        self.dropped: Dict[EventType, int] = defaultdict(int)
+
+    def lane_of(self, event_type: EventType) -> int:
+        """事件类型所属通道"""
+        return self._lane_of.get(event_type, self._default_lane)
+
+    def qsize(self) -> int:
+        """队列中的事件数"""
+        return self._size
+
+    def lane_sizes(self) -> List[int]:
+        """各通道的元素数 (含尚未弹出的已丢弃占位)"""
+        return [len(queue) for queue in self._queues]
+
+    def empty(self) -> bool:
+        """队列是否为空"""
+        return self._size == 0
+
+    def pending(self, event_type: EventType) -> int:
+        """受限事件类型的待处理数"""
+        return len(self._pending[event_type])
+
+    def full(self, event_type: EventType) -> bool:
+        """受限事件类型是否已满"""
+        limit = self.limits.get(event_type)
+        if limit is None or not limit.maxsize:
+            return False
+        return len(self._pending[event_type]) >= limit.maxsize
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """合并/丢弃计数 (按事件类型)"""
+        return {
+            "conflated": {t.value: n for t, n in self.conflated.items()},
+            "dropped": {t.value: n for t, n in self.dropped.items()},
+        }
+
+    # ============ 入队 ============
+
+    def put_nowait(self, event: Event) -> None:
+        """
+        非阻塞入队
+        Args:
+            event: 事件对象
+        Raises:
+            asyncio.QueueFull: BLOCK 策略的事件类型已满
+        """
+        event_type = event.type
+        lane = self._queues[self._lane_of.get(event_type, self._default_lane)]
+        limit = self.limits.get(event_type)
+        if limit is None:
+            lane.append(event)
+        elif not self._put_limited(lane, event, limit):
+            return
+        self._size += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    def _put_limited(self, lane: Deque[Any], event: Event, limit: QueueLimit) -> bool:
+        """
+        受限事件入队
+        Returns:
+            bool: 是否新增了待处理事件 (合并时为 False)
+        """
+        event_type = event.type
+        pending = self._pending[event_type]
+        key = None
+        if limit.policy == OverflowPolicy.CONFLATE:
+            symbol = event_symbol(event)
+            if symbol is not None:
+                key = (event_type, symbol)
+                slot = self._latest.get(key)
+                if slot is not None:
+                    slot.event = event
+                    self.conflated[event_type] += 1
+                    return False
+
+        if limit.maxsize and len(pending) >= limit.maxsize:
+            if limit.policy == OverflowPolicy.BLOCK:
+                raise asyncio.QueueFull
+            self._drop(pending.popleft())
+            self.dropped[event_type] += 1
+
+        slot = _Slot(event, key)
+        if key is not None:
+            self._latest[key] = slot
+        pending.append(slot)
+        lane.append(slot)
+        return True
+
+    def _drop(self, slot: _Slot) -> None:
+        """丢弃一个待处理事件 (通道中的占位在出队时跳过)"""
+        slot.event = None
+        if slot.key is not None:
+            del self._latest[slot.key]
+        self._size -= 1
+        self.task_done()
+
+    async def put(self, event: Event) -> None:
+        """入队 (BLOCK 策略的事件类型已满时等待)"""
+        limit = self.limits.get(event.type)
+        while limit and limit.policy == OverflowPolicy.BLOCK and self.full(event.type):
+            self._not_full.clear()
+            await self._not_full.wait()
+        self.put_nowait(event)
+
+    # ============ 出队 ============
+
+    def get_nowait(self) -> Event:
+        """
+        非阻塞出队
+        Returns:
+            Event: 按调度规则选出的事件
+        Raises:
+            asyncio.QueueEmpty: 队列为空
+        """
+        while self._size:
+            if self.weights is None:
+                item = next(queue for queue in self._queues if queue).popleft()
+            else:
+                item = self._queues[self._next_weighted()].popleft()
+            if item.__class__ is not _Slot:
+                self._size -= 1
+                return item
+            if item.event is not None:
+                return self._take(item)
+        raise asyncio.QueueEmpty
+
+    def _take(self, slot: _Slot) -> Event:
+        """取出受限事件的占位"""
+        event = slot.event
+        self._pending[event.type].popleft()
+        if slot.key is not None:
+            del self._latest[slot.key]
+        self._size -= 1
+        self._not_full.set()
+        return event
+
+    def _next_weighted(self) -> int:
+        """加权调度: 取仍有额度的最高优先级非空通道，额度耗尽后开始新一轮"""
+        credits = self._credits
+        for _ in range(2):
+            for index, queue in enumerate(self._queues):
+                if queue and credits[index] > 0:
+                    credits[index] -= 1
+                    return index
+            credits[:] = self.weights
+        raise RuntimeError("unreachable: queue size out of sync")
+
+    async def get(self) -> Event:
+        """出队 (队列为空时等待)"""
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    # ============ 完成确认 ============
+
+    def task_done(self) -> None:
+        """确认一个事件处理完成"""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """等待所有已入队事件处理完成"""
+        await self._finished.wait()
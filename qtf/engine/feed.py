@@ -0,0 +1,122 @@
+"""
+行情数据流 (Bar Feed)
+多标的K线流的按时间归并，内存占用只与标的数量相关
+"""
+
+import heapq
+import itertools
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from qtf.data.series import BarSeries
+
+if TYPE_CHECKING:
+    from qtf.data.models import Bar
+
+
+BarSource = Union[Iterable["Bar"], AsyncIterable["Bar"]]
+
+
+def is_async_source(source: Any) -> bool:
+    """是否为异步数据源"""
+    return hasattr(source, "__aiter__")
+
+
+def merge_bars(sources: Dict[str, Iterable["Bar"]]) -> Iterator["Bar"]:
+    """
+    按时间戳归并多个标的的K线流 (k 路归并)
+    每个数据源需按时间升序；时间相同时按数据源加入顺序输出
+    Args:
+        sources: 标的代码 -> K线迭代器
+    Returns:
+        Iterator[Bar]: 全局按时间排序的K线
+    """
+    heap: List[Tuple[Any, int, "Bar", Iterator["Bar"]]] = []
+    for order, source in enumerate(sources.values()):
+        it = iter(source)
+        for bar in it:
+            heap.append((bar.timestamp, order, bar, it))
+            break
+    heapq.heapify(heap)
+
+    while heap:
+        _, order, bar, it = heap[0]
+        yield bar
+        for nxt in it:
+            heapq.heapreplace(heap, (nxt.timestamp, order, nxt, it))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+async def amerge_bars(sources: Dict[str, BarSource]) -> AsyncIterator["Bar"]:
+    """
+    按时间戳归并多个标的的K线流 (支持异步生成器)
+    同步与异步数据源可以混用
+    Args:
+        sources: 标的代码 -> K线迭代器或异步迭代器
+    Returns:
+        AsyncIterator[Bar]: 全局按时间排序的K线
+    """
+    async def _next(it: Any, is_async: bool) -> Any:
+        if is_async:
+            try:
+                return await it.__anext__()
+            except StopAsyncIteration:
+                return None
+        return next(it, None)
+
+    heap: List[Tuple[Any, int, "Bar", Any, bool]] = []
+    for order, source in enumerate(sources.values()):
+        is_async = is_async_source(source)
+        it = source.__aiter__() if is_async else iter(source)
+        bar = await _next(it, is_async)
+        if bar is not None:
+            heap.append((bar.timestamp, order, bar, it, is_async))
+    heapq.heapify(heap)
+
+    while heap:
+        _, order, bar, it, is_async = heap[0]
+        yield bar
+        nxt = await _next(it, is_async)
+        if nxt is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (nxt.timestamp, order, nxt, it, is_async))
+
+
+def skip_bars(source: BarSource, n: int) -> BarSource:
+    """
+    跳过数据源的前 n 根K线 (用于从快照恢复)
+    Args:
+        source: 数据源
+        n: 跳过数量
+    Returns:
+        BarSource: 跳过后的数据源
+    """
+    if n <= 0:
+        return source
+    if isinstance(source, BarSeries):
+        return source[n:]
+    if not is_async_source(source):
+        return itertools.islice(source, n, None)
+
+    async def _skip() -> AsyncIterator["Bar"]:
+        count = 0
+        async for bar in source:
+            if count >= n:
+                yield bar
+            else:
+                count += 1
+
+    return _skip()
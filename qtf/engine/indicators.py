@@ -0,0 +1,671 @@
+"""
+技术指标 (Indicators)
+每个指标提供两种形式：
+- 增量类 (SMA、EMA 等)：在 on_bar 中逐根 update，每次 O(1)
+- 批量函数 (sma、ema 等)：对整列数组一次计算
+两者的浮点运算顺序一致，结果逐位相同；增量类可用 warm_up 由 BarSeries 一次预热，
+之后继续 update 与对完整数据调用批量函数的结果相同。
+预热期内输出 NaN；输入应为有限值
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from qtf.data.models import Bar
+from qtf.data.series import BarSeries
+
+
+NAN = float("nan")
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def _as_array(values: ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _check_period(period: int) -> int:
+    if period <= 0:
+        raise ValueError("period must be positive")
+    return period
+
+
+# ============ 批量计算 ============
+
+def _block_sums(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    分块前缀和: 序列每 period 个样本为一块，块内以块首值为基准累计偏差
+    (定期重设基准，长序列或趋势序列的前缀和不会增长到相减时抵消有效数字)
+    Returns:
+        Tuple: (各块基准值, 块内偏差前缀和, 块内偏差平方前缀和)，
+            前缀和形状为 (period, 块数+1)，第 j 行为各块前 j+1 项之和；
+            首列为虚拟的第 -1 块 (前缀和为 0，基准同第 0 块)
+    """
+    blocks = -(-len(x) // period)
+    padded = np.zeros(blocks * period)
+    padded[:len(x)] = x
+    columns = padded.reshape(blocks, period).T
+    shifts = np.concatenate([columns[0, :1], columns[0]])
+    d = columns - columns[:1]
+    totals = np.zeros((period, blocks + 1))
+    squares = np.zeros((period, blocks + 1))
+    np.cumsum(d, axis=0, out=totals[:, 1:])
+    np.cumsum(d * d, axis=0, out=squares[:, 1:])
+    return shifts, totals, squares
+
+
+def _window_sums(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    各完整窗口的偏差和与偏差平方和 (与 _BlockSums 的运算顺序一致)
+    窗口由上一块的尾部与当前块的头部组成，上一块部分换算到当前块的基准
+    Returns:
+        Tuple: (窗口基准值, 偏差和, 偏差平方和)，第 k 项对应以第 period-1+k 个样本结尾的窗口
+    """
+    shifts, totals, squares = _block_sums(x, period)
+    # 按 (块内位置, 块) 网格计算以每个样本结尾的窗口，再按样本顺序展开
+    tail = np.arange(period - 1, -1, -1, dtype=np.float64)[:, None]
+    delta = shifts[:-1] - shifts[1:]
+    t1 = totals[-1:, :-1] - totals[:, :-1]
+    q1 = squares[-1:, :-1] - squares[:, :-1]
+    total = t1 + tail * delta + totals[:, 1:]
+    square = q1 + 2.0 * delta * t1 + tail * delta * delta + squares[:, 1:]
+    window = slice(period - 1, len(x))
+    return (
+        np.repeat(shifts[1:], period)[window],
+        total.T.ravel()[window],
+        square.T.ravel()[window],
+    )
+
+
+def _smooth(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    指数平滑 e += alpha * (x - e)，以首个值为初值
+    递推依赖上一项，按顺序逐项计算 (与增量类运算相同)
+    """
+    out = []
+    e = NAN
+    for i, v in enumerate(x.tolist()):
+        e = v if i == 0 else e + alpha * (v - e)
+        out.append(e)
+    return np.array(out, dtype=np.float64)
+
+
+def _mask(out: np.ndarray, warmup: int) -> np.ndarray:
+    """预热期置为 NaN"""
+    out[:warmup - 1] = NAN
+    return out
+
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    简单移动平均
+    Args:
+        values: 输入序列
+        period: 窗口长度
+    Returns:
+        np.ndarray: 与输入等长，前 period-1 项为 NaN
+    """
+    x = _as_array(values)
+    out = np.full(len(x), NAN)
+    shift, total, _ = _window_sums(x, _check_period(period))
+    if len(x) >= period:
+        out[period - 1:] = shift + total / period
+    return out
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    指数移动平均 (alpha = 2 / (period + 1))
+    Args:
+        values: 输入序列
+        period: 周期
+    Returns:
+        np.ndarray: 与输入等长，前 period-1 项为 NaN
+    """
+    x = _as_array(values)
+    return _mask(_smooth(x, 2.0 / (_check_period(period) + 1)), period)
+
+
+def rsi(values: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    相对强弱指标 (Wilder 平滑，alpha = 1 / period)
+    Args:
+        values: 价格序列
+        period: 周期
+    Returns:
+        np.ndarray: 0~100，前 period 项为 NaN；涨跌均为 0 时取 50
+    """
+    x = _as_array(values)
+    out = np.full(len(x), NAN)
+    if len(x) < 2:
+        return out
+    alpha = 1.0 / _check_period(period)
+    d = np.diff(x)
+    avg_gain = _smooth(np.where(d > 0, d, 0.0), alpha)
+    avg_loss = _smooth(np.where(d < 0, -d, 0.0), alpha)
+    total = avg_gain + avg_loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    return _mask(out, period + 1)
+
+
+def macd(
+    values: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD
+    Args:
+        values: 价格序列
+        fast: 快线周期
+        slow: 慢线周期
+        signal: 信号线周期
+    Returns:
+        Tuple: (MACD 线, 信号线, 柱)，前 slow+signal-2 项为 NaN
+    """
+    x = _as_array(values)
+    line = (
+        _smooth(x, 2.0 / (_check_period(fast) + 1))
+        - _smooth(x, 2.0 / (_check_period(slow) + 1))
+    )
+    sig = _smooth(line, 2.0 / (_check_period(signal) + 1))
+    hist = line - sig
+    warmup = slow + signal - 1
+    return _mask(line, warmup), _mask(sig, warmup), _mask(hist, warmup)
+
+
+def bollinger(
+    values: ArrayLike,
+    period: int = 20,
+    k: float = 2.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    布林带 (总体标准差)
+    Args:
+        values: 价格序列
+        period: 窗口长度
+        k: 标准差倍数
+    Returns:
+        Tuple: (中轨, 上轨, 下轨)，前 period-1 项为 NaN
+    """
+    x = _as_array(values)
+    mid, upper, lower = (np.full(len(x), NAN) for _ in range(3))
+    shift, total, square = _window_sums(x, _check_period(period))
+    if len(x) >= period:
+        mean = total / period
+        var = square / period - mean * mean
+        std = np.sqrt(np.maximum(var, 0.0))
+        mid[period - 1:] = shift + mean
+        upper[period - 1:] = mid[period - 1:] + k * std
+        lower[period - 1:] = mid[period - 1:] - k * std
+    return mid, upper, lower
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """真实波幅 (首根为 high - low)"""
+    h, l, c = _as_array(high), _as_array(low), _as_array(close)
+    tr = h - l
+    if len(tr) > 1:
+        prev = c[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - prev), np.abs(l[1:] - prev)))
+    return tr
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    平均真实波幅 (Wilder 平滑)
+    Args:
+        high: 最高价
+        low: 最低价
+        close: 收盘价
+        period: 周期
+    Returns:
+        np.ndarray: 与输入等长，前 period-1 项为 NaN
+    """
+    tr = true_range(high, low, close)
+    return _mask(_smooth(tr, 1.0 / _check_period(period)), period)
+
+
+def rolling_max(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    滚动最大值
+    Returns:
+        np.ndarray: 与输入等长，前 period-1 项为 NaN
+    """
+    x = _as_array(values)
+    out = np.full(len(x), NAN)
+    if len(x) >= _check_period(period):
+        out[period - 1:] = sliding_window_view(x, period).max(axis=1)
+    return out
+
+
+def rolling_min(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    滚动最小值
+    Returns:
+        np.ndarray: 与输入等长，前 period-1 项为 NaN
+    """
+    x = _as_array(values)
+    out = np.full(len(x), NAN)
+    if len(x) >= _check_period(period):
+        out[period - 1:] = sliding_window_view(x, period).min(axis=1)
+    return out
+
+
+# ============ 增量计算 ============
+
+class _BlockSums:
+    """增量分块前缀和 (与 _window_sums 的运算相同，只保留当前块与上一块)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.shift = NAN                    # 当前块基准值
+        self._totals: List[float] = []      # 当前块偏差前缀和
+        self._squares: List[float] = []
+        self._prev_shift = NAN              # 上一块基准值
+        self._prev_totals: List[float] = []
+        self._prev_squares: List[float] = []
+
+    def push(self, value: float) -> None:
+        """输入一个样本"""
+        j = self.count % self.period
+        if not j:
+            if self.count:
+                self._prev_shift = self.shift
+                self._prev_totals, self._prev_squares = self._totals, self._squares
+            else:
+                self._prev_shift = float(value)
+                self._prev_totals = [0.0] * self.period
+                self._prev_squares = [0.0] * self.period
+            self.shift = float(value)
+            self._totals, self._squares = [], []
+        d = value - self.shift
+        if j:
+            self._totals.append(self._totals[-1] + d)
+            self._squares.append(self._squares[-1] + d * d)
+        else:
+            self._totals.append(d)
+            self._squares.append(d * d)
+        self.count += 1
+
+    def window(self) -> Tuple[float, float, float]:
+        """
+        最近一个完整窗口 (需 count >= period)
+        Returns:
+            Tuple: (窗口基准值, 偏差和, 偏差平方和)
+        """
+        j = (self.count - 1) % self.period
+        tail = self.period - 1 - j
+        delta = self._prev_shift - self.shift
+        t1 = self._prev_totals[-1] - self._prev_totals[j]
+        q1 = self._prev_squares[-1] - self._prev_squares[j]
+        total = t1 + tail * delta + self._totals[j]
+        square = q1 + 2.0 * delta * t1 + tail * delta * delta + self._squares[j]
+        return self.shift, total, square
+
+    def load(self, x: np.ndarray) -> None:
+        """由历史数组批量设置状态 (数组非空)"""
+        shifts, totals, squares = _block_sums(x, self.period)
+        b, j = divmod(len(x) - 1, self.period)
+        self._prev_shift, self.shift = float(shifts[b]), float(shifts[b + 1])
+        self._prev_totals, self._prev_squares = totals[:, b].tolist(), squares[:, b].tolist()
+        self._totals = totals[:j + 1, b + 1].tolist()
+        self._squares = squares[:j + 1, b + 1].tolist()
+        self.count = len(x)
+
+
+class Indicator(ABC):
+    """
+    增量指标基类
+    fields 为从 Bar / BarSeries 取值的字段，依次作为 update 的参数
+    """
+
+    fields: Tuple[str, ...] = ("close",)
+
+    def __init__(self, period: int):
+        self.period = _check_period(period)
+        self.count = 0                      # 已输入的样本数
+
+    @property
+    def warmup(self) -> int:
+        """输出有效值所需的样本数"""
+        return self.period
+
+    @property
+    def ready(self) -> bool:
+        """是否已度过预热期"""
+        return self.count >= self.warmup
+
+    @abstractmethod
+    def update(self, *values: float):
+        """输入一个样本，返回最新指标值"""
+        pass
+
+    def update_bar(self, bar: Bar):
+        """输入一根K线"""
+        return self.update(*(getattr(bar, name) for name in self.fields))
+
+    def warm_up(self, series: BarSeries) -> "Indicator":
+        """
+        清空状态后用历史K线一次预热 (整列批量计算)
+        Args:
+            series: 历史K线
+        Returns:
+            Indicator: self
+        """
+        self.reset()
+        arrays = [_as_array(getattr(series, name)) for name in self.fields]
+        if len(arrays[0]):
+            self._load(*arrays)
+        return self
+
+    @abstractmethod
+    def reset(self) -> None:
+        """清空状态"""
+        pass
+
+    @abstractmethod
+    def _load(self, *arrays: np.ndarray) -> None:
+        """由历史数组批量计算并设置状态 (数组非空)"""
+        pass
+
+
+class SMA(Indicator):
+    """简单移动平均 (窗口和由分块前缀和得到，每 period 个样本重设基准)"""
+
+    def __init__(self, period: int, field: str = "close"):
+        super().__init__(period)
+        self.fields = (field,)
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.value = NAN
+        self._sums = _BlockSums(self.period)
+
+    def update(self, value: float) -> float:
+        self._sums.push(value)
+        self.count += 1
+        if self.count >= self.period:
+            self._publish()
+        return self.value
+
+    def _publish(self) -> None:
+        shift, total, _ = self._sums.window()
+        self.value = shift + total / self.period
+
+    def _load(self, x: np.ndarray) -> None:
+        self._sums.load(x)
+        self.count = len(x)
+        if self.ready:
+            self._publish()
+
+
+class EMA(Indicator):
+    """指数移动平均 (alpha = 2 / (period + 1)，以首个值为初值)"""
+
+    def __init__(self, period: int, field: str = "close"):
+        super().__init__(period)
+        self.fields = (field,)
+        self.alpha = 2.0 / (period + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.value = NAN
+        self._ema = NAN
+
+    def update(self, value: float) -> float:
+        self._ema = float(value) if not self.count else self._ema + self.alpha * (value - self._ema)
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._ema
+        return self.value
+
+    def _load(self, x: np.ndarray) -> None:
+        self._ema = float(_smooth(x, self.alpha)[-1])
+        self.count = len(x)
+        self.value = self._ema if self.ready else NAN
+
+
+class RSI(Indicator):
+    """相对强弱指标 (Wilder 平滑)"""
+
+    def __init__(self, period: int = 14, field: str = "close"):
+        super().__init__(period)
+        self.fields = (field,)
+        self.alpha = 1.0 / period
+        self.reset()
+
+    @property
+    def warmup(self) -> int:
+        return self.period + 1
+
+    def reset(self) -> None:
+        self.count = 0
+        self.value = NAN
+        self._prev = NAN
+        self._gain = NAN
+        self._loss = NAN
+
+    def update(self, value: float) -> float:
+        if self.count:
+            d = value - self._prev
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+            if self.count == 1:
+                self._gain, self._loss = gain, loss
+            else:
+                self._gain += self.alpha * (gain - self._gain)
+                self._loss += self.alpha * (loss - self._loss)
+        self._prev = float(value)
+        self.count += 1
+        if self.count >= self.warmup:
+            total = self._gain + self._loss
+            self.value = 100.0 * self._gain / total if total > 0 else 50.0
+        return self.value
+
+    def _load(self, x: np.ndarray) -> None:
+        self._prev = float(x[-1])
+        self.count = len(x)
+        if len(x) > 1:
+            d = np.diff(x)
+            self._gain = float(_smooth(np.where(d > 0, d, 0.0), self.alpha)[-1])
+            self._loss = float(_smooth(np.where(d < 0, -d, 0.0), self.alpha)[-1])
+        if self.ready:
+            total = self._gain + self._loss
+            self.value = 100.0 * self._gain / total if total > 0 else 50.0
+
+
+class MACD(Indicator):
+    """MACD (update 返回 (MACD 线, 信号线, 柱))"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, field: str = "close"):
+        super().__init__(slow)
+        self.fields = (field,)
+        self.fast = _check_period(fast)
+        self.slow = slow
+        self.signal = _check_period(signal)
+        self._alphas = (2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1))
+        self.reset()
+
+    @property
+    def warmup(self) -> int:
+        return self.slow + self.signal - 1
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        return self.macd, self.signal_line, self.hist
+
+    def reset(self) -> None:
+        self.count = 0
+        self.macd = self.signal_line = self.hist = NAN
+        self._fast = self._slow = self._signal = NAN
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        a_fast, a_slow, a_signal = self._alphas
+        if not self.count:
+            self._fast = self._slow = float(value)
+            self._signal = self._fast - self._slow
+        else:
+            self._fast += a_fast * (value - self._fast)
+            self._slow += a_slow * (value - self._slow)
+            line = self._fast - self._slow
+            self._signal += a_signal * (line - self._signal)
+        self.count += 1
+        if self.count >= self.warmup:
+            self._publish()
+        return self.value
+
+    def _publish(self) -> None:
+        self.macd = self._fast - self._slow
+        self.signal_line = self._signal
+        self.hist = self.macd - self._signal
+
+    def _load(self, x: np.ndarray) -> None:
+        a_fast, a_slow, a_signal = self._alphas
+        fast, slow = _smooth(x, a_fast), _smooth(x, a_slow)
+        self._fast, self._slow = float(fast[-1]), float(slow[-1])
+        self._signal = float(_smooth(fast - slow, a_signal)[-1])
+        self.count = len(x)
+        if self.ready:
+            self._publish()
+
+
+class BollingerBands(Indicator):
+    """布林带 (update 返回 (中轨, 上轨, 下轨))"""
+
+    def __init__(self, period: int = 20, k: float = 2.0, field: str = "close"):
+        super().__init__(period)
+        self.fields = (field,)
+        self.k = k
+        self.reset()
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        return self.mid, self.upper, self.lower
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mid = self.upper = self.lower = NAN
+        self._sums = _BlockSums(self.period)
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        self._sums.push(value)
+        self.count += 1
+        if self.count >= self.period:
+            self._publish()
+        return self.value
+
+    def _publish(self) -> None:
+        shift, total, square = self._sums.window()
+        mean = total / self.period
+        var = square / self.period - mean * mean
+        std = math.sqrt(var) if var > 0 else 0.0
+        self.mid = shift + mean
+        self.upper = self.mid + self.k * std
+        self.lower = self.mid - self.k * std
+
+    def _load(self, x: np.ndarray) -> None:
+        self._sums.load(x)
+        self.count = len(x)
+        if self.ready:
+            self._publish()
+
+
+class ATR(Indicator):
+    """平均真实波幅 (Wilder 平滑，update 参数为 high, low, close)"""
+
+    fields = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.alpha = 1.0 / period
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.value = NAN
+        self._atr = NAN
+        self._close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self.count:
+            tr = max(tr, max(abs(high - self._close), abs(low - self._close)))
+            self._atr += self.alpha * (tr - self._atr)
+        else:
+            self._atr = float(tr)
+        self._close = float(close)
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._atr
+        return self.value
+
+    def _load(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        self._atr = float(_smooth(true_range(high, low, close), self.alpha)[-1])
+        self._close = float(close[-1])
+        self.count = len(close)
+        self.value = self._atr if self.ready else NAN
+
+
+class _RollingExtreme(Indicator):
+    """滚动极值 (单调双端队列，均摊 O(1))"""
+
+    def __init__(self, period: int, field: str = "close"):
+        super().__init__(period)
+        self.fields = (field,)
+        self.reset()
+
+    @staticmethod
+    @abstractmethod
+    def _dominates(new: float, old: float) -> bool:
+        """新值是否使队尾旧值不再可能成为极值"""
+        pass
+
+    def reset(self) -> None:
+        self.count = 0
+        self.value = NAN
+        self._window: Deque[Tuple[int, float]] = deque()   # (序号, 值)，值单调
+
+    def update(self, value: float) -> float:
+        window = self._window
+        while window and self._dominates(value, window[-1][1]):
+            window.pop()
+        window.append((self.count, float(value)))
+        if window[0][0] <= self.count - self.period:
+            window.popleft()
+        self.count += 1
+        if self.count >= self.period:
+            self.value = window[0][1]
+        return self.value
+
+    def _load(self, x: np.ndarray) -> None:
+        # 只有最后一个窗口影响后续结果
+        self.count = max(0, len(x) - self.period)
+        for v in x[self.count:].tolist():
+            self.update(v)
+
+
+class RollingMax(_RollingExtreme):
+    """滚动最大值"""
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    """滚动最小值"""
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new <= old
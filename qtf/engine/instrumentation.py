@@ -0,0 +1,250 @@
+"""
+事件循环监控 (Event Loop Instrumentation)
+排队延迟、处理器耗时的对数分桶直方图与队列深度统计
+"""
+
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from qtf.core.events import EventType
+
+
+class LogHistogram:
+    """
+    对数分桶直方图 (HDR 风格)
+    按 2 的幂分段，每段再线性细分 2**precision 个子桶，
+    记录为 O(1) 的整数运算，分位数相对误差不超过 1/2**precision
+    """
+
+    def __init__(self, precision: int = 3, max_value: int = 1 << 40):
+        """
+        Args:
+            precision: 每段子桶数的二进制位数
+            max_value: 最大可区分的值 (更大的值计入最后一个桶)
+        """
+        self.precision = precision
+        self._sub_count = 1 << precision
+        self.counts: List[int] = [0] * (
+            (max_value.bit_length() - precision + 1) * self._sub_count
+        )
+        self._last = len(self.counts) - 1
+        self.total = 0
+        self.sum = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """值所在的桶"""
+        if value < self._sub_count:
+            return value
+        exp = value.bit_length() - self.precision - 1
+        return (exp + 1) * self._sub_count + (value >> exp) - self._sub_count
+
+    def bucket_range(self, index: int) -> Tuple[int, int]:
+        """
+        桶的取值范围
+        Returns:
+            Tuple[int, int]: (下界, 上界)，均包含
+        """
+        if index < self._sub_count:
+            return index, index
+        exp = index // self._sub_count - 1
+        lower = (self._sub_count + index % self._sub_count) << exp
+        return lower, lower + (1 << exp) - 1
+
+    def record(self, value: int) -> None:
+        """
+        记录一个值
+        Args:
+            value: 非负整数 (纳秒)
+        """
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        if index > self._last:
+            index = self._last
+        self.counts[index] += 1
+        if value > self.max:
+            self.max = value
+        if value < self.min or not self.total:
+            self.min = value
+        self.total += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        """平均值"""
+        return self.sum / self.total if self.total else 0.0
+
+    def percentile(self, p: float) -> int:
+        """
+        分位数 (返回所在桶的上界，不超过最大值)
+        Args:
+            p: 百分位 (0-100)
+        Returns:
+            int: 分位数
+        """
+        if not self.total:
+            return 0
+        target = max(1, -(-self.total * p // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bucket_range(index)[1], self.max)
+        return self.max
+
+    def merge(self, other: "LogHistogram") -> None:
+        """合并另一个同精度直方图"""
+        if other.precision != self.precision or len(other.counts) != len(self.counts):
+            raise ValueError("Histogram layouts differ")
+        if other.total:
+            self.min = min(self.min, other.min) if self.total else other.min
+            self.max = max(self.max, other.max)
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+
+    def reset(self) -> None:
+        """清空"""
+        self.counts = [0] * len(self.counts)
+        self.total = self.sum = self.min = self.max = 0
+
+    def snapshot(self, buckets: bool = False) -> Dict[str, Any]:
+        """
+        统计快照
+        Args:
+            buckets: 是否包含非空桶 [(下界, 上界, 数量), ...]
+        Returns:
+            Dict[str, Any]: count/min/max/mean/p50/p90/p99/p999
+        """
+        data: Dict[str, Any] = {
+            "count": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+        if buckets:
+            data["buckets"] = [
+                (*self.bucket_range(index), count)
+                for index, count in enumerate(self.counts)
+                if count
+            ]
+        return data
+
+
+class EventTypeStats:
+    """单个事件类型的统计"""
+    __slots__ = ("enqueued", "dispatched", "max_depth", "latency")
+
+    def __init__(self) -> None:
+        self.enqueued = 0                   # 入队数
+        self.dispatched = 0                 # 分发数
+        self.max_depth = 0                  # 最大排队深度
+        self.latency = LogHistogram()       # 入队到分发的延迟 (纳秒)
+
+
+class EventLoopStats:
+    """
+    事件循环统计
+    按事件类型记录入队/分发数、排队深度、排队延迟；按处理器记录执行耗时
+    (异步处理器为 await 的总耗时)
+    """
+
+    def __init__(self) -> None:
+        self.started_ns = perf_counter_ns()
+        self.types: Dict[EventType, EventTypeStats] = {}
+        self.handlers: Dict[Callable, LogHistogram] = {}
+        self._tables: Dict[Tuple[tuple, tuple], Tuple[LogHistogram, ...]] = {}
+        self._exporters: List[Callable[[Dict[str, Any]], None]] = []
+
+    def type_stats(self, event_type: EventType) -> EventTypeStats:
+        """获取 (或创建) 事件类型统计"""
+        stats = self.types.get(event_type)
+        if stats is None:
+            stats = self.types[event_type] = EventTypeStats()
+        return stats
+
+    def handler_histogram(self, handler: Callable) -> LogHistogram:
+        """获取 (或创建) 处理器耗时直方图"""
+        histogram = self.handlers.get(handler)
+        if histogram is None:
+            histogram = self.handlers[handler] = LogHistogram()
+        return histogram
+
+    def handler_histograms(
+        self,
+        sync_handlers: Tuple[Callable, ...],
+        async_handlers: Tuple[Callable, ...],
+    ) -> Tuple[LogHistogram, ...]:
+        """分发表对应的耗时直方图 (按分发表缓存，顺序为先同步后异步)"""
+        key = (sync_handlers, async_handlers)
+        histograms = self._tables.get(key)
+        if histograms is None:
+            histograms = self._tables[key] = tuple(
+                self.handler_histogram(h) for h in sync_handlers + async_handlers
+            )
+        return histograms
+
+    def reset(self) -> None:
+        """清空统计"""
+        self.started_ns = perf_counter_ns()
+        self.types.clear()
+        self.handlers.clear()
+        self._tables.clear()
+
+    # ============ 导出 ============
+
+    def snapshot(
+        self,
+        depths: Optional[Dict[EventType, int]] = None,
+        buckets: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        统计快照
+        Args:
+            depths: 各事件类型当前排队深度 (由事件循环提供)
+            buckets: 直方图是否包含分桶明细
+        Returns:
+            Dict[str, Any]: {"elapsed_ns", "events": {类型: ...}, "handlers": {名称: ...}}
+        """
+        depths = depths or {}
+        elapsed = perf_counter_ns() - self.started_ns
+        events = {}
+        for event_type, stats in self.types.items():
+            events[event_type.value] = {
+                "enqueued": stats.enqueued,
+                "dispatched": stats.dispatched,
+                "rate": stats.dispatched * 1e9 / elapsed if elapsed else 0.0,
+                "depth": depths.get(event_type, 0),
+                "max_depth": stats.max_depth,
+                "latency_ns": stats.latency.snapshot(buckets),
+            }
+        handlers: Dict[str, Any] = {}
+        for handler, histogram in self.handlers.items():
+            name = getattr(handler, "__qualname__", None) or repr(handler)
+            key, n = name, 1
+            while key in handlers:
+                n += 1
+                key = f"{name}#{n}"
+            handlers[key] = histogram.snapshot(buckets)
+        return {"elapsed_ns": elapsed, "events": events, "handlers": handlers}
+
+    def add_exporter(self, exporter: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        添加导出回调 (export 时以快照调用)
+        Args:
+            exporter: 回调函数
+        """
+        self._exporters.append(exporter)
+
+    def export(self, snapshot: Dict[str, Any]) -> None:
+        """将快照交给所有导出回调"""
+        for exporter in self._exporters:
+            exporter(snapshot)
@@ -0,0 +1,199 @@
+"""
+绩效指标 (Performance Metrics)
+增量式绩效统计，内存占用与回测长度无关
+"""
+
+import math
+from datetime import datetime
+from typing import Optional, Union, TYPE_CHECKING
+
+import numpy as np
+
+from qtf.engine.columnar import GrowableArray, TradeLog, datetime_to_ns
+
+if TYPE_CHECKING:
+    from qtf.engine.backtest import BacktestResult
+
+
+class MetricsAccumulator:
+    """
+    增量绩效统计器
+    每根K线/每笔成交 O(1) 更新收益、回撤、夏普 (Welford 方差) 和胜负次数；
+    资金曲线可完整保留、按固定步长抽样、限制最大点数或完全不保留
+    """
+
+    def __init__(
+        self,
+        initial_capital: float,
+        periods_per_year: int = 252,
+        keep_curve: bool = True,
+        downsample: int = 1,
+        max_points: Optional[int] = None,
+        keep_trades: bool = True,
+    ):
+        """
+        Args:
+            initial_capital: 初始资金
+            periods_per_year: 每年K线数量 (用于年化)
+            keep_curve: 是否保留资金曲线
+            downsample: 资金曲线抽样步长 (每 N 个点保留一个)
+            max_points: 资金曲线最大点数 (超出时步长加倍并抽稀已有数据)
+            keep_trades: 是否保留逐笔成交记录
+        """
+        if downsample < 1:
+            raise ValueError("downsample must be >= 1")
+        if max_points is not None and max_points < 2:
+            raise ValueError("max_points must be >= 2")
+
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+        self.keep_curve = keep_curve
+        self.max_points = max_points
+        self.keep_trades = keep_trades
+
+        # 收益与回撤
+        self.count: int = 0
+        self.equity: float = initial_capital
+        self.peak: float = initial_capital
+        self.max_drawdown: float = 0.0
+
+        # Welford 在线方差
+        self._mean: float = 0.0
+        self._m2: float = 0.0
+
+        # 交易统计
+        self.total_trades: int = 0
+        self.win_trades: int = 0
+        self.lose_trades: int = 0
+        self.trades = TradeLog()
+
+        # 资金曲线 (抽样, 时间为 epoch 纳秒)
+        self._stride: int = downsample
+        self.equity_curve = GrowableArray(np.float64)
+        self.dates = GrowableArray(np.int64)
+        self._last_date: Optional[int] = None
+
+    # ============ 更新 ============
+
+    def update(self, timestamp: Union[datetime, int], equity: float) -> None:
+        """
+        记录一个时间点的权益
+        Args:
+            timestamp: 时间 (datetime 或 epoch 纳秒)
+            equity: 总权益
+        """
+        prev = self.equity
+        ret = equity / prev - 1.0 if prev else 0.0
+
+        self.count += 1
+        delta = ret - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (ret - self._mean)
+
+        self.equity = equity
+        if equity > self.peak:
+            self.peak = equity
+        elif self.peak > 0:
+            drawdown = 1.0 - equity / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+        timestamp = datetime_to_ns(timestamp)
+        self._last_date = timestamp
+        if self.keep_curve and (self.count - 1) % self._stride == 0:
+            self.equity_curve.append(equity)
+            self.dates.append(timestamp)
+            if self.max_points and len(self.equity_curve) > self.max_points:
+                # 步长加倍，已保留的点隔一取一
+                self._stride *= 2
+                self.equity_curve.decimate(2)
+                self.dates.decimate(2)
+
+    def record_trade(
+        self,
+        timestamp: Union[datetime, int],
+        symbol: str,
+        direction: int,
+        price: float,
+        volume: float,
+        commission: float = 0.0,
+        pnl: Optional[float] = None,
+    ) -> None:
+        """
+        记录成交
+        Args:
+            timestamp: 成交时间
+            symbol: 标的代码
+            direction: 方向 (1 买入, -1 卖出)
+            price: 成交价
+            volume: 成交数量
+            commission: 手续费
+            pnl: 平仓盈亏 (开仓成交不传)
+        """
+        self.total_trades += 1
+        if pnl is not None:
+            if pnl > 0:
+                self.win_trades += 1
+            elif pnl < 0:
+                self.lose_trades += 1
+        if self.keep_trades:
+            self.trades.record(
+                timestamp, symbol, direction, price, volume, commission,
+                float("nan") if pnl is None else pnl,
+            )
+
+    # ============ 指标 ============
+
+    @property
+    def total_return(self) -> float:
+        """总收益率"""
+        return self.equity / self.initial_capital - 1.0
+
+    @property
+    def annual_return(self) -> float:
+        """年化收益率"""
+        if not self.count:
+            return 0.0
+        growth = max(1.0 + self.total_return, 0.0)
+        return growth ** (self.periods_per_year / self.count) - 1.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """夏普比率 (无风险利率为 0)"""
+        if self.count < 2:
+            return 0.0
+        std = math.sqrt(self._m2 / (self.count - 1))
+        if std <= 0:
+            return 0.0
+        return self._mean / std * math.sqrt(self.periods_per_year)
+
+    @property
+    def win_rate(self) -> float:
+        """胜率"""
+        closed = self.win_trades + self.lose_trades
+        return self.win_trades / closed if closed else 0.0
+
+    def fill_result(self, result: "BacktestResult") -> "BacktestResult":
+        """
+        将统计结果写入回测结果
+        抽样保留资金曲线时，最后一个点总会被补上
+        """
+        equity_curve = self.equity_curve.copy()
+        dates = self.dates.copy()
+        if self.keep_curve and self.count and dates[-1] != self._last_date:
+            equity_curve = np.append(equity_curve, self.equity)
+            dates = np.append(dates, self._last_date)
+
+        result.total_return = self.total_return
+        result.annual_return = self.annual_return
+        result.max_drawdown = self.max_drawdown
+        result.sharpe_ratio = self.sharpe_ratio
+        result.total_trades = self.total_trades
+        result.win_trades = self.win_trades
+        result.lose_trades = self.lose_trades
+        result.win_rate = self.win_rate
+        result.equity_curve = equity_curve
+        result.dates = dates
+        result.curve_stride = self._stride
+        result.trades = self.trades.copy()
+        return result
@@ -0,0 +1,395 @@
+"""
+参数优化 (Parameter Optimization)
+基于进程池的参数扫描 (网格/随机搜索)，K线数据通过共享内存在进程间共享
+"""
+
+import asyncio
+import itertools
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    TYPE_CHECKING,
+)
+
+import numpy as np
+import pandas as pd
+
+from qtf.data.models import Bar
+from qtf.data.series import BarSeries
+from qtf.engine.backtest import BacktestEngine, BacktestResult
+
+if TYPE_CHECKING:
+    from qtf.engine.base import BaseStrategy
+
+
+# 参与排名的绩效指标
+METRIC_FIELDS = (
+    "total_return",
+    "annual_return",
+    "max_drawdown",
+    "sharpe_ratio",
+    "total_trades",
+    "win_trades",
+    "lose_trades",
+    "win_rate",
+)
+
+# 共享内存中的列及其类型
+_COLUMNS = (
+    ("timestamp", "datetime64[ns]"),
+    ("open", "float64"),
+    ("high", "float64"),
+    ("low", "float64"),
+    ("close", "float64"),
+    ("volume", "int64"),
+    ("amount", "float64"),
+)
+
+
+class SharedBarData:
+    """
+    共享内存K线数据
+    将多标的K线一次性打包为列式 NumPy 数组放入 multiprocessing.shared_memory，
+    工作进程按名称映射，无需反复序列化数据集
+    """
+
+    def __init__(self, data: Dict[str, Union[BarSeries, Sequence[Bar]]]):
+        series = {symbol: BarSeries.from_bars(bars) for symbol, bars in data.items()}
+        total = sum(len(s) for s in series.values())
+        self._layout: Dict[str, Tuple[str, int, int]] = {}
+
+        offset = 0
+        for symbol, s in series.items():
+            self._layout[symbol] = (s.interval, offset, len(s))
+            offset += len(s)
+
+        # 所有列都是 8 字节类型，按列顺序依次排布
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(total * 8 * len(_COLUMNS), 8)
+        )
+        self._total = total
+        self._owner = True
+
+        columns = self.columns()
+        for symbol, s in series.items():
+            _, start, length = self._layout[symbol]
+            columns["timestamp"].view(np.int64)[start:start + length] = s.ts
+            for name, _ in _COLUMNS[1:]:
+                columns[name][start:start + length] = getattr(s, name)
+
+    @property
+    def spec(self) -> Dict[str, Any]:
+        """可序列化的描述信息，供工作进程映射"""
+        return {
+            "name": self._shm.name,
+            "total": self._total,
+            "layout": self._layout,
+        }
+
+    @property
+    def symbols(self) -> List[str]:
+        """标的列表"""
+        return list(self._layout)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """共享内存上的列数组 (零拷贝)"""
+        return _map_columns(self._shm.buf, self._total)
+
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> "SharedBarData":
+        """在工作进程中按描述信息映射共享内存"""
+        obj = cls.__new__(cls)
+        obj._shm = shared_memory.SharedMemory(name=spec["name"])
+        obj._total = spec["total"]
+        obj._layout = spec["layout"]
+        obj._owner = False
+        return obj
+
+    def series(
+        self,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> BarSeries:
+        """
+        指定标的在时间范围内的K线序列 (共享内存上的零拷贝视图)
+        Args:
+            symbol: 标的代码
+            start: 开始时间 (可选)
+            end: 结束时间 (可选)
+        """
+        interval, offset, length = self._layout[symbol]
+        columns = self.columns()
+        sl = slice(offset, offset + length)
+        return BarSeries(
+            symbol=symbol,
+            interval=interval,
+            ts=columns["timestamp"][sl].view(np.int64),
+            open=columns["open"][sl],
+            high=columns["high"][sl],
+            low=columns["low"][sl],
+            close=columns["close"][sl],
+            volume=columns["volume"][sl],
+            amount=columns["amount"][sl],
+        ).between(start, end)
+
+    def iter_bars(
+        self,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Bar]:
+        """
+        按需生成指定标的在时间范围内的 Bar 对象
+        Args:
+            symbol: 标的代码
+            start: 开始时间 (可选)
+            end: 结束时间 (可选)
+        """
+        return iter(self.series(symbol, start, end))
+
+    def close(self) -> None:
+        """释放共享内存 (创建者负责销毁)"""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+
+def _map_columns(buf: memoryview, total: int) -> Dict[str, np.ndarray]:
+    """将共享内存缓冲区映射为列数组"""
+    columns = {}
+    for i, (name, dtype) in enumerate(_COLUMNS):
+        columns[name] = np.ndarray(
+            (total,), dtype=dtype, buffer=buf, offset=i * total * 8
+        )
+    return columns
+
+
+# ============ 工作进程 ============
+
+_worker_data: Optional[SharedBarData] = None
+
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    """工作进程初始化：映射共享内存"""
+    global _worker_data
+    _worker_data = SharedBarData.attach(spec)
+
+
+def _build_engine(
+    data: SharedBarData,
+    strategy_cls: Type["BaseStrategy"],
+    params: Dict[str, Any],
+    engine_kwargs: Dict[str, Any],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> BacktestEngine:
+    """构建单次回测引擎，数据从共享内存按需生成"""
+    engine = BacktestEngine(**engine_kwargs)
+    engine.set_strategy(strategy_cls(name=strategy_cls.__name__, params=dict(params)))
+    for symbol in data.symbols:
+        engine.add_data(symbol, data.iter_bars(symbol, start, end))
+    return engine
+
+
+def _worker_task(
+    strategy_cls: Type["BaseStrategy"],
+    params: Dict[str, Any],
+    engine_kwargs: Dict[str, Any],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> BacktestResult:
+    """工作进程任务入口"""
+    engine = _build_engine(
+        _worker_data, strategy_cls, params, engine_kwargs, start, end
+    )
+    return asyncio.run(engine.run(start_date=start, end_date=end))
+
+
+# ============ 参数扫描 ============
+
+class ParameterSweep:
+    """
+    参数扫描器
+    同一份数据上以不同参数并行运行回测，并按指定指标排名
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type["BaseStrategy"],
+        data: Dict[str, Union[BarSeries, Sequence[Bar]]],
+        max_workers: Optional[int] = None,
+        **engine_kwargs: Any,
+    ):
+        """
+        Args:
+            strategy_cls: 策略类 (需可被工作进程导入)
+            data: 标的代码 -> K线序列或K线列表
+            max_workers: 进程数 (None 为 CPU 核数, 0 为在当前进程串行执行)
+            engine_kwargs: 传给 BacktestEngine 的参数
+        """
+        self.strategy_cls = strategy_cls
+        self.max_workers = max_workers
+        self.engine_kwargs = engine_kwargs
+        self._data = SharedBarData(data)
+        self._executor: Optional[Executor] = None
+
+    def __enter__(self) -> "ParameterSweep":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """进程池 (首次使用时创建)"""
+        if self._executor is None and self.max_workers != 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self._data.spec,),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """关闭进程池并释放共享内存"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._data.close()
+
+    def submit(
+        self,
+        params: Dict[str, Any],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Awaitable[BacktestResult]:
+        """
+        提交单次回测
+        Returns:
+            Awaitable[BacktestResult]: 回测结果
+        """
+        if self.executor is None:
+            engine = _build_engine(
+                self._data, self.strategy_cls, params,
+                self.engine_kwargs, start, end,
+            )
+            return engine.run(start_date=start, end_date=end)
+        return asyncio.wrap_future(self.executor.submit(
+            _worker_task, self.strategy_cls, params,
+            self.engine_kwargs, start, end,
+        ))
+    
+    async def run(
+        self,
+        param_sets: Sequence[Dict[str, Any]],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        sort_by: str = "sharpe_ratio",
+        ascending: bool = False,
+        keep_results: bool = False,
+    ) -> pd.DataFrame:
+        """
+        并行运行一组参数
+        Args:
+            param_sets: 参数字典列表
+            start: 开始时间 (可选)
+            end: 结束时间 (可选)
+            sort_by: 排名指标
+            ascending: 是否升序
+            keep_results: 是否在 result 列保留完整 BacktestResult
+        Returns:
+            pd.DataFrame: 按指标排名的结果表 (参数列 + 指标列)
+        """
+        results = await asyncio.gather(
+            *(self.submit(params, start, end) for params in param_sets)
+        )
+        return rank_results(param_sets, results, sort_by, ascending, keep_results)
+
+    async def grid_search(
+        self,
+        param_grid: Dict[str, Sequence[Any]],
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        网格搜索
+        Args:
+            param_grid: 参数名 -> 候选值列表
+        """
+        return await self.run(expand_grid(param_grid), **kwargs)
+
+    async def random_search(
+        self,
+        param_space: Dict[str, Union[Sequence[Any], Callable[[random.Random], Any]]],
+        n_iter: int,
+        seed: Optional[int] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        随机搜索
+        Args:
+            param_space: 参数名 -> 候选值列表或采样函数 (接收 random.Random)
+            n_iter: 采样次数
+            seed: 随机种子
+        """
+        return await self.run(sample_params(param_space, n_iter, seed), **kwargs)
+
+
+def expand_grid(param_grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """展开参数网格"""
+    keys = list(param_grid)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(param_grid[k] for k in keys))
+    ]
+
+
+def sample_params(
+    param_space: Dict[str, Union[Sequence[Any], Callable[[random.Random], Any]]],
+    n_iter: int,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """随机采样参数组合"""
+    rng = random.Random(seed)
+    return [
+        {
+            key: space(rng) if callable(space) else rng.choice(list(space))
+            for key, space in param_space.items()
+        }
+        for _ in range(n_iter)
+    ]
+
+
+def rank_results(
+    param_sets: Sequence[Dict[str, Any]],
+    results: Sequence[BacktestResult],
+    sort_by: str = "sharpe_ratio",
+    ascending: bool = False,
+    keep_results: bool = False,
+) -> pd.DataFrame:
+    """将回测结果汇总为排名表"""
+    rows = []
+    for params, result in zip(param_sets, results):
+        row = dict(params)
+        row.update({key: getattr(result, key) for key in METRIC_FIELDS})
+        if keep_results:
+            row["result"] = result
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    if rows:
+        table = table.sort_values(sort_by, ascending=ascending, kind="stable")
+    return table.reset_index(drop=True)
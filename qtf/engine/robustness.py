@@ -0,0 +1,241 @@
+"""
+稳健性分析 (Robustness Analysis)
+基于回测收益序列/成交记录的蒙特卡洛重采样 (分块自助法、成交乱序、成交自助法)，
+NumPy 向量化生成样本，分块分发到进程池
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from qtf.engine.backtest import BacktestResult
+from qtf.engine.vectorized import compute_metrics
+
+
+# 支持的重采样方法
+METHODS = ("block", "shuffle", "trade_bootstrap")
+
+# 每个任务的默认内存预算 (字节)
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# 每个样本点的估计内存占用 (下标、收益、权益及 compute_metrics 的中间数组)
+_BYTES_PER_POINT = 64
+
+
+@dataclass
+class RobustnessReport:
+    """
+    稳健性分析结果
+    每个指标保存全部重采样样本
+    """
+    method: str
+    n_samples: int
+    samples: Dict[str, np.ndarray]      # 指标名 -> 样本值
+
+    def confidence_interval(
+        self,
+        metric: str,
+        level: float = 0.95,
+    ) -> Tuple[float, float]:
+        """
+        指标的置信区间 (分位数法)
+        Args:
+            metric: 指标名 (total_return, max_drawdown, sharpe_ratio 等)
+            level: 置信水平
+        Returns:
+            Tuple[float, float]: (下界, 上界)
+        """
+        alpha = (1.0 - level) / 2.0
+        lo, hi = np.quantile(self.samples[metric], [alpha, 1.0 - alpha])
+        return float(lo), float(hi)
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> pd.DataFrame:
+        """各指标分位数汇总表"""
+        return pd.DataFrame({
+            metric: np.quantile(values, quantiles)
+            for metric, values in self.samples.items()
+        }, index=[f"q{q:g}" for q in quantiles]).T
+
+
+# ============ 重采样 ============
+
+def block_bootstrap(
+    returns: np.ndarray,
+    n_samples: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    循环分块自助法 (保留收益序列的短期自相关)
+    Args:
+        returns: 收益序列
+        n_samples: 样本数
+        block_size: 块长度
+        rng: 随机数生成器
+    Returns:
+        np.ndarray: 形状 (n, n_samples) 的重采样收益
+    """
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_samples, n_blocks, 1))
+    index = (starts + np.arange(block_size)).reshape(n_samples, -1)[:, :n] % n
+    return returns[index].T
+
+
+def shuffle_trades(
+    pnl: np.ndarray,
+    n_samples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    成交乱序 (总盈亏不变, 考察路径相关的回撤)
+    Returns:
+        np.ndarray: 形状 (n, n_samples) 的盈亏序列
+    """
+    return rng.permuted(np.tile(pnl, (n_samples, 1)), axis=1).T
+
+
+def bootstrap_trades(
+    pnl: np.ndarray,
+    n_samples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    成交有放回抽样
+    Returns:
+        np.ndarray: 形状 (n, n_samples) 的盈亏序列
+    """
+    return pnl[rng.integers(0, len(pnl), size=(len(pnl), n_samples))]
+
+
+def _simulate(
+    method: str,
+    series: np.ndarray,
+    n_samples: int,
+    block_size: int,
+    initial_capital: float,
+    periods_per_year: int,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    """生成一批样本并计算指标 (进程池任务)"""
+    rng = np.random.default_rng(seed)
+    if method == "block":
+        returns = block_bootstrap(series, n_samples, block_size, rng)
+        equity = initial_capital * np.cumprod(1.0 + returns, axis=0)
+    else:
+        if method == "shuffle":
+            pnl = shuffle_trades(series, n_samples, rng)
+        else:
+            pnl = bootstrap_trades(series, n_samples, rng)
+        equity = initial_capital + np.cumsum(pnl, axis=0)
+    return compute_metrics(equity, initial_capital, periods_per_year)
+
+
+# ============ 入口 ============
+
+def _chunk_sizes(
+    n_samples: int,
+    length: int,
+    chunk_size: Optional[int],
+    memory_budget: int,
+    workers: int,
+) -> List[int]:
+    """
+    各任务的样本数
+    未指定 chunk_size 时取内存预算允许的批量，且不超过 n_samples / workers (向上取整)，
+    保证样本能分到每个进程
+    """
+    if chunk_size is None:
+        chunk_size = max(1, memory_budget // (length * _BYTES_PER_POINT))
+        chunk_size = min(chunk_size, -(-n_samples // max(1, workers)))
+    chunk_size = max(1, min(chunk_size, n_samples))
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    return sizes
+
+
+def infer_initial_capital(result: BacktestResult) -> float:
+    """由期末权益和总收益率反推初始资金"""
+    if not len(result.equity_curve) or result.total_return <= -1.0:
+        raise ValueError("Cannot infer initial capital, pass initial_capital")
+    return float(result.equity_curve[-1] / (1.0 + result.total_return))
+
+
+def run_monte_carlo(
+    result: BacktestResult,
+    method: str = "block",
+    n_samples: int = 10000,
+    block_size: int = 20,
+    initial_capital: Optional[float] = None,
+    periods_per_year: int = 252,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> RobustnessReport:
+    """
+    蒙特卡洛稳健性分析
+    Args:
+        result: 回测结果
+        method: block (收益分块自助) / shuffle (成交乱序) / trade_bootstrap (成交自助)
+        n_samples: 样本数
+        block_size: 分块长度 (仅 block)
+        initial_capital: 初始资金 (可选, 默认由回测结果反推)
+        periods_per_year: 每年周期数 (成交类方法按每笔成交计)
+        seed: 随机种子
+        max_workers: 进程数 (None 为 CPU 核数, 0 为在当前进程执行)
+        chunk_size: 每个任务的样本数 (可选，默认按 memory_budget 和序列长度确定，
+            且样本至少分成进程数份)
+        memory_budget: 每个任务的内存预算 (字节)，每个任务要生成
+            样本数 × 序列长度 的矩阵，长序列 (如分钟线) 时自动减少每批样本数
+    Returns:
+        RobustnessReport: 各指标的样本分布
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    capital = initial_capital or infer_initial_capital(result)
+
+    if method == "block":
+        if result.curve_stride > 1:
+            raise ValueError(
+                "Equity curve is downsampled, run the backtest with "
+                "curve_downsample=1 and max_curve_points=None for method='block'"
+            )
+        equity = np.asarray(result.equity_curve, dtype=np.float64)
+        prev = np.concatenate([[capital], equity[:-1]])
+        series = equity / prev - 1.0
+    else:
+        pnl = result.trades["pnl"]
+        if len(pnl) and np.isnan(pnl).all():
+            raise ValueError(
+                "Trade pnl unavailable (e.g. run_vectorized results), use method='block'"
+            )
+        series = pnl[~np.isnan(pnl)]
+    if not len(series):
+        raise ValueError("No returns or closed trades to resample")
+
+    workers = 1 if max_workers == 0 else (max_workers or os.cpu_count() or 1)
+    sizes = _chunk_sizes(n_samples, len(series), chunk_size, memory_budget, workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (method, series, size, block_size, capital, periods_per_year, child)
+        for size, child in zip(sizes, seeds)
+    ]
+
+    if max_workers == 0 or len(args) == 1:
+        parts = [_simulate(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(_simulate, *zip(*args)))
+
+    samples = {
+        key: np.concatenate([np.atleast_1d(part[key]) for part in parts])
+        for key in parts[0]
+    }
+    return RobustnessReport(method=method, n_samples=n_samples, samples=samples)
@@ -0,0 +1,312 @@
+"""
+分片事件循环 (Sharded Event Loop)
+按标的哈希将事件分配到多个事件循环，同一标的内保持顺序，不同标的并行处理
+"""
+
+import asyncio
+import copy
+import multiprocessing
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from qtf.core.events import Event, EventType, TickBatchEvent
+from qtf.engine.event_loop import EventLoop
+from qtf.engine.event_queue import event_symbol
+
+
+# 默认广播到所有分片的事件类型 (账户级/引擎级事件)
+DEFAULT_BROADCAST = (
+    EventType.ACCOUNT,
+    EventType.ENGINE_START,
+    EventType.ENGINE_STOP,
+    EventType.STRATEGY_START,
+    EventType.STRATEGY_STOP,
+)
+
+# 子进程分片初始化函数: (事件循环, 分片序号) -> None，在其中注册处理器
+ShardSetup = Callable[[EventLoop, int], None]
+
+
+def shard_index(symbol: str, n_shards: int) -> int:
+    """
+    标的所属分片 (CRC32 取模，跨进程稳定)
+    Args:
+        symbol: 标的代码
+        n_shards: 分片数
+    Returns:
+        int: 分片序号
+    """
+    return zlib.crc32(symbol.encode()) % n_shards
+
+
+def _shard_main(
+    index: int,
+    inbox: Any,
+    setup: Optional[ShardSetup],
+    loop_kwargs: Dict[str, Any],
+) -> None:
+    """子进程分片入口: 从进程队列批量接收事件并交给本进程的事件循环"""
+    async def main() -> None:
+        loop = EventLoop(**loop_kwargs)
+        if setup is not None:
+            setup(loop, index)
+        await loop.start()
+        aio = asyncio.get_running_loop()
+        while True:
+            batch = await aio.run_in_executor(None, inbox.get)
+            if batch is None:
+                inbox.task_done()
+                break
+            for event in batch:
+                await loop.put(event)
+            await loop.wait_empty(timeout=None)
+            inbox.task_done()
+        await loop.stop()
+
+    asyncio.run(main())
+
+
+class ProcessShard:
+    """
+    子进程分片
+    同一轮事件循环内发布的事件合并为一批发送，减少进程间通信次数
+    """
+
+    def __init__(
+        self,
+        index: int,
+        setup: Optional[ShardSetup] = None,
+        loop_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        ctx = multiprocessing.get_context()
+        self.index = index
+        self._inbox = ctx.JoinableQueue()
+        self._buffer: List[Event] = []
+        self._scheduled = False
+        self._process = ctx.Process(
+            target=_shard_main,
+            args=(index, self._inbox, setup, loop_kwargs or {}),
+            daemon=True,
+        )
+
+    @property
+    def running(self) -> bool:
+        """子进程是否运行中"""
+        return self._process.is_alive()
+
+    def put_nowait(self, event: Event) -> None:
+        """发布事件 (在当前轮次结束时批量发送)"""
+        self._buffer.append(event)
+        if self._scheduled:
+            return
+        try:
+            asyncio.get_running_loop().call_soon(self._flush)
+            self._scheduled = True
+        except RuntimeError:
+            self._flush()
+
+    async def put(self, event: Event) -> None:
+        """发布事件"""
+        self.put_nowait(event)
+
+    def _flush(self) -> None:
+        """发送缓冲的事件"""
+        self._scheduled = False
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._inbox.put(batch)
+
+    async def start(self) -> None:
+        """启动子进程"""
+        self._process.start()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """停止子进程 (先处理完已发送的事件)"""
+        if self._process.pid is None:
+            return
+        self._flush()
+        self._inbox.put(None)
+        aio = asyncio.get_running_loop()
+        await aio.run_in_executor(None, self._process.join, timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+
+    async def wait_empty(self, timeout: Optional[float] = 5.0) -> bool:
+        """等待已发布的事件全部处理完成"""
+        self._flush()
+        aio = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(aio.run_in_executor(None, self._inbox.join), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class ShardedEventLoop:
+    """
+    分片事件循环
+    按标的哈希把事件分配到 N 个分片，每个分片是独立的 EventLoop (协程任务)
+    或子进程。同一标的的行情/订单/成交始终进入同一分片，顺序不变；
+    账户级事件广播到所有分片；批量行情按标的拆分到各分片；无标的事件进入 0 号分片。
+    协程分片共享处理器 (register 对所有分片生效)；
+    子进程分片的处理器由 setup 在子进程内注册
+    """
+
+    def __init__(
+        self,
+        n_shards: int = 4,
+        broadcast: Sequence[EventType] = DEFAULT_BROADCAST,
+        processes: bool = False,
+        setup: Optional[ShardSetup] = None,
+        **loop_kwargs: Any,
+    ):
+        """
+        Args:
+            n_shards: 分片数
+            broadcast: 广播到所有分片的事件类型
+            processes: 是否使用子进程分片
+            setup: 子进程分片初始化函数 (需可序列化)
+            loop_kwargs: 传给各分片 EventLoop 的参数
+        """
+        if n_shards <= 0:
+            raise ValueError("n_shards must be positive")
+        self.n_shards = n_shards
+        self.broadcast = frozenset(broadcast)
+        self.processes = processes
+        self.shards: List[Union[EventLoop, ProcessShard]]
+        if processes:
+            self.shards = [ProcessShard(i, setup, loop_kwargs) for i in range(n_shards)]
+        else:
+            self.shards = [EventLoop(**loop_kwargs) for _ in range(n_shards)]
+            if setup is not None:
+                for i, shard in enumerate(self.shards):
+                    setup(shard, i)
+        self._shard_of: Dict[str, int] = {}
+
+    @property
+    def running(self) -> bool:
+        """是否运行中"""
+        return any(shard.running for shard in self.shards)
+
+    def shard_of(self, symbol: str) -> int:
+        """标的所属分片序号"""
+        index = self._shard_of.get(symbol)
+        if index is None:
+            index = self._shard_of[symbol] = shard_index(symbol, self.n_shards)
+        return index
+
+    # ============ 事件注册 ============
+
+    def _local_shards(self) -> List[EventLoop]:
+        """协程分片 (子进程分片不支持在主进程注册处理器)"""
+        if self.processes:
+            raise RuntimeError("Register handlers of process shards via setup")
+        return self.shards  # type: ignore[return-value]
+
+    def register(self, event_type: EventType, handler: Callable) -> None:
+        """在所有分片注册事件处理器"""
+        for shard in self._local_shards():
+            shard.register(event_type, handler)
+
+    def unregister(self, event_type: EventType, handler: Callable) -> None:
+        """在所有分片注销事件处理器"""
+        for shard in self._local_shards():
+            shard.unregister(event_type, handler)
+
+    def unregister_all(self, event_type: Optional[EventType] = None) -> None:
+        """在所有分片注销所有处理器"""
+        for shard in self._local_shards():
+            shard.unregister_all(event_type)
+
+    # ============ 事件发布 ============
+
+    def route(self, event: Event) -> List[Union[EventLoop, ProcessShard]]:
+        """
+        事件的目标分片
+        Args:
+            event: 事件对象
+        Returns:
+            List: 目标分片 (广播事件为全部分片)
+        """
+        if event.type in self.broadcast:
+            return self.shards
+        symbol = event_symbol(event)
+        if not symbol:
+            return self.shards[:1]
+        return [self.shards[self.shard_of(symbol)]]
+
+    def split_batch(
+        self,
+        event: TickBatchEvent,
+    ) -> List[Tuple[Union[EventLoop, ProcessShard], TickBatchEvent]]:
+        """
+        按分片拆分批量行情
+        Returns:
+            List: (分片, 该分片标的组成的批量行情事件)
+        """
+        batch = event.batch
+        unique, inverse = np.unique(batch.symbol_id, return_inverse=True)
+        names = batch.table.names(unique)
+        owners = np.fromiter((self.shard_of(name) for name in names), np.int32, len(names))
+        rows = owners[inverse]
+        parts = []
+        for index in np.unique(owners):
+            part = batch.take(rows == index)
+            parts.append((
+                self.shards[index],
+                TickBatchEvent(part, source=event.source, ts_ns=event.ts_ns),
+            ))
+        return parts
+
+    def _targets(self, event: Event) -> List[Tuple[Union[EventLoop, ProcessShard], Event]]:
+        """事件的 (分片, 事件) 列表"""
+        if event.type is EventType.TICK_BATCH and self.n_shards > 1:
+            return self.split_batch(event)  # type: ignore[arg-type]
+        shards = self.route(event)
+        # 广播时每个分片一个浅拷贝: 各分片分别记录入队时刻 (enqueue_ns)
+        return [(shard, event if i == 0 else copy.copy(event)) for i, shard in enumerate(shards)]
+
+    def put_nowait(self, event: Event) -> None:
+        """
+        非阻塞发布事件
+        Args:
+            event: 事件对象 (广播时其余分片收到浅拷贝，data 共享)
+        """
+        for shard, part in self._targets(event):
+            shard.put_nowait(part)
+
+    async def put(self, event: Event) -> None:
+        """
+        发布事件
+        Args:
+            event: 事件对象
+        """
+        for shard, part in self._targets(event):
+            await shard.put(part)
+
+    # ============ 生命周期 ============
+
+    async def start(self) -> None:
+        """启动所有分片"""
+        await asyncio.gather(*(shard.start() for shard in self.shards))
+
+    async def stop(self) -> None:
+        """停止所有分片"""
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+
+    async def wait_empty(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        等待所有分片清空
+        Args:
+            timeout: 超时时间（秒）
+        Returns:
+            bool: 是否全部清空
+        """
+        done = await asyncio.gather(*(shard.wait_empty(timeout) for shard in self.shards))
+        return all(done)
+
+    def counters(self) -> List[Dict[str, Dict[str, int]]]:
+        """各协程分片的合并/丢弃计数"""
+        return [shard.counters() for shard in self._local_shards()]
@@ -0,0 +1,341 @@
+"""
+分层时间轮 (Hierarchical Timer Wheel)
+所有策略上下文共享的定时器调度：插入与取消为 O(1)，
+到期时发布 TIMER 事件；整个时间轮只向时钟登记一个唤醒，不为每个定时器创建任务
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from qtf.core.events import Event, EventType
+from qtf.engine.clock import Clock, TimerHandle
+
+if TYPE_CHECKING:
+    from qtf.engine.base import BaseStrategy
+    from qtf.engine.event_loop import EventLoop
+
+
+# 每层槽位数 = 2**SLOT_BITS
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+
+# 事件发布函数: 返回可等待对象时由时钟调度方等待 (虚拟时钟下的即时分发)
+TimerSink = Callable[[Event], Optional[Awaitable[Any]]]
+
+
+class WheelTimer:
+    """时间轮定时器"""
+    __slots__ = (
+        "timer_id", "source", "start_ns", "interval_ns", "deadline_ns",
+        "expires", "level", "bucket", "cancelled", "_wheel",
+    )
+
+    def __init__(
+        self,
+        wheel: "TimerWheel",
+        timer_id: str,
+        source: str,
+        start_ns: int,
+        interval_ns: int,
+        deadline_ns: int,
+    ):
+        self.timer_id = timer_id
+        self.source = source                # 所属策略
+        self.start_ns = start_ns            # 周期起点 (纪元纳秒)
+        self.interval_ns = interval_ns      # 周期 (0 为一次性)
+        self.deadline_ns = deadline_ns      # 本次到期时间
+        self.expires = 0                    # 到期刻度
+        self.level = 0                      # 所在层
+        self.bucket: Optional[Dict["WheelTimer", None]] = None  # 所在槽位
+        self.cancelled = False
+        self._wheel = wheel
+
+    @property
+    def periodic(self) -> bool:
+        """是否周期定时器"""
+        return self.interval_ns > 0
+
+    @property
+    def pending(self) -> bool:
+        """是否仍在等待触发"""
+        return self.bucket is not None
+
+    def cancel(self) -> bool:
+        """
+        取消定时器
+        Returns:
+            bool: 取消前是否仍在等待
+        """
+        return self._wheel.cancel(self)
+
+
+class TimerWheel:
+    """
+    分层时间轮
+    时间按 resolution 划分为刻度，每层 64 个槽位，第 L 层一个槽位覆盖 64**L 个刻度；
+    高层槽位到期时把定时器下放到低层，第 0 层槽位到期即触发。
+    定时器不会早于到期时间触发，延迟不超过一个刻度 (即抖动上界 resolution)；
+    周期定时器的到期时间为 起点 + k * 周期，不随触发延迟累积漂移；
+    系统时钟下因唤醒延迟错过的周期合并为一次触发，
+    虚拟时钟推进时每个周期都在其到期时间依次触发 (虚拟时间不存在唤醒延迟)
+    """
+
+    def __init__(
+        self,
+        clock: Clock,
+        post: TimerSink,
+        resolution: float = 0.01,
+        levels: int = 5,
+    ):
+        """
+        Args:
+            clock: 时钟 (系统时钟或虚拟时钟)
+            post: TIMER 事件发布函数
+            resolution: 刻度 (秒)，即触发抖动上界
+            levels: 层数 (超出最高层范围的定时器在最高层暂存，到时重新定位)
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if levels <= 0:
+            raise ValueError("levels must be positive")
+        self.clock = clock
+        self.post = post
+        self.resolution = resolution
+        self.levels = levels
+        self._tick_ns = max(1, int(resolution * 1_000_000_000))
+        self._horizon = 1 << (SLOT_BITS * levels)
+        self._wheels: List[List[Dict[WheelTimer, None]]] = [
+            [{} for _ in range(SLOTS)] for _ in range(levels)
+        ]
+        self._counts = [0] * levels         # 各层定时器数
+        self._size = 0
+        self._tick = clock.now_ns() // self._tick_ns    # 已处理到的刻度
+        self._handle: Optional[TimerHandle] = None      # 时钟唤醒
+        self._armed: Optional[int] = None                # 唤醒刻度
+
+    @classmethod
+    def attach(cls, event_loop: "EventLoop", resolution: float = 0.01) -> "TimerWheel":
+        """
+        创建向事件循环发布 TIMER 事件的时间轮 (使用事件循环的时钟)
+        Args:
+            event_loop: 事件循环
+            resolution: 刻度 (秒)
+        Returns:
+            TimerWheel: 时间轮
+        """
+        return cls(event_loop.clock, event_loop.post_due, resolution)
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ============ 定时器管理 ============
+
+    def schedule(
+        self,
+        timer_id: str,
+        interval: float,
+        source: str = "",
+        periodic: bool = True,
+        start_ns: Optional[int] = None,
+    ) -> WheelTimer:
+        """
+        添加定时器
+        系统时钟下需在运行中的 asyncio 事件循环内调用
+        Args:
+            timer_id: 定时器ID (TIMER 事件的 data)
+            interval: 间隔秒数
+            source: 所属策略 (TIMER 事件的 source)
+            periodic: 是否周期触发
+            start_ns: 周期起点 (纪元纳秒，可选，默认当前时间)
+        Returns:
+            WheelTimer: 定时器 (可取消)
+        """
+        interval_ns = int(interval * 1_000_000_000)
+        if interval_ns <= 0:
+            raise ValueError("interval must be positive")
+        if start_ns is None:
+            start_ns = self.clock.now_ns()
+        timer = WheelTimer(
+            self, timer_id, source, start_ns,
+            interval_ns if periodic else 0, start_ns + interval_ns,
+        )
+        self._add(timer)
+        return timer
+
+    def restore(
+        self,
+        timer_id: str,
+        source: str,
+        start_ns: int,
+        interval_ns: int,
+        deadline_ns: int,
+    ) -> WheelTimer:
+        """
+        按保存的周期起点与到期时间重新加入定时器 (用于从快照恢复)
+        Args:
+            timer_id: 定时器ID
+            source: 所属策略
+            start_ns: 周期起点 (纪元纳秒)
+            interval_ns: 周期纳秒数 (0 为一次性)
+            deadline_ns: 下次到期时间 (纪元纳秒)
+        Returns:
+            WheelTimer: 定时器 (可取消)
+        """
+        timer = WheelTimer(self, timer_id, source, start_ns, interval_ns, deadline_ns)
+        self._add(timer)
+        return timer
+
+    def cancel(self, timer: WheelTimer) -> bool:
+        """
+        取消定时器
+        Returns:
+            bool: 取消前是否仍在等待
+        """
+        timer.cancelled = True
+        bucket = timer.bucket
+        if bucket is None:
+            return False
+        del bucket[timer]
+        timer.bucket = None
+        self._counts[timer.level] -= 1
+        self._size -= 1
+        return True
+
+    def _add(self, timer: WheelTimer, arm: bool = True) -> None:
+        """按到期时间放入时间轮，必要时提前时钟唤醒"""
+        # 向上取整，保证不早于到期时间触发
+        timer.expires = max(-(-timer.deadline_ns // self._tick_ns), self._tick + 1)
+        visit = self._place(timer)
+        self._size += 1
+        if arm and (self._armed is None or visit < self._armed):
+            self._arm(visit)
+
+    def _place(self, timer: WheelTimer) -> int:
+        """
+        放入对应层的槽位
+        Returns:
+            int: 该槽位下次被处理的刻度
+        """
+        delta = timer.expires - self._tick
+        if delta >= self._horizon:
+            level = self.levels - 1
+            position = self._tick + self._horizon - 1
+        else:
+            level = (delta.bit_length() - 1) // SLOT_BITS if delta > 0 else 0
+            position = timer.expires
+        shift = SLOT_BITS * level
+        bucket = self._wheels[level][(position >> shift) & SLOT_MASK]
+        bucket[timer] = None
+        timer.bucket = bucket
+        timer.level = level
+        self._counts[level] += 1
+        return (position >> shift) << shift
+
+    # ============ 推进 ============
+
+    def _next_visit(self) -> int:
+        """下一个有定时器的槽位被处理的刻度 (中间的空刻度可直接跳过)"""
+        best = -1
+        for level, count in enumerate(self._counts):
+            if not count:
+                continue
+            shift = SLOT_BITS * level
+            base = self._tick >> shift
+            wheel = self._wheels[level]
+            for k in range(1, SLOTS + 1):
+                if wheel[(base + k) & SLOT_MASK]:
+                    visit = (base + k) << shift
+                    if best < 0 or visit < best:
+                        best = visit
+                    break
+        return best
+
+    def _expire(self, target: int) -> List[WheelTimer]:
+        """
+        推进到指定刻度
+        Returns:
+            List[WheelTimer]: 到期的定时器 (按到期时间排序)
+        """
+        fired: List[WheelTimer] = []
+        while self._tick < target:
+            visit = self._next_visit() if self._size else -1
+            if visit < 0 or visit > target:
+                self._tick = target
+                break
+            self._tick = tick = visit
+            # 高层槽位下放 (由高到低，下放到当前刻度的定时器在第 0 层随即触发)
+            for level in range(self.levels - 1, 0, -1):
+                shift = SLOT_BITS * level
+                if tick & ((1 << shift) - 1):
+                    continue
+                bucket = self._wheels[level][(tick >> shift) & SLOT_MASK]
+                if bucket:
+                    timers = list(bucket)
+                    bucket.clear()
+                    self._counts[level] -= len(timers)
+                    for timer in timers:
+                        self._place(timer)
+            bucket = self._wheels[0][tick & SLOT_MASK]
+            if bucket:
+                self._counts[0] -= len(bucket)
+                self._size -= len(bucket)
+                for timer in bucket:
+                    timer.bucket = None
+                fired.extend(sorted(bucket, key=lambda t: t.deadline_ns))
+                bucket.clear()
+        return fired
+
+    def _arm(self, tick: int) -> None:
+        """把时钟唤醒设置到指定刻度"""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed = tick
+        self._handle = self.clock.call_at(tick * self._tick_ns, self._on_clock)
+
+    def _on_clock(self) -> Optional[Awaitable[None]]:
+        """时钟唤醒: 触发到期定时器，重新设置唤醒"""
+        self._handle = None
+        self._armed = None
+        now = self.clock.now_ns()
+        pending = []
+        for timer in self._expire(now // self._tick_ns):
+            if timer.cancelled:
+                continue
+            if timer.interval_ns:
+                # 周期定时器: 下一个 起点 + k * 周期 (跳过已错过的周期)
+                periods = (now - timer.start_ns) // timer.interval_ns + 1
+                timer.deadline_ns = timer.start_ns + periods * timer.interval_ns
+                self._add(timer, arm=False)
+            result = self.post(Event(EventType.TIMER, timer.timer_id, source=timer.source, ts_ns=now))
+            if inspect.isawaitable(result):
+                pending.append(result)
+        if self._size:
+            self._arm(self._next_visit())
+        if pending:
+            return self._await_all(pending)
+        return None
+
+    @staticmethod
+    async def _await_all(pending: List[Awaitable[Any]]) -> None:
+        """依次等待发布结果 (保持触发顺序)"""
+        for result in pending:
+            await result
+
+
+def timer_router(strategies: Iterable["BaseStrategy"]) -> Callable[[Event], None]:
+    """
+    TIMER 事件处理器: 按事件来源分发给对应策略的 on_timer
+    Args:
+        strategies: 策略列表
+    Returns:
+        Callable: 事件处理器 (注册到事件循环的 TIMER 事件)
+    """
+    by_name = {strategy.name: strategy for strategy in strategies}
+
+    def route(event: Event) -> None:
+        strategy = by_name.get(event.source)
+        if strategy is not None:
+            strategy.on_timer(event.data)
+
+    return route
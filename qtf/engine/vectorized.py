@@ -0,0 +1,219 @@
+"""
+向量化回测 (Vectorized Backtest)
+基于 NumPy 整列计算的回测模式，用于大批量标的/参数组合的快速筛选
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+
+@dataclass
+class VectorizedResult:
+    """
+    向量化回测结果
+    数组第 0 维为时间；若输入为二维，第 1 维为标的/参数组合
+    """
+    equity: np.ndarray                  # 资金曲线
+    positions: np.ndarray               # 每根K线收盘后的持仓数量
+    trade_volume: np.ndarray            # 成交数量 (正数买入, 负数卖出)
+    fill_price: np.ndarray              # 成交价 (含滑点)
+    commission: np.ndarray              # 手续费
+
+    # 绩效指标 (一维输入为标量, 二维输入为每列一个值)
+    total_return: np.ndarray
+    annual_return: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe_ratio: np.ndarray
+    total_trades: np.ndarray
+    win_trades: np.ndarray
+    lose_trades: np.ndarray
+    win_rate: np.ndarray
+
+
+def signals_to_positions(
+    signals: np.ndarray,
+    prices: np.ndarray,
+    capital: float,
+) -> np.ndarray:
+    """
+    将目标仓位信号转换为持仓数量
+    信号在出现的K线按收盘价折算为股数，之后保持不变直到下一个信号
+    Args:
+        signals: 目标仓位比例 (相对初始资金, 1 为满仓做多, -1 为满仓做空,
+                 0 为空仓, NaN 表示维持上一信号)
+        prices: 价格数组
+        capital: 初始资金
+    Returns:
+        np.ndarray: 持仓数量
+    """
+    signals, prices = np.broadcast_arrays(
+        np.asarray(signals, dtype=np.float64),
+        np.asarray(prices, dtype=np.float64),
+    )
+    n = signals.shape[0]
+    valid = ~np.isnan(signals) & (prices > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        size = np.where(valid, signals * capital / prices, 0.0)
+
+    # 前向填充: 每个位置取最近一次有效信号的下标
+    index = np.arange(n).reshape((n,) + (1,) * (signals.ndim - 1))
+    last = np.maximum.accumulate(np.where(valid, index, -1), axis=0)
+    positions = np.take_along_axis(size, np.maximum(last, 0), axis=0)
+    positions[last < 0] = 0.0
+    return positions
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    initial_capital: float,
+    periods_per_year: int = 252,
+) -> Dict[str, np.ndarray]:
+    """
+    根据资金曲线计算绩效指标
+    Args:
+        equity: 资金曲线 (第 0 维为时间)
+        initial_capital: 初始资金
+        periods_per_year: 每年K线数量 (用于年化)
+    Returns:
+        Dict: total_return, annual_return, max_drawdown, sharpe_ratio
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    n = equity.shape[0]
+    start = np.full((1,) + equity.shape[1:], float(initial_capital))
+
+    prev = np.concatenate([start, equity[:-1]], axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(prev != 0, equity / prev - 1.0, 0.0)
+
+    total_return = equity[-1] / initial_capital - 1.0
+    growth = np.maximum(1.0 + total_return, 0.0)
+    annual_return = np.power(growth, periods_per_year / n) - 1.0
+
+    peak = np.maximum.accumulate(np.concatenate([start, equity], axis=0), axis=0)[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, 1.0 - equity / peak, 0.0)
+    max_drawdown = drawdown.max(axis=0)
+
+    if n > 1:
+        std = returns.std(axis=0, ddof=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(
+                std > 0,
+                returns.mean(axis=0) / std * np.sqrt(periods_per_year),
+                0.0,
+            )
+    else:
+        sharpe = np.zeros(equity.shape[1:])
+
+    return {
+        "total_return": total_return,
+        "annual_return": annual_return,
+        "max_drawdown": max_drawdown,
+        "sharpe_ratio": sharpe,
+    }
+
+
+def _segment_stats(
+    prices: np.ndarray,
+    positions: np.ndarray,
+    trade_volume: np.ndarray,
+    costs: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    按持仓区间统计盈亏次数
+    每次调仓开启一个新区间，区间盈亏 = 持仓期间的盯市盈亏 - 开仓时的交易成本
+    """
+    n = prices.shape[0]
+    prices2 = prices.reshape(n, -1)
+    positions2 = positions.reshape(n, -1)
+    traded = (trade_volume != 0).reshape(n, -1)
+    costs2 = costs.reshape(n, -1)
+    k = prices2.shape[1]
+
+    zeros = np.zeros((1, k))
+    held = np.concatenate([zeros, positions2[:-1]], axis=0)
+    prev_price = np.concatenate([prices2[:1], prices2[:-1]], axis=0)
+    mtm = held * (prices2 - prev_price)
+
+    segment = np.cumsum(traded, axis=0)
+    held_segment = np.concatenate([zeros.astype(segment.dtype), segment[:-1]], axis=0)
+
+    # 各列区间编号错开，一次 bincount 完成所有列的分组求和
+    offset = np.arange(k) * (n + 1)
+    size = k * (n + 1)
+    pnl = (
+        np.bincount((held_segment + offset).ravel(), mtm.ravel(), minlength=size)
+        - np.bincount((segment + offset).ravel(), costs2.ravel(), minlength=size)
+    ).reshape(k, n + 1)
+
+    segment_position = np.zeros(size)
+    segment_position[(segment + offset).ravel()] = positions2.ravel()
+    active = segment_position.reshape(k, n + 1) != 0
+
+    win = np.count_nonzero(active & (pnl > 0), axis=1)
+    lose = np.count_nonzero(active & (pnl < 0), axis=1)
+    shape = prices.shape[1:]
+    return {
+        "win_trades": win.reshape(shape),
+        "lose_trades": lose.reshape(shape),
+    }
+
+
+def vectorized_backtest(
+    prices: np.ndarray,
+    positions: np.ndarray,
+    initial_capital: float = 100000.0,
+    commission: float = 0.0003,
+    slippage: float = 0.0001,
+    periods_per_year: int = 252,
+) -> VectorizedResult:
+    """
+    向量化回测
+    每根K线按收盘价调仓至目标持仓，买入成交价上浮、卖出成交价下浮 slippage
+    Args:
+        prices: 收盘价数组, 形状 (n,) 或 (n, k)
+        positions: 目标持仓数量, 可与 prices 广播
+        initial_capital: 初始资金
+        commission: 手续费率
+        slippage: 滑点 (比例)
+        periods_per_year: 每年K线数量
+    Returns:
+        VectorizedResult: 回测结果
+    """
+    prices, positions = np.broadcast_arrays(
+        np.asarray(prices, dtype=np.float64),
+        np.asarray(positions, dtype=np.float64),
+    )
+    if prices.shape[0] == 0:
+        raise ValueError("Empty price array")
+
+    trade_volume = np.diff(positions, axis=0, prepend=0.0)
+    fill_price = prices * (1.0 + slippage * np.sign(trade_volume))
+    fees = np.abs(trade_volume) * fill_price * commission
+
+    cash = initial_capital - np.cumsum(trade_volume * fill_price + fees, axis=0)
+    equity = cash + positions * prices
+
+    metrics = compute_metrics(equity, initial_capital, periods_per_year)
+    costs = trade_volume * (fill_price - prices) + fees
+    stats = _segment_stats(prices, positions, trade_volume, costs)
+
+    total_trades = np.count_nonzero(trade_volume, axis=0)
+    closed = stats["win_trades"] + stats["lose_trades"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rate = np.where(closed > 0, stats["win_trades"] / closed, 0.0)
+
+    return VectorizedResult(
+        equity=equity,
+        positions=np.array(positions),
+        trade_volume=trade_volume,
+        fill_price=fill_price,
+        commission=fees,
+        total_trades=total_trades,
+        win_rate=win_rate,
+        **metrics,
+        **stats,
+    )
@@ -0,0 +1,230 @@
+"""
+滚动优化 (Walk-Forward Optimization)
+按滚动窗口在样本内优化参数、在样本外验证，并拼接样本外资金曲线
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Type, TYPE_CHECKING
+
+import numpy as np
+
+from qtf.engine.backtest import BacktestResult
+from qtf.engine.optimize import ParameterSweep, expand_grid
+from qtf.engine.vectorized import compute_metrics
+
+if TYPE_CHECKING:
+    from qtf.data.base import MarketDataAdapter
+    from qtf.engine.base import BaseStrategy
+
+
+@dataclass
+class WalkForwardWindow:
+    """滚动窗口"""
+    train_start: datetime               # 样本内开始
+    train_end: datetime                 # 样本内结束 (含)
+    test_start: datetime                # 样本外开始
+    test_end: datetime                  # 样本外结束 (含)
+
+    best_params: Dict[str, Any] = field(default_factory=dict)
+    train_score: float = 0.0            # 样本内最优指标
+    test_result: Optional[BacktestResult] = None
+
+
+def split_windows(
+    start: datetime,
+    end: datetime,
+    train: timedelta,
+    test: timedelta,
+    step: Optional[timedelta] = None,
+) -> List[WalkForwardWindow]:
+    """
+    划分滚动窗口
+    Args:
+        start: 开始时间
+        end: 结束时间
+        train: 样本内长度
+        test: 样本外长度
+        step: 滚动步长 (默认等于样本外长度, 样本外区间首尾相接；
+            不能小于样本外长度，否则样本外区间重叠，拼接时会重复计入)
+    Returns:
+        List[WalkForwardWindow]: 窗口列表
+    """
+    step = step or test
+    if step < test:
+        raise ValueError("step must not be shorter than the test window")
+    tick = timedelta(microseconds=1)
+    windows = []
+    train_start = start
+    while train_start + train < end:
+        test_start = train_start + train
+        windows.append(WalkForwardWindow(
+            train_start=train_start,
+            train_end=test_start - tick,
+            test_start=test_start,
+            test_end=min(test_start + test - tick, end),
+        ))
+        train_start += step
+    return windows
+
+
+def stitch_results(
+    strategy_name: str,
+    results: Sequence[BacktestResult],
+    initial_capital: float,
+    periods_per_year: int = 252,
+) -> BacktestResult:
+    """
+    拼接多段样本外回测结果
+    每段资金曲线按上一段期末权益复利衔接
+    Args:
+        strategy_name: 策略名称
+        results: 按时间排序的回测结果
+        initial_capital: 初始资金
+        periods_per_year: 每年K线数量
+    Returns:
+        BacktestResult: 拼接后的回测结果
+    """
+    curves = []
+    scale = 1.0
+    for result in results:
+        curve = np.asarray(result.equity_curve, dtype=np.float64)
+        curves.append(curve * scale)
+        if len(curve):
+            scale *= curve[-1] / initial_capital
+    equity = np.concatenate(curves) if curves else np.empty(0)
+
+    stitched = BacktestResult(
+        strategy_name=strategy_name,
+        start_date=results[0].start_date if results else datetime.now(),
+        end_date=results[-1].end_date if results else datetime.now(),
+        total_trades=sum(r.total_trades for r in results),
+        win_trades=sum(r.win_trades for r in results),
+        lose_trades=sum(r.lose_trades for r in results),
+        equity_curve=equity,
+        curve_stride=max((r.curve_stride for r in results), default=1),
+    )
+    if results:
+        stitched.dates = np.concatenate([r.dates for r in results])
+        stitched.trades = np.concatenate([r.trades for r in results])
+    closed = stitched.win_trades + stitched.lose_trades
+    stitched.win_rate = stitched.win_trades / closed if closed else 0.0
+    if len(equity):
+        metrics = compute_metrics(equity, initial_capital, periods_per_year)
+        for key, value in metrics.items():
+            setattr(stitched, key, float(value))
+    return stitched
+
+
+class WalkForwardOptimizer:
+    """
+    滚动优化器
+    全区间数据只通过 get_history 拉取一次并放入共享内存，各窗口按时间切片复用；
+    所有窗口的回测任务提交到同一个进程池并发执行
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type["BaseStrategy"],
+        adapter: "MarketDataAdapter",
+        symbols: Sequence[str],
+        interval: str = "1d",
+        max_workers: Optional[int] = None,
+        **engine_kwargs: Any,
+    ):
+        """
+        Args:
+            strategy_cls: 策略类
+            adapter: 行情数据适配器
+            symbols: 标的列表
+            interval: K线周期
+            max_workers: 进程数 (0 为在当前进程串行执行)
+            engine_kwargs: 传给 BacktestEngine 的参数
+        """
+        self.strategy_cls = strategy_cls
+        self.adapter = adapter
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.max_workers = max_workers
+        self.engine_kwargs = engine_kwargs
+        self.windows: List[WalkForwardWindow] = []
+
+    async def run(
+        self,
+        start: datetime,
+        end: datetime,
+        train: timedelta,
+        test: timedelta,
+        param_grid: Dict[str, Sequence[Any]],
+        step: Optional[timedelta] = None,
+        sort_by: str = "sharpe_ratio",
+        ascending: bool = False,
+    ) -> BacktestResult:
+        """
+        运行滚动优化
+        Args:
+            start: 开始时间
+            end: 结束时间
+            train: 样本内长度
+            test: 样本外长度
+            param_grid: 参数网格
+            step: 滚动步长 (可选)
+            sort_by: 优化目标指标
+            ascending: 指标是否越小越好
+        Returns:
+            BacktestResult: 拼接后的样本外回测结果
+        """
+        self.windows = split_windows(start, end, train, test, step)
+        if not self.windows:
+            raise ValueError("Date range shorter than one training window")
+
+        histories = await asyncio.gather(*(
+            self.adapter.get_history(symbol, start, end, self.interval)
+            for symbol in self.symbols
+        ))
+        data = dict(zip(self.symbols, histories))
+        param_sets = expand_grid(param_grid)
+
+        with ParameterSweep(
+            self.strategy_cls, data, self.max_workers, **self.engine_kwargs
+        ) as sweep:
+            await asyncio.gather(*(
+                self._run_window(sweep, window, param_sets, sort_by, ascending)
+                for window in self.windows
+            ))
+
+        return stitch_results(
+            self.strategy_cls.__name__,
+            [w.test_result for w in self.windows],
+            self.engine_kwargs.get("initial_capital", 100000.0),
+            self.engine_kwargs.get("periods_per_year", 252),
+        )
+
+    async def _run_window(
+        self,
+        sweep: ParameterSweep,
+        window: WalkForwardWindow,
+        param_sets: List[Dict[str, Any]],
+        sort_by: str,
+        ascending: bool,
+    ) -> None:
+        """样本内优化后在样本外验证"""
+        table = await sweep.run(
+            param_sets,
+            start=window.train_start,
+            end=window.train_end,
+            sort_by=sort_by,
+            ascending=ascending,
+        )
+        best = table.iloc[0]
+        window.best_params = {key: _to_python(best[key]) for key in param_sets[0]}
+        window.train_score = float(best[sort_by])
+        window.test_result = await sweep.submit(
+            window.best_params, window.test_start, window.test_end
+        )
+
+
+def _to_python(value: Any) -> Any:
+    """将 NumPy 标量转换为 Python 原生类型"""
+    return value.item() if isinstance(value, np.generic) else value
@@ -5,10 +5,16 @@ QTF Execution Layer
 
 from qtf.execution.base import BrokerDriver
 from qtf.execution.models import Order, Position, Account
+from qtf.execution.matching import MatchingEngine, OrderBook, Fill
+from qtf.execution.simulated import SimulatedAccount
 
 __all__ = [
     "BrokerDriver",
     "Order",
     "Position",
     "Account",
+    "MatchingEngine",
+    "OrderBook",
+    "Fill",
+    "SimulatedAccount",
 ]
@@ -0,0 +1,305 @@
+"""
+模拟撮合 (Simulated Matching)
+回测用的按价格索引的委托簿，每根K线/每个 Tick 只触及价格被穿越的委托
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from qtf.core.exceptions import OrderError
+from qtf.execution.models import Order, OrderDirection, OrderStatus, OrderType
+
+if TYPE_CHECKING:
+    from qtf.data.models import Bar
+
+
+@dataclass
+class Fill:
+    """
+    成交回报
+    """
+    order_id: str                       # 订单ID
+    symbol: str                         # 标的代码
+    direction: OrderDirection           # 方向
+    price: float                        # 成交价 (含滑点)
+    volume: int                         # 成交数量
+    commission: float                   # 手续费
+    timestamp: datetime                 # 成交时间
+    strategy_id: Optional[str] = None   # 策略ID
+
+
+# 堆元素: (排序键, 序号, 订单ID)
+_HeapItem = Tuple[float, int, str]
+
+
+class OrderBook:
+    """
+    单标的委托簿
+    买入限价 / 卖出限价 / 买入止损 / 卖出止损各用一个堆按价格排序，
+    撮合时只弹出价格被穿越的委托；撤单为惰性删除 O(1)
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._orders: Dict[str, Order] = {}
+        self._market: List[str] = []
+        self._buy_limits: List[_HeapItem] = []      # 键为 -价格 (价格高者优先)
+        self._sell_limits: List[_HeapItem] = []     # 键为 价格 (价格低者优先)
+        self._buy_stops: List[_HeapItem] = []       # 键为 触发价 (触发价低者先触发)
+        self._sell_stops: List[_HeapItem] = []      # 键为 -触发价 (触发价高者先触发)
+        self._seq = 0                               # 同价位按挂单先后排序
+        self._stale = 0                             # 堆中已撤销的元素数
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def _next_seq(self) -> int:
+        """分配挂单序号"""
+        self._seq += 1
+        return self._seq
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    @property
+    def orders(self) -> List[Order]:
+        """未成交委托"""
+        return list(self._orders.values())
+
+    def add(self, order: Order) -> None:
+        """
+        挂单
+        Args:
+            order: 订单 (order_id 需已分配)
+        """
+        self._orders[order.order_id] = order
+        buy = order.direction == OrderDirection.BUY
+
+        if order.order_type == OrderType.MARKET:
+            self._market.append(order.order_id)
+        elif order.order_type == OrderType.LIMIT:
+            self._push_limit(order)
+        else:
+            stop = order.stop_price if order.stop_price is not None else order.price
+            if buy:
+                heapq.heappush(self._buy_stops, (stop, self._next_seq(), order.order_id))
+            else:
+                heapq.heappush(self._sell_stops, (-stop, self._next_seq(), order.order_id))
+
+    def _push_limit(self, order: Order) -> None:
+        """挂入限价堆"""
+        if order.direction == OrderDirection.BUY:
+            heapq.heappush(self._buy_limits, (-order.price, self._next_seq(), order.order_id))
+        else:
+            heapq.heappush(self._sell_limits, (order.price, self._next_seq(), order.order_id))
+
+    def cancel(self, order_id: str) -> Optional[Order]:
+        """
+        撤单 (堆中的元素在弹出时跳过)
+        Returns:
+            Optional[Order]: 被撤销的订单
+        """
+        order = self._orders.pop(order_id, None)
+        if order is not None:
+            order.status = OrderStatus.CANCELLED
+            self._stale += 1
+            if self._stale > len(self._orders) + 64:
+                self._compact()
+        return order
+
+    def _compact(self) -> None:
+        """清理堆中已撤销的元素"""
+        for heap in (self._buy_limits, self._sell_limits, self._buy_stops, self._sell_stops):
+            heap[:] = [item for item in heap if item[2] in self._orders]
+            heapq.heapify(heap)
+        self._market = [oid for oid in self._market if oid in self._orders]
+        self._stale = 0
+
+    def _pop_crossed(
+        self,
+        heap: List[_HeapItem],
+        bound: float,
+    ) -> List[Order]:
+        """弹出排序键不大于 bound 的有效委托"""
+        crossed = []
+        while heap and heap[0][0] <= bound:
+            _, _, order_id = heapq.heappop(heap)
+            order = self._orders.get(order_id)
+            if order is not None:
+                crossed.append(order)
+            elif self._stale:
+                self._stale -= 1
+        return crossed
+
+    def match(
+        self,
+        open_price: float,
+        high: float,
+        low: float,
+    ) -> List[Tuple[Order, float]]:
+        """
+        以一根K线的价格区间撮合 (Tick 撮合时三者相同)
+        Args:
+            open_price: 开盘价
+            high: 最高价
+            low: 最低价
+        Returns:
+            List[Tuple[Order, float]]: (订单, 成交价) 列表, 未计滑点
+        """
+        fills: List[Tuple[Order, float]] = []
+
+        # 市价单按开盘价成交
+        for order_id in self._market:
+            order = self._orders.get(order_id)
+            if order is not None:
+                fills.append((order, open_price))
+            elif self._stale:
+                self._stale -= 1
+        self._market.clear()
+
+        # 止损触发：止损单转市价，止损限价单转限价；
+        # 触发后的参考价为 max(开盘价, 触发价) (卖出为 min)，不能按触发前的开盘价成交
+        pending: List[Order] = []
+        triggered = self._pop_crossed(self._buy_stops, high)
+        triggered += self._pop_crossed(self._sell_stops, -low)
+        for order in triggered:
+            buy = order.direction == OrderDirection.BUY
+            stop = order.stop_price if order.stop_price is not None else order.price
+            reference = max(open_price, stop) if buy else min(open_price, stop)
+            if order.order_type == OrderType.STOP:
+                fills.append((order, reference))
+            elif (reference <= order.price) if buy else (reference >= order.price):
+                # 参考价已满足限价: 按参考价成交
+                fills.append((order, reference))
+            elif reference == open_price:
+                # 开盘即触发: 整根K线都在触发之后，本根K线按限价撮合
+                self._push_limit(order)
+            else:
+                # 盘中触发: K线区间可能含触发前的价格，从下一根K线起按限价撮合
+                pending.append(order)
+
+        # 限价单：价格穿越后按限价或更优的开盘价成交
+        for order in self._pop_crossed(self._buy_limits, -low):
+            fills.append((order, min(order.price, open_price)))
+        for order in self._pop_crossed(self._sell_limits, high):
+            fills.append((order, max(order.price, open_price)))
+        for order in pending:
+            self._push_limit(order)
+
+        for order, _ in fills:
+            del self._orders[order.order_id]
+        return fills
+
+
+class MatchingEngine:
+    """
+    模拟撮合引擎
+    按标的维护委托簿，成交价计入滑点，并按费率计算手续费
+    """
+
+    def __init__(self, commission: float = 0.0003, slippage: float = 0.0001):
+        self.commission = commission
+        self.slippage = slippage
+        self._books: Dict[str, OrderBook] = {}
+        self._order_symbols: Dict[str, str] = {}
+        self._next_id = 0
+
+    def book(self, symbol: str) -> OrderBook:
+        """获取 (或创建) 标的委托簿"""
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = OrderBook(symbol)
+        return book
+
+    @property
+    def open_orders(self) -> List[Order]:
+        """所有未成交委托"""
+        return [order for book in self._books.values() for order in book.orders]
+
+    def submit(self, order: Order) -> str:
+        """
+        提交订单
+        Args:
+            order: 订单
+        Returns:
+            str: 订单ID
+        """
+        if order.volume <= 0:
+            raise OrderError(f"Invalid order volume: {order.volume}")
+        if order.order_type == OrderType.STOP_LIMIT and order.stop_price is None:
+            raise OrderError("STOP_LIMIT order requires stop_price")
+
+        if not order.order_id:
+            self._next_id += 1
+            order.order_id = f"SIM{self._next_id}"
+        order.status = OrderStatus.SUBMITTED
+        self.book(order.symbol).add(order)
+        self._order_symbols[order.order_id] = order.symbol
+        return order.order_id
+
+    def cancel(self, order_id: str) -> bool:
+        """
+        撤单
+        Returns:
+            bool: 是否撤单成功
+        """
+        symbol = self._order_symbols.pop(order_id, None)
+        if symbol is None:
+            return False
+        return self._books[symbol].cancel(order_id) is not None
+
+    def match(
+        self,
+        symbol: str,
+        open_price: float,
+        high: float,
+        low: float,
+        timestamp: datetime,
+    ) -> List[Fill]:
+        """
+        撮合指定标的
+        Args:
+            symbol: 标的代码
+            open_price: 开盘价
+            high: 最高价
+            low: 最低价
+            timestamp: 成交时间
+        Returns:
+            List[Fill]: 成交列表
+        """
+        book = self._books.get(symbol)
+        if not book:
+            return []
+
+        fills = []
+        for order, price in book.match(open_price, high, low):
+            buy = order.direction == OrderDirection.BUY
+            if order.order_type in (OrderType.MARKET, OrderType.STOP):
+                # 限价与止损限价单的成交价不能劣于限价，不计滑点
+                price *= 1.0 + self.slippage if buy else 1.0 - self.slippage
+            order.status = OrderStatus.FILLED
+            order.filled_volume = order.volume
+            order.filled_price = price
+            order.update_time = timestamp
+            self._order_symbols.pop(order.order_id, None)
+            fills.append(Fill(
+                order_id=order.order_id,
+                symbol=symbol,
+                direction=order.direction,
+                price=price,
+                volume=order.volume,
+                commission=price * order.volume * self.commission,
+                timestamp=timestamp,
+                strategy_id=order.strategy_id,
+            ))
+        return fills
+
+    def match_bar(self, bar: "Bar") -> List[Fill]:
+        """按K线撮合"""
+        return self.match(bar.symbol, bar.open, bar.high, bar.low, bar.timestamp)
+
+    def match_price(self, symbol: str, price: float, timestamp: datetime) -> List[Fill]:
+        """按最新成交价撮合 (Tick)"""
+        return self.match(symbol, price, price, price, timestamp)
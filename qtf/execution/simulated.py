@@ -0,0 +1,119 @@
+"""
+模拟账户 (Simulated Account)
+回测/模拟交易用的资金与持仓记账
+"""
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from qtf.execution.models import Account, OrderDirection, Position
+
+if TYPE_CHECKING:
+    from qtf.execution.matching import Fill
+
+
+class SimulatedAccount:
+    """
+    模拟账户
+    按成交回报更新现金和持仓 (支持多空)，按最新价计算权益
+    """
+
+    def __init__(self, initial_capital: float, account_id: str = "simulated"):
+        self.account_id = account_id
+        self.initial_capital = initial_capital
+        self.cash: float = initial_capital
+        self.positions: Dict[str, Position] = {}
+        self.last_prices: Dict[str, float] = {}
+
+    def quantity(self, symbol: str) -> int:
+        """带方向的持仓数量 (空头为负)"""
+        pos = self.positions.get(symbol)
+        if pos is None:
+            return 0
+        return pos.volume if pos.direction == "LONG" else -pos.volume
+
+    def update_price(self, symbol: str, price: float) -> None:
+        """更新最新价"""
+        self.last_prices[symbol] = price
+        pos = self.positions.get(symbol)
+        if pos is not None:
+            qty = self.quantity(symbol)
+            pos.current_price = price
+            pos.market_value = qty * price
+            pos.profit = qty * (price - pos.cost_price)
+
+    def apply_fill(self, fill: "Fill") -> Optional[float]:
+        """
+        记入一笔成交
+        Args:
+            fill: 成交回报
+        Returns:
+            Optional[float]: 平仓盈亏 (扣除本笔手续费)，纯开仓返回 None
+        """
+        qty = self.quantity(fill.symbol)
+        delta = fill.volume if fill.direction == OrderDirection.BUY else -fill.volume
+        self.cash -= delta * fill.price + fill.commission
+
+        pos = self.positions.get(fill.symbol)
+        cost = pos.cost_price if pos else 0.0
+        pnl: Optional[float] = None
+
+        if qty == 0 or (qty > 0) == (delta > 0):
+            # 开仓或加仓: 更新持仓均价
+            new_qty = qty + delta
+            cost = (abs(qty) * cost + abs(delta) * fill.price) / abs(new_qty)
+        else:
+            # 减仓/平仓/反手
+            closed = min(abs(delta), abs(qty))
+            sign = 1 if qty > 0 else -1
+            pnl = closed * (fill.price - cost) * sign - fill.commission
+            new_qty = qty + delta
+            if new_qty != 0 and (new_qty > 0) != (qty > 0):
+                cost = fill.price
+
+        if new_qty == 0:
+            self.positions.pop(fill.symbol, None)
+        else:
+            if pos is None:
+                pos = self.positions[fill.symbol] = Position(
+                    symbol=fill.symbol, volume=0, available=0,
+                    account_id=self.account_id,
+                )
+            pos.volume = abs(new_qty)
+            pos.available = abs(new_qty)
+            pos.direction = "LONG" if new_qty > 0 else "SHORT"
+            pos.cost_price = cost
+            pos.update_time = fill.timestamp
+        self.update_price(fill.symbol, self.last_prices.get(fill.symbol, fill.price))
+        return pnl
+
+    @property
+    def market_value(self) -> float:
+        """持仓市值 (空头为负)"""
+        return sum(
+            self.quantity(symbol) * self.last_prices.get(symbol, pos.cost_price)
+            for symbol, pos in self.positions.items()
+        )
+
+    @property
+    def equity(self) -> float:
+        """总权益"""
+        return self.cash + self.market_value
+
+    def get_positions(self) -> List[Position]:
+        """持仓列表"""
+        return list(self.positions.values())
+
+    def to_account(self) -> Account:
+        """转换为 Account 数据"""
+        market_value = self.market_value
+        total = self.cash + market_value
+        return Account(
+            account_id=self.account_id,
+            balance=self.cash,
+            available=self.cash,
+            market_value=market_value,
+            total_asset=total,
+            profit=total - self.initial_capital,
+            profit_ratio=total / self.initial_capital - 1.0 if self.initial_capital else 0.0,
+            broker="simulated",
+        )
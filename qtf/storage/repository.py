@@ -4,9 +4,12 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic, Any
+from typing import List, Optional, TypeVar, Generic, Any, Sequence, Union
 from datetime import datetime
 
+from qtf.data.models import Bar
+from qtf.data.series import BarSeries
+
 T = TypeVar("T")
 
 
@@ -52,8 +55,8 @@ class QuoteRepository:
         # TODO: 实现保存逻辑
         pass
     
-    async def save_bars(self, symbol: str, bars: List[Any]) -> None:
-        """批量保存K线数据"""
+    async def save_bars(self, symbol: str, bars: Union[BarSeries, Sequence[Bar]]) -> None:
+        """批量保存K线数据 (K线序列或 Bar 列表)"""
         # TODO: 实现批量保存逻辑
         pass
     
@@ -63,7 +66,7 @@ class QuoteRepository:
         start: datetime,
         end: datetime,
         interval: str = "1d",
-    ) -> List[Any]:
+    ) -> BarSeries:
         """
         查询K线数据
         Args:
@@ -72,10 +75,10 @@ class QuoteRepository:
             end: 结束时间
             interval: K线周期
         Returns:
-            List: K线数据列表
+            BarSeries: K线序列
         """
         # TODO: 实现查询逻辑
-        return []
+        return BarSeries.empty(symbol, interval)
     
     async def get_latest_bar(
         self,
@@ -0,0 +1,766 @@
+"""
+回测引擎测试
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from qtf.data.models import Bar
+from qtf.data.series import BarSeries
+from qtf.data.simulated import SimulatedAdapter
+from qtf.engine.base import BaseStrategy
+from qtf.engine.backtest import BacktestEngine, BacktestResult
+from qtf.core import events
+from qtf.core.exceptions import CheckpointError
+from qtf.engine.checkpoint import load_snapshot
+from qtf.engine.columnar import GrowableArray, TradeLog, datetime_to_ns, ns_to_datetime
+from qtf.engine import indicators
+from qtf.engine.feed import merge_bars
+from qtf.engine.metrics import MetricsAccumulator
+from qtf.engine.optimize import ParameterSweep, SharedBarData, expand_grid
+from qtf.engine.robustness import (
+    DEFAULT_MEMORY_BUDGET, _chunk_sizes, block_bootstrap, shuffle_trades, run_monte_carlo,
+)
+from qtf.engine.walkforward import WalkForwardOptimizer, split_windows
+from qtf.engine.vectorized import (
+    vectorized_backtest,
+    signals_to_positions,
+    compute_metrics,
+)
+
+
+class TestVectorizedBacktest:
+    """向量化回测测试"""
+    
+    def test_equity_and_costs(self):
+        """测试资金曲线、手续费和滑点"""
+        prices = np.array([10.0, 11.0, 12.0, 11.0])
+        positions = np.array([100.0, 100.0, 0.0, 0.0])
+        vr = vectorized_backtest(
+            prices, positions, initial_capital=10000.0,
+            commission=0.001, slippage=0.01,
+        )
+        buy = 10.0 * 1.01
+        sell = 12.0 * 0.99
+        fees = 100 * buy * 0.001 + 100 * sell * 0.001
+        expected = 10000.0 + 100 * (sell - buy) - fees
+        assert vr.equity[-1] == pytest.approx(expected)
+        assert int(vr.total_trades) == 2
+        assert int(vr.win_trades) == 1
+        assert int(vr.lose_trades) == 0
+        assert float(vr.total_return) == pytest.approx(expected / 10000.0 - 1)
+    
+    def test_max_drawdown(self):
+        """测试最大回撤"""
+        prices = np.array([10.0, 12.0, 9.0, 13.0])
+        vr = vectorized_backtest(
+            prices, np.full(4, 100.0), initial_capital=1000.0,
+            commission=0.0, slippage=0.0,
+        )
+        # 权益: 1000, 1200, 900, 1300
+        assert float(vr.max_drawdown) == pytest.approx(0.25)
+    
+    def test_2d_matches_columns(self):
+        """测试二维批量结果与逐列结果一致"""
+        rng = np.random.default_rng(0)
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=(200, 1)), axis=0)
+        positions = rng.integers(-2, 3, size=(200, 5)) * 10.0
+        batch = vectorized_backtest(prices, positions)
+        for j in range(5):
+            single = vectorized_backtest(prices[:, 0], positions[:, j])
+            np.testing.assert_allclose(batch.equity[:, j], single.equity)
+            assert batch.sharpe_ratio[j] == pytest.approx(float(single.sharpe_ratio))
+            assert batch.win_trades[j] == single.win_trades
+    
+    def test_signals_to_positions(self):
+        """测试信号前向填充"""
+        signals = np.array([np.nan, 1.0, np.nan, 0.0, np.nan])
+        prices = np.array([10.0, 20.0, 25.0, 30.0, 30.0])
+        positions = signals_to_positions(signals, prices, 1000.0)
+        np.testing.assert_allclose(positions, [0.0, 50.0, 50.0, 0.0, 0.0])
+    
+    def test_engine_run_vectorized(self):
+        """测试引擎向量化模式"""
+        engine = BacktestEngine(initial_capital=1000.0, commission=0.0, slippage=0.0)
+        result = engine.run_vectorized(
+            prices=np.array([10.0, 11.0]),
+            signals=np.array([1.0, np.nan]),
+            symbol="000001.SZ",
+        )
+        assert result.total_return == pytest.approx(0.1)
+        assert len(result.trades) == 1
+        assert result.trades[0]["direction"] == 1
+        assert result.trade_records()[0]["symbol"] == "000001.SZ"
+        assert engine.get_result() is result
+
+
+class RecordingStrategy(BaseStrategy):
+    """记录收到K线的测试策略"""
+    
+    def on_init(self):
+        self.bars = []
+    
+    def on_start(self):
+        pass
+    
+    def on_stop(self):
+        pass
+    
+    def on_bar(self, bar):
+        self.bars.append(bar)
+
+
+def make_bars(symbol, days, start=datetime(2024, 1, 1)):
+    """生成测试K线"""
+    return [
+        Bar(symbol=symbol, interval="1d", timestamp=start + timedelta(days=d), close=10.0 + d)
+        for d in days
+    ]
+
+
+class TestBarFeed:
+    """K线流归并测试"""
+    
+    def test_merge_bars_order(self):
+        """测试多标的按时间归并"""
+        sources = {
+            "A": iter(make_bars("A", [0, 2, 4])),
+            "B": iter(make_bars("B", [1, 2, 3])),
+        }
+        merged = [(b.symbol, b.timestamp.day) for b in merge_bars(sources)]
+        assert merged == [("A", 1), ("B", 2), ("A", 3), ("B", 3), ("B", 4), ("A", 5)]
+    
+    async def test_run_with_async_sources(self):
+        """测试引擎消费异步生成器"""
+        async def agen(symbol, days):
+            for bar in make_bars(symbol, days):
+                yield bar
+        
+        engine = BacktestEngine()
+        strategy = RecordingStrategy(name="rec")
+        engine.set_strategy(strategy)
+        engine.add_data("A", agen("A", [0, 2]))
+        engine.add_data("B", make_bars("B", [1, 3]))
+        result = await engine.run(end_date=datetime(2024, 1, 3))
+        
+        assert [b.symbol for b in strategy.bars] == ["A", "B", "A"]
+        assert len(result.equity_curve) == 3
+        assert not strategy.running
+    
+    async def test_run_with_bar_series(self):
+        """测试引擎消费K线序列 (事件驱动与向量化)"""
+        series = BarSeries.from_bars(make_bars("A", [0, 1, 2, 3]))
+        engine = BacktestEngine()
+        strategy = RecordingStrategy(name="rec")
+        engine.set_strategy(strategy)
+        engine.add_data("A", series)
+        await engine.run()
+        assert [b.timestamp for b in strategy.bars] == [b.timestamp for b in make_bars("A", [0, 1, 2, 3])]
+        
+        result = engine.run_vectorized(positions=np.array([0, 10, 10, 0]), symbol="A")
+        np.testing.assert_array_equal(result.dates, series.ts)
+
+
+class TestParameterSweep:
+    """参数扫描测试"""
+    
+    def test_expand_grid(self):
+        """测试网格展开"""
+        grid = expand_grid({"fast": [5, 10], "slow": [20, 30, 60]})
+        assert len(grid) == 6
+        assert grid[0] == {"fast": 5, "slow": 20}
+    
+    def test_shared_bar_data_roundtrip(self):
+        """测试共享内存K线还原"""
+        bars = make_bars("A", [0, 1, 2, 3])
+        data = SharedBarData({"A": bars})
+        try:
+            attached = SharedBarData.attach(data.spec)
+            window = list(attached.iter_bars("A", datetime(2024, 1, 2), datetime(2024, 1, 3)))
+            attached.close()
+        finally:
+            data.close()
+        assert [b.timestamp for b in window] == [bars[1].timestamp, bars[2].timestamp]
+        assert window[1].close == bars[2].close
+    
+    @pytest.mark.parametrize("max_workers", [0, 2])
+    async def test_grid_search(self, max_workers):
+        """测试并行网格搜索"""
+        data = {"A": make_bars("A", range(10)), "B": make_bars("B", range(10))}
+        with ParameterSweep(RecordingStrategy, data, max_workers=max_workers) as sweep:
+            table = await sweep.grid_search({"n": [1, 2, 3]})
+        assert len(table) == 3
+        assert sorted(table["n"]) == [1, 2, 3]
+        assert "sharpe_ratio" in table.columns
+
+
+class CountingAdapter(SimulatedAdapter):
+    """记录 get_history 调用次数的模拟适配器"""
+    
+    def __init__(self):
+        super().__init__()
+        self.history_calls = 0
+    
+    async def get_history(self, symbol, start, end, interval="1d"):
+        self.history_calls += 1
+        return await super().get_history(symbol, start, end, interval)
+
+
+class TestWalkForward:
+    """滚动优化测试"""
+    
+    def test_split_windows(self):
+        """测试窗口划分"""
+        windows = split_windows(
+            datetime(2024, 1, 1), datetime(2024, 1, 31),
+            train=timedelta(days=10), test=timedelta(days=5),
+        )
+        assert len(windows) == 4
+        assert windows[0].test_start == datetime(2024, 1, 11)
+        assert windows[1].train_start == datetime(2024, 1, 6)
+        assert windows[-1].test_end <= datetime(2024, 1, 31)
+        with pytest.raises(ValueError):
+            split_windows(
+                datetime(2024, 1, 1), datetime(2024, 1, 31),
+                train=timedelta(days=10), test=timedelta(days=5), step=timedelta(days=2),
+            )
+    
+    async def test_walk_forward_run(self):
+        """测试滚动优化并拼接样本外结果"""
+        adapter = CountingAdapter()
+        optimizer = WalkForwardOptimizer(
+            RecordingStrategy, adapter, ["A", "B"], max_workers=0, periods_per_year=52
+        )
+        result = await optimizer.run(
+            datetime(2024, 1, 1), datetime(2024, 2, 29),
+            train=timedelta(days=20), test=timedelta(days=10),
+            param_grid={"n": [1, 2]},
+        )
+        assert adapter.history_calls == 2
+        assert all(w.best_params["n"] in (1, 2) for w in optimizer.windows)
+        assert len(result.equity_curve) == sum(
+            len(w.test_result.equity_curve) for w in optimizer.windows
+        )
+        assert result.start_date == optimizer.windows[0].test_start
+        expected = compute_metrics(result.equity_curve, 100000.0, 52)
+        assert result.annual_return == pytest.approx(float(expected["annual_return"]))
+
+
+class TestMetricsAccumulator:
+    """增量绩效统计测试"""
+    
+    def test_matches_batch_metrics(self):
+        """测试增量结果与批量计算一致"""
+        rng = np.random.default_rng(1)
+        equity = 1000.0 * np.cumprod(1 + rng.normal(0, 0.01, 500))
+        acc = MetricsAccumulator(1000.0)
+        for i, value in enumerate(equity):
+            acc.update(datetime(2024, 1, 1) + timedelta(days=i), float(value))
+        batch = compute_metrics(equity, 1000.0)
+        assert acc.total_return == pytest.approx(float(batch["total_return"]))
+        assert acc.annual_return == pytest.approx(float(batch["annual_return"]))
+        assert acc.max_drawdown == pytest.approx(float(batch["max_drawdown"]))
+        assert acc.sharpe_ratio == pytest.approx(float(batch["sharpe_ratio"]))
+    
+    def test_bounded_curve(self):
+        """测试资金曲线点数上限"""
+        acc = MetricsAccumulator(100.0, max_points=16)
+        for i in range(1000):
+            acc.update(datetime(2024, 1, 1) + timedelta(minutes=i), 100.0 + i)
+        result = acc.fill_result(BacktestResult("s", datetime.now(), datetime.now()))
+        assert len(acc.equity_curve) <= 16
+        assert result.curve_stride == 64
+        assert result.equity_curve[-1] == 1099.0
+        assert np.all(np.diff(result.dates) > 0)
+    
+    def test_trade_counts(self):
+        """测试胜负统计"""
+        acc = MetricsAccumulator(100.0, keep_trades=False)
+        now = datetime(2024, 1, 1)
+        acc.record_trade(now, "A", 1, 10.0, 100)
+        acc.record_trade(now, "A", -1, 10.5, 50, pnl=5.0)
+        acc.record_trade(now, "A", -1, 9.9, 50, pnl=-1.0)
+        assert (acc.total_trades, acc.win_trades, acc.lose_trades) == (3, 1, 1)
+        assert acc.win_rate == 0.5
+        assert len(acc.trades) == 0
+
+
+class TestColumnarResult:
+    """列式回测结果测试"""
+    
+    def test_growable_array(self):
+        """测试可增长数组"""
+        arr = GrowableArray(np.float64, capacity=2)
+        for i in range(10):
+            arr.append(i)
+        arr.extend([10, 11])
+        assert len(arr) == 12
+        arr.decimate(2)
+        np.testing.assert_array_equal(arr.values, [0, 2, 4, 6, 8, 10])
+    
+    def test_trade_log_symbols(self):
+        """测试长代码完整保存，超长代码报错而不是截断"""
+        log = TradeLog()
+        option = "10007325.SH-C-2406-3.50"
+        log.record(datetime(2024, 1, 1), option, 1, 0.5, 10)
+        assert log.values["symbol"][0] == option
+        with pytest.raises(ValueError):
+            log.record(datetime(2024, 1, 1), "X" * 33, 1, 0.5, 10)
+    
+    def test_datetime_ns_roundtrip(self):
+        """测试时间戳转换"""
+        ts = datetime(2024, 3, 1, 9, 30, 0, 123456)
+        assert ns_to_datetime(datetime_to_ns(ts)) == ts
+        assert datetime_to_ns(ts) == np.datetime64(ts, "ns").astype(np.int64)
+    
+    def test_export_and_npz_roundtrip(self, tmp_path):
+        """测试导出 pandas 与 npz 读写"""
+        engine = BacktestEngine(initial_capital=1000.0)
+        dates = [datetime(2024, 1, d) for d in range(1, 6)]
+        result = engine.run_vectorized(
+            prices=np.array([10.0, 11.0, 12.0, 11.0, 13.0]),
+            positions=np.array([0.0, 10.0, 10.0, 0.0, 0.0]),
+            dates=dates,
+            symbol="A",
+        )
+        frame = result.to_pandas()
+        assert np.shares_memory(frame["equity"].to_numpy(), result.equity_curve)
+        assert list(frame.index.to_pydatetime()) == dates
+        assert len(result.trades_to_pandas()) == 2
+        
+        path = tmp_path / "result.npz"
+        result.curve_stride = 3
+        result.save_npz(str(path))
+        loaded = BacktestResult.load_npz(str(path))
+        np.testing.assert_array_equal(loaded.equity_curve, result.equity_curve)
+        for name in result.trades.dtype.names:
+            np.testing.assert_array_equal(loaded.trades[name], result.trades[name])
+        assert loaded.start_date == dates[0]
+        assert loaded.sharpe_ratio == result.sharpe_ratio
+        assert loaded.curve_stride == 3
+
+
+class BuyAndExitStrategy(BaseStrategy):
+    """首根K线市价买入，第三根K线市价卖出"""
+    
+    def on_init(self):
+        self.count = 0
+        self.fills = []
+    
+    def on_start(self):
+        pass
+    
+    def on_stop(self):
+        pass
+    
+    def on_bar(self, bar):
+        self.count += 1
+        if self.count == 1:
+            self.buy(bar.symbol, 0.0, 100, "MARKET")
+        elif self.count == 3:
+            self.sell(bar.symbol, 0.0, 100, "MARKET")
+    
+    def on_trade(self, trade):
+        self.fills.append(trade)
+
+
+class TestEventDrivenBacktest:
+    """事件驱动回测测试"""
+    
+    async def test_orders_matched_on_next_bar(self):
+        """测试委托在下一根K线撮合并计入绩效"""
+        bars = [
+            Bar(symbol="A", interval="1d", timestamp=datetime(2024, 1, d),
+                open=o, high=o, low=o, close=o)
+            for d, o in [(1, 10.0), (2, 11.0), (3, 12.0), (4, 13.0), (5, 13.0)]
+        ]
+        engine = BacktestEngine(initial_capital=10000.0, commission=0.0, slippage=0.0)
+        strategy = BuyAndExitStrategy(name="bx")
+        engine.set_strategy(strategy)
+        engine.add_data("A", bars)
+        result = await engine.run()
+        
+        assert [f.price for f in strategy.fills] == [11.0, 13.0]
+        assert result.total_trades == 2
+        assert result.win_trades == 1
+        np.testing.assert_allclose(
+            result.equity_curve, [10000.0, 10000.0, 10100.0, 10200.0, 10200.0]
+        )
+        assert result.total_return == pytest.approx(0.02)
+        
+        engine = BacktestEngine(
+            initial_capital=10000.0, commission=0.0, slippage=0.0, keep_trades=False
+        )
+        engine.set_strategy(BuyAndExitStrategy(name="bx"))
+        engine.add_data("A", bars)
+        lean = await engine.run()
+        assert len(lean.trades) == 0
+        assert (lean.total_trades, lean.win_trades) == (2, 1)
+        assert lean.total_return == pytest.approx(0.02)
+    
+    async def test_virtual_clock_follows_bars(self):
+        """测试策略时间取K线时间，定时器按虚拟时间触发"""
+        bars = [
+            Bar(symbol="A", interval="1d", timestamp=datetime(2024, 1, d),
+                open=10.0, high=10.0, low=10.0, close=10.0)
+            for d in range(1, 5)
+        ]
+        
+        class ClockStrategy(BuyAndExitStrategy):
+            def on_init(self):
+                super().on_init()
+                self.times = []
+                self.fired = []
+                clock = self.context.clock
+                clock.call_at(events.datetime_to_ns(datetime(2024, 1, 2, 12)),
+                              lambda: self.fired.append(self.context.get_current_time()))
+            
+            def on_bar(self, bar):
+                self.times.append(self.context.get_current_time())
+        
+        engine = BacktestEngine()
+        strategy = ClockStrategy(name="clock")
+        engine.set_strategy(strategy)
+        engine.add_data("A", bars)
+        await engine.run()
+        
+        assert strategy.times == [bar.timestamp for bar in bars]
+        assert strategy.fired == [datetime(2024, 1, 2, 12)]
+    
+    async def test_strategy_timers(self):
+        """测试策略定时器在K线之间按虚拟时间触发"""
+        bars = [
+            Bar(symbol="A", interval="1d", timestamp=datetime(2024, 1, d),
+                open=10.0, high=10.0, low=10.0, close=10.0)
+            for d in range(1, 5)
+        ]
+        
+        class TimerStrategy(BuyAndExitStrategy):
+            def on_init(self):
+                super().on_init()
+                self.events = []
+                self.context.set_timer("half_day", 43200)
+            
+            def on_bar(self, bar):
+                self.events.append(("bar", bar.timestamp))
+            
+            def on_timer(self, timer_id):
+                self.events.append((timer_id, self.context.get_current_time()))
+                if len(self.events) > 4:
+                    self.context.cancel_timer(timer_id)
+        
+        engine = BacktestEngine()
+        strategy = TimerStrategy(name="timer")
+        engine.set_strategy(strategy)
+        engine.add_data("A", bars)
+        await engine.run(start_date=datetime(2024, 1, 1))
+        
+        assert strategy.events == [
+            ("bar", datetime(2024, 1, 1)),
+            ("half_day", datetime(2024, 1, 1, 12)),
+            ("half_day", datetime(2024, 1, 2)),     # 同一时刻先触发定时器
+            ("bar", datetime(2024, 1, 2)),
+            ("half_day", datetime(2024, 1, 2, 12)),
+            ("bar", datetime(2024, 1, 3)),
+            ("bar", datetime(2024, 1, 4)),
+        ]
+    
+    async def test_timers_start_at_first_bar(self):
+        """测试未指定开始日期时定时器从第一根K线开始计时"""
+        class TimerStrategy(RecordingStrategy):
+            def on_init(self):
+                super().on_init()
+                self.fired = []
+                self.context.set_timer("two_days", 2 * 86400)
+            
+            def on_timer(self, timer_id):
+                self.fired.append(self.context.get_current_time())
+        
+        engine = BacktestEngine()
+        strategy = TimerStrategy(name="timer")
+        engine.set_strategy(strategy)
+        engine.add_data("A", make_bars("A", range(5), start=datetime(2024, 3, 1)))
+        await engine.run()
+        
+        assert strategy.fired == [datetime(2024, 3, 3), datetime(2024, 3, 5)]
+
+
+class CrashingStrategy(BuyAndExitStrategy):
+    """每 4 根K线买卖一次，可在指定K线模拟崩溃"""
+    
+    def on_bar(self, bar):
+        self.count += 1
+        self.context.set_var("last_close", bar.close)
+        if self.count == self.params.get("crash_at"):
+            raise RuntimeError("simulated crash")
+        if self.count % 4 == 1:
+            self.buy(bar.symbol, 0.0, 10, "MARKET")
+        elif self.count % 4 == 3:
+            self.sell(bar.symbol, 0.0, 10, "MARKET")
+
+
+class TestCheckpoint:
+    """回测快照测试"""
+    
+    def make_engine(self, strategy, **kwargs):
+        engine = BacktestEngine(initial_capital=10000.0, **kwargs)
+        engine.set_strategy(strategy)
+        rng = np.random.default_rng(2)
+        closes = 10 * np.cumprod(1 + rng.normal(0, 0.02, 30))
+        engine.add_data("A", [
+            Bar(symbol="A", interval="1d", timestamp=datetime(2024, 1, 1) + timedelta(days=i),
+                open=c, high=c, low=c, close=c)
+            for i, c in enumerate(closes)
+        ])
+        return engine
+    
+    async def test_resume_matches_uninterrupted_run(self, tmp_path):
+        """测试崩溃后从快照续跑与完整运行结果一致"""
+        expected = await self.make_engine(CrashingStrategy(name="c")).run()
+        
+        path = str(tmp_path / "bt.ckpt")
+        crashing = self.make_engine(
+            CrashingStrategy(name="c", params={"crash_at": 13}),
+            checkpoint_path=path, checkpoint_every=5,
+        )
+        with pytest.raises(RuntimeError):
+            await crashing.run()
+        
+        strategy = CrashingStrategy(name="c")
+        resumed = self.make_engine(strategy)
+        resumed.load_checkpoint(path)
+        result = await resumed.run()
+        
+        assert strategy.count == 30
+        assert strategy.context.get_var("last_close") is not None
+        np.testing.assert_allclose(result.equity_curve, expected.equity_curve)
+        assert result.total_trades == expected.total_trades
+        assert result.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+    
+    async def test_resume_keeps_timers(self, tmp_path):
+        """测试快照恢复后定时器按原节奏继续触发"""
+        class TimerStrategy(CrashingStrategy):
+            def on_init(self):
+                super().on_init()
+                self.fired = []
+                self.context.set_timer("tick", 3 * 86400 + 3600)
+            
+            def on_timer(self, timer_id):
+                self.fired.append(self.context.get_current_time())
+        
+        expected = TimerStrategy(name="c")
+        await self.make_engine(expected).run()
+        
+        path = str(tmp_path / "bt.ckpt")
+        crashing = self.make_engine(
+            TimerStrategy(name="c", params={"crash_at": 13}),
+            checkpoint_path=path, checkpoint_every=5,
+        )
+        with pytest.raises(RuntimeError):
+            await crashing.run()
+        
+        strategy = TimerStrategy(name="c")
+        resumed = self.make_engine(strategy)
+        resumed.load_checkpoint(path)
+        await resumed.run()
+        
+        assert len(expected.fired) == 9
+        assert strategy.fired == expected.fired
+    
+    def test_invalid_snapshot_file(self, tmp_path):
+        """测试非快照文件"""
+        path = tmp_path / "bad.ckpt"
+        path.write_bytes(b"not a checkpoint")
+        with pytest.raises(CheckpointError):
+            load_snapshot(str(path))
+
+
+class TestPortfolioBacktest:
+    """多策略组合回测测试"""
+    
+    async def test_single_pass_matches_separate_runs(self):
+        """测试单次遍历的多策略结果与分别回测一致"""
+        make = TestCheckpoint().make_engine
+        
+        engine = make(CrashingStrategy(name="a"))
+        engine.add_strategy(BuyAndExitStrategy(name="b"), capital=5000.0)
+        recorder = RecordingStrategy(name="r")
+        engine.add_strategy(recorder)
+        portfolio = await engine.run()
+        results = engine.get_results()
+        
+        alone_a = await make(CrashingStrategy(name="a")).run()
+        alone_b_engine = make(BuyAndExitStrategy(name="b"))
+        alone_b_engine.initial_capital = 5000.0
+        alone_b_engine.set_strategy(BuyAndExitStrategy(name="b"))
+        alone_b = await alone_b_engine.run()
+        
+        assert len(recorder.bars) == 30
+        np.testing.assert_allclose(results["a"].equity_curve, alone_a.equity_curve)
+        np.testing.assert_allclose(results["b"].equity_curve, alone_b.equity_curve)
+        np.testing.assert_allclose(
+            portfolio.equity_curve,
+            results["a"].equity_curve + results["b"].equity_curve + 10000.0,
+        )
+        assert portfolio.strategy_name == "portfolio"
+        assert portfolio.total_trades == alone_a.total_trades + alone_b.total_trades
+        assert len(portfolio.trades) == portfolio.total_trades
+    
+    def test_duplicate_strategy_name(self):
+        """测试策略重名"""
+        engine = BacktestEngine()
+        engine.add_strategy(RecordingStrategy(name="x"))
+        with pytest.raises(ValueError):
+            engine.add_strategy(RecordingStrategy(name="x"))
+
+
+class TestRobustness:
+    """蒙特卡洛稳健性分析测试"""
+    
+    def make_result(self):
+        engine = BacktestEngine(initial_capital=1000.0, commission=0.0, slippage=0.0)
+        rng = np.random.default_rng(3)
+        prices = 10 * np.cumprod(1 + rng.normal(0.001, 0.01, 300))
+        return engine.run_vectorized(prices=prices, positions=np.full(300, 50.0))
+    
+    def test_block_bootstrap_shape(self):
+        """测试分块自助采样形状与取值来源"""
+        returns = np.arange(10.0)
+        sample = block_bootstrap(returns, 7, 3, np.random.default_rng(0))
+        assert sample.shape == (10, 7)
+        assert np.isin(sample, returns).all()
+    
+    def test_shuffle_keeps_total(self):
+        """测试成交乱序总盈亏不变"""
+        pnl = np.array([5.0, -3.0, 2.0, -1.0])
+        sample = shuffle_trades(pnl, 20, np.random.default_rng(0))
+        np.testing.assert_allclose(sample.sum(axis=0), pnl.sum())
+    
+    @pytest.mark.parametrize("max_workers", [0, 2])
+    def test_run_monte_carlo(self, max_workers):
+        """测试并行重采样与置信区间"""
+        result = self.make_result()
+        report = run_monte_carlo(
+            result, n_samples=2000, chunk_size=500, seed=7, max_workers=max_workers
+        )
+        assert report.samples["sharpe_ratio"].shape == (2000,)
+        lo, hi = report.confidence_interval("total_return", 0.9)
+        assert lo < result.total_return < hi
+        assert list(report.summary().columns) == ["q0.05", "q0.5", "q0.95"]
+    
+    def test_reproducible_with_seed(self):
+        """测试相同种子结果可复现"""
+        result = self.make_result()
+        a = run_monte_carlo(result, n_samples=300, chunk_size=100, seed=1, max_workers=0)
+        b = run_monte_carlo(result, n_samples=300, chunk_size=100, seed=1, max_workers=0)
+        np.testing.assert_array_equal(a.samples["max_drawdown"], b.samples["max_drawdown"])
+    
+    def test_memory_budget_and_vectorized_trades(self):
+        """测试按内存预算分批，向量化结果的成交类方法明确报错"""
+        result = self.make_result()
+        # 300 点 × 64 字节 × 10 样本/批
+        report = run_monte_carlo(
+            result, n_samples=35, seed=1, max_workers=0, memory_budget=300 * 64 * 10
+        )
+        assert report.samples["total_return"].shape == (35,)
+        with pytest.raises(ValueError, match="pnl unavailable"):
+            run_monte_carlo(result, method="shuffle", n_samples=10, max_workers=0)
+    
+    def test_default_chunks_spread_across_workers(self):
+        """测试默认分批时样本分到每个进程"""
+        sizes = _chunk_sizes(10000, 252, None, DEFAULT_MEMORY_BUDGET, 4)
+        assert sizes == [2500] * 4
+        assert _chunk_sizes(10000, 252, None, DEFAULT_MEMORY_BUDGET, 1) == [10000]
+        # 内存预算更小时以预算为准
+        assert len(_chunk_sizes(10000, 252, None, 252 * 64 * 1000, 4)) == 10
+    
+    def test_rejects_downsampled_curve(self):
+        """测试抽样保留的资金曲线不能用于收益分块自助"""
+        result = self.make_result()
+        result.curve_stride = 4
+        with pytest.raises(ValueError, match="downsampled"):
+            run_monte_carlo(result, n_samples=10, max_workers=0)
+
+
+def random_series(n: int = 600, seed: int = 7) -> BarSeries:
+    """随机游走K线"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    ts = np.datetime64("2024-01-01") + np.arange(n).astype("timedelta64[D]")
+    return BarSeries.from_arrays("A", "1d", ts, close, high, low, close)
+
+
+class TestIndicators:
+    """技术指标测试"""
+
+    CASES = [
+        (lambda: indicators.SMA(20), lambda s: indicators.sma(s.close, 20)),
+        (lambda: indicators.EMA(20), lambda s: indicators.ema(s.close, 20)),
+        (lambda: indicators.RSI(14), lambda s: indicators.rsi(s.close, 14)),
+        (lambda: indicators.MACD(), lambda s: np.column_stack(indicators.macd(s.close))),
+        (lambda: indicators.BollingerBands(20), lambda s: np.column_stack(indicators.bollinger(s.close, 20))),
+        (lambda: indicators.BollingerBands(7, k=1.5), lambda s: np.column_stack(indicators.bollinger(s.close, 7, k=1.5))),
+        (lambda: indicators.ATR(14), lambda s: indicators.atr(s.high, s.low, s.close, 14)),
+        (lambda: indicators.RollingMax(20), lambda s: indicators.rolling_max(s.close, 20)),
+        (lambda: indicators.RollingMin(20, field="low"), lambda s: indicators.rolling_min(s.low, 20)),
+    ]
+
+    @pytest.mark.parametrize("make, batch", CASES)
+    def test_streaming_matches_batch(self, make, batch):
+        """测试逐根更新、预热后续更新与批量计算逐位相同"""
+        series = random_series()
+        expected = batch(series)
+
+        streaming = make()
+        values = np.array([streaming.update_bar(bar) for bar in series], dtype=float)
+        assert np.array_equal(values, expected, equal_nan=True)
+
+        warmed = make().warm_up(series[:400])
+        assert warmed.ready and warmed.count == 400
+        tail = np.array([warmed.update_bar(bar) for bar in series[400:]], dtype=float)
+        assert np.array_equal(tail, expected[400:], equal_nan=True)
+
+    def test_reference_values(self):
+        """测试与直接计算的结果一致并有预热期"""
+        series = random_series()
+        close = series.close
+
+        sma = indicators.sma(close, 10)
+        assert np.isnan(sma[:9]).all()
+        np.testing.assert_allclose(sma[9:], [close[i - 9:i + 1].mean() for i in range(9, len(close))])
+
+        mid, upper, lower = indicators.bollinger(close, 10, k=2.0)
+        std = np.array([close[i - 9:i + 1].std() for i in range(9, len(close))])
+        np.testing.assert_allclose(upper[9:] - mid[9:], 2.0 * std, rtol=1e-6)
+
+        assert indicators.rolling_max([1, 3, 2, 5, 4, 1], 3)[2:].tolist() == [3, 5, 5, 5]
+        rsi = indicators.rsi(close, 14)
+        assert np.isnan(rsi[:14]).all() and ((rsi[14:] >= 0) & (rsi[14:] <= 100)).all()
+        assert indicators.rsi(np.arange(30.0), 14)[-1] == 100.0
+
+        ema = indicators.EMA(3)
+        values = [ema.update(v) for v in (1.0, 2.0, 3.0, 4.0)]
+        assert np.isnan(values[:2]).all() and values[2:] == [2.25, 3.125]
+        with pytest.raises(ValueError):
+            indicators.SMA(0)
+
+    def test_long_trending_series(self):
+        """测试长趋势序列的布林带精度 (无累计误差)"""
+        n = 1_000_000
+        rng = np.random.default_rng(3)
+        close = 100 + 0.001 * np.arange(n) + rng.normal(0, 0.003, n)
+        ts = np.datetime64("2024-01-01") + np.arange(n).astype("timedelta64[m]")
+        series = BarSeries.from_arrays("A", "1m", ts, close, close, close, close)
+
+        mid, upper, lower = indicators.bollinger(close, 20, k=2.0)
+        windows = np.lib.stride_tricks.sliding_window_view(close[-5000:], 20)
+        np.testing.assert_allclose(mid[-4981:], windows.mean(axis=1), rtol=0, atol=1e-9)
+        np.testing.assert_allclose((upper - mid)[-4981:], 2.0 * windows.std(axis=1), rtol=0, atol=1e-9)
+
+        bands = indicators.BollingerBands(20).warm_up(series[:-33])
+        values = [bands.update_bar(bar) for bar in series[-33:]]
+        assert values[-1] == (mid[-1], upper[-1], lower[-1])
@@ -2,8 +2,19 @@
 核心模块测试
 """
 
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 import pytest
-from qtf.core.events import Event, EventType, TickEvent, OrderEvent
+from qtf.core.events import (
+    Event,
+    EventType,
+    TickEvent,
+    OrderEvent,
+    TradeEvent,
+    datetime_to_ns,
+    now_ns,
+)
 from qtf.core.exceptions import QTFError, OrderError, DataError
 
 
@@ -35,6 +46,41 @@ class TestEvent:
         assert event.data == data
 
 
+    def test_string_type(self):
+        """测试字符串事件类型"""
+        assert Event(type="bar").type == EventType.BAR
+
+    def test_slots_and_lazy_metadata(self):
+        """测试事件无实例字典, metadata 按需创建"""
+        event = Event(type=EventType.TICK)
+        assert not hasattr(event, "__dict__")
+        assert event._metadata is None
+        event.metadata["key"] = 1
+        assert event.metadata == {"key": 1}
+        with pytest.raises(AttributeError):
+            event.unknown = 1
+
+    def test_timestamp_ns(self):
+        """测试纳秒时间戳与 datetime 互转"""
+        before = datetime_to_ns(datetime.now())
+        event = Event(type=EventType.TICK)
+        assert abs(event.ts_ns - before) < 1_000_000_000
+        assert now_ns() >= event.ts_ns
+
+        dt = datetime(2024, 1, 2, 9, 30, 0, 123456)
+        event = Event(type=EventType.BAR, timestamp=dt)
+        assert event.ts_ns == datetime_to_ns(dt)
+        # 无时区时间按字面值，与 numpy / BarSeries 的时间列一致
+        assert event.ts_ns == np.datetime64(dt, "ns").astype(np.int64)
+        assert datetime_to_ns(datetime(2024, 1, 2, 1, 30, tzinfo=timezone(timedelta(hours=8)))) == (
+            datetime_to_ns(datetime(2024, 1, 1, 17, 30))
+        )
+        assert event.timestamp == dt
+        event.timestamp = datetime(2024, 1, 3)
+        assert event.timestamp == datetime(2024, 1, 3)
+        assert Event(type=EventType.BAR, ts_ns=123).ts_ns == 123
+
+
 class TestTickEvent:
     """Tick 事件测试"""
     
@@ -51,6 +97,14 @@ class TestTickEvent:
         assert tick.symbol == "000001.SZ"
         assert tick.last_price == 10.5
 
+    def test_subclass_type_fixed(self):
+        """测试子类事件类型固定"""
+        assert TickEvent(symbol="000001.SZ").type == EventType.TICK
+        assert OrderEvent(type=EventType.TICK, order_id="1").type == EventType.ORDER
+        trade = TradeEvent(trade_id="t1", price=10.0, volume=100)
+        assert trade.type == EventType.TRADE
+        assert "trade_id='t1'" in repr(trade)
+
 
 class TestExceptions:
     """异常测试"""
@@ -0,0 +1,453 @@
+"""
+数据层测试
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from qtf.core.events import EventType, TickBatchEvent, datetime_to_ns, ns_to_datetime
+from qtf.data.aggregator import CN_STOCK, BarAggregator, parse_interval
+from qtf.data.batch import QuoteBatch, SymbolTable
+from qtf.data.cache import CachedAdapter, merge_ranges, missing_ranges
+from qtf.data.models import Bar, Quote, quote_dtype
+from qtf.data.series import BarSeries
+from qtf.data.simulated import SimulatedAdapter
+from qtf.engine.base import BaseStrategy
+
+
+class TickCollector(BaseStrategy):
+    """逐笔接收行情的策略"""
+
+    def on_init(self):
+        self.quotes = []
+
+    def on_start(self):
+        pass
+
+    def on_stop(self):
+        pass
+
+    def on_tick(self, quote):
+        self.quotes.append(quote)
+
+
+class TestQuote:
+    """行情模型测试"""
+
+    def test_depth_arrays_and_legacy_fields(self):
+        """测试定长盘口数组与原字段名兼容"""
+        quote = Quote("000001.SZ", 10.0, bid_price_1=9.99, bid_volume_1=100,
+                      ask_price_2=10.02, ask_volume_2=300)
+        assert not hasattr(quote, "__dict__")
+        assert quote.levels == 5
+        assert (quote.bid_price_1, quote.bid_volume_1) == (9.99, 100)
+        assert (quote.ask_price_1, quote.ask_price_2, quote.ask_volume_2) == (0.0, 10.02, 300)
+        assert quote.bid_price_2 is None and quote.bid_volume_2 is None
+
+        quote.bid_price_3 = 9.97
+        assert quote.bid_prices[2] == 9.97
+        quote.bid_price_3 = None
+        assert quote.bid_price_3 is None
+
+        with pytest.raises(TypeError):
+            Quote("A", 1.0, bid_price_6=1.0)
+
+    def test_levels_and_equality(self):
+        """测试自定义档数与相等比较"""
+        quote = Quote("A", 1.0, bid_prices=[0.9, 0.8], ask_prices=[1.1], levels=10)
+        assert quote.levels == 10
+        assert list(quote.bid_volumes) == [0] * 10
+        assert quote.bid_price_2 == 0.8 and quote.ask_price_2 is None
+
+        shallow = Quote("A", 1.0, bid_price_2=0.8, levels=2)
+        assert shallow.bid_price_5 is None
+        shallow.ask_volume_5 = None
+        with pytest.raises(ValueError, match="2 depth levels"):
+            shallow.bid_price_5 = 0.5
+        with pytest.raises(ValueError):
+            Quote("A", 1.0, ask_volume_3=10, levels=2)
+
+        ts = datetime(2024, 1, 2)
+        assert Quote("A", 1.0, ts, bid_price_1=0.9) == Quote("A", 1.0, ts, bid_prices=[0.9])
+        assert Quote("A", 1.0, ts) != Quote("A", 1.0, ts, ask_price_2=1.2)
+
+    def test_positional_args_and_repr(self):
+        """测试原位置参数顺序、浮点数量与完整 repr"""
+        ts = datetime(2024, 1, 2)
+        quote = Quote("A", 1.0, ts, 0.99, 100.0, 1.01, 200, *([None] * 16),
+                      0.98, 1.05, 0.95, 0.97, 5000, 5000.0, "sim")
+        assert (quote.bid_price_1, quote.bid_volume_1, quote.ask_volume_1) == (0.99, 100, 200)
+        assert (quote.open_price, quote.high_price, quote.low_price) == (0.98, 1.05, 0.95)
+        assert (quote.pre_close, quote.volume, quote.amount, quote.source) == (0.97, 5000, 5000.0, "sim")
+
+        quote = Quote("A", 1.0, bid_volumes=[10.0, 20.0])
+        quote.ask_volume_1 = 30.0
+        assert list(quote.bid_volumes[:2]) == [10, 20] and quote.ask_volume_1 == 30
+
+        quote = Quote("A", 1.0, ts, open_price=0.9, high_price=1.1, low_price=0.8,
+                      pre_close=0.95, amount=123.0)
+        text = repr(quote)
+        for field in ("open_price=0.9", "high_price=1.1", "low_price=0.8",
+                      "pre_close=0.95", "amount=123.0"):
+            assert field in text
+
+    def test_from_buffer(self):
+        """测试由原始行情缓冲区批量构造"""
+        records = np.zeros(2, dtype=quote_dtype(3))
+        records["symbol"] = [b"000001.SZ", b"600000.SH"]
+        records["ts"] = np.datetime64("2024-01-02T09:30:00.000001", "ns").astype(np.int64)
+        records["last_price"] = [10.0, 8.0]
+        records["bid_price"] = [[9.99, 9.98, np.nan], [7.99, 7.98, 7.97]]
+        records["bid_volume"] = [[100, 200, 0], [1, 2, 3]]
+        records["volume"] = [1000, 2000]
+
+        quotes = Quote.from_buffer(records.tobytes(), levels=3, source="l2")
+        assert [q.symbol for q in quotes] == ["000001.SZ", "600000.SH"]
+        first = quotes[0]
+        assert first.timestamp == datetime(2024, 1, 2, 9, 30, 0, 1)
+        assert first.levels == 3
+        assert list(first.bid_prices)[:2] == [9.99, 9.98] and first.bid_price_3 is None
+        assert (first.bid_volume_2, first.volume, first.source) == (200, 1000, "l2")
+        assert quotes[1].bid_price_3 == 7.97
+        assert Quote.from_buffer(records, levels=3, source="l2") == quotes
+
+
+class TestSymbolTable:
+    """标的代码表测试"""
+
+    def test_ids_are_stable(self):
+        """测试 ID 按首次出现顺序分配"""
+        table = SymbolTable(["000001.SZ", "600000.SH"])
+        assert table.id("600000.SH") == 1
+        assert table.id("000002.SZ") == 2
+        assert list(table.ids(["000002.SZ", "000001.SZ"])) == [2, 0]
+        assert table.name(1) == "600000.SH"
+        assert list(table.names(np.array([2, 0]))) == ["000002.SZ", "000001.SZ"]
+        assert len(table) == 3 and "000001.SZ" in table
+
+
+class TestQuoteBatch:
+    """批量行情测试"""
+
+    def test_from_arrays(self):
+        """测试由原始数组构造"""
+        table = SymbolTable()
+        batch = QuoteBatch.from_arrays(
+            table,
+            ["000001.SZ", "600000.SH", "000002.SZ"],
+            last=[10.0, 8.0, 20.0],
+            bid=[9.99, 7.99, 19.98],
+            ask=[10.01, 8.01, 20.02],
+            volume=[100, 200, 300],
+            ts=[1, 2, 3],
+        )
+        assert len(batch) == 3
+        assert batch.symbol_id.dtype == np.int32
+        assert list(batch.symbols) == ["000001.SZ", "600000.SH", "000002.SZ"]
+        np.testing.assert_allclose(batch.mid, [10.0, 8.0, 20.0])
+        assert list(batch.bid_volume) == [0, 0, 0]
+
+        # 缺省值与 Quote 一致
+        batch = QuoteBatch.from_arrays(table, ["000001.SZ"], last=[10.5])
+        assert batch.bid[0] == batch.ask[0] == batch.pre_close[0] == 0.0
+        assert batch.quote(0) == Quote("000001.SZ", 10.5, batch.quote(0).timestamp)
+        # 缺省时间为当前本地时间 (与事件时间戳同一约定)
+        assert abs(batch.ts[0] - datetime_to_ns(datetime.now())) < 1_000_000_000
+        assert batch.symbol_id[0] == 0
+
+    def test_quote_round_trip(self):
+        """测试与 Quote 互转"""
+        ts = datetime(2024, 1, 2, 9, 30, 0, 500000)
+        quotes = [
+            Quote(symbol="000001.SZ", last_price=10.5, timestamp=ts,
+                  bid_price_1=10.49, bid_volume_1=100,
+                  ask_price_1=10.51, ask_volume_1=200, volume=1000, source="sim",
+                  open_price=10.2, high_price=10.6, low_price=10.1, amount=10450.0,
+                  pre_close=10.3),
+            Quote(symbol="600000.SH", last_price=8.0, timestamp=ts, source="sim"),
+        ]
+        batch = QuoteBatch.from_quotes(quotes)
+        assert batch.ts[0] == np.datetime64(ts, "ns").astype(np.int64)
+
+        quote = batch.quote(0)
+        assert quote.symbol == "000001.SZ"
+        assert quote.timestamp == ts
+        assert (quote.bid_price_1, quote.ask_volume_1, quote.volume) == (10.49, 200, 1000)
+        assert quote.source == "sim"
+        assert (quote.open_price, quote.high_price, quote.low_price, quote.amount) == (
+            10.2, 10.6, 10.1, 10450.0
+        )
+        assert quote.pre_close == 10.3
+        assert batch.quote(1) == quotes[1]
+        assert [q.symbol for q in batch.quotes()] == ["000001.SZ", "600000.SH"]
+
+    def test_take_and_pandas(self):
+        """测试行选择与 DataFrame 转换"""
+        batch = QuoteBatch.from_arrays(
+            SymbolTable(), ["A", "B", "C"], last=[1.0, 2.0, 3.0], ts=[0, 0, 0]
+        )
+        part = batch.take(batch.last > 1.5)
+        assert list(part.symbols) == ["B", "C"]
+        assert part.table is batch.table
+
+        df = batch.to_pandas()
+        assert list(df.index) == ["A", "B", "C"]
+        assert df.loc["B", "last"] == 2.0
+
+    def test_tick_batch_event(self):
+        """测试批量行情事件"""
+        batch = QuoteBatch.from_arrays(SymbolTable(), ["A", "B"], last=[1.0, 2.0])
+        event = TickBatchEvent(batch, source="sim")
+        assert event.type == EventType.TICK_BATCH
+        assert len(event) == 2
+
+    def test_default_on_ticks_fans_out(self):
+        """测试默认 on_ticks 逐行调用 on_tick"""
+        strategy = TickCollector(name="collector")
+        strategy.on_init()
+        batch = QuoteBatch.from_arrays(SymbolTable(), ["A", "B"], last=[1.0, 2.0])
+        strategy.on_ticks(batch)
+        assert [(q.symbol, q.last_price) for q in strategy.quotes] == [("A", 1.0), ("B", 2.0)]
+
+
+class TestBarSeries:
+    """K线序列测试"""
+
+    def make_series(self):
+        bars = [
+            Bar(symbol="A", interval="1d", timestamp=datetime(2024, 1, d),
+                open=d, high=d + 1, low=d - 1, close=d + 0.5, volume=100 * d, source="sim")
+            for d in range(1, 6)
+        ]
+        return bars, BarSeries.from_bars(bars)
+
+    def test_round_trip(self):
+        """测试与 Bar 列表互转"""
+        bars, series = self.make_series()
+        assert (series.symbol, series.interval, len(series)) == ("A", "1d", 5)
+        assert series.volume.dtype == np.int64
+        assert series.to_bars() == bars
+        assert list(series) == bars
+        assert series[-1] == bars[-1]
+        with pytest.raises(IndexError):
+            series[5]
+
+    def test_zero_copy_slicing(self):
+        """测试切片与按时间选取为视图"""
+        _, series = self.make_series()
+        part = series[1:3]
+        assert np.shares_memory(part.close, series.close)
+        assert list(part.close) == [2.5, 3.5]
+
+        window = series.between(datetime(2024, 1, 2), datetime(2024, 1, 4))
+        assert np.shares_memory(window.ts, series.ts)
+        assert [b.timestamp.day for b in window] == [2, 3, 4]
+        assert len(series.between(start=datetime(2024, 2, 1))) == 0
+
+    def test_pandas(self):
+        """测试 DataFrame 互转"""
+        _, series = self.make_series()
+        df = series.to_pandas()
+        assert df.index[0] == datetime(2024, 1, 1)
+        assert df["close"].iloc[-1] == 5.5
+        back = BarSeries.from_pandas(df, "A", "1d")
+        np.testing.assert_array_equal(back.ts, series.ts)
+        np.testing.assert_array_equal(back.volume, series.volume)
+
+    async def test_simulated_history(self):
+        """测试模拟适配器返回K线序列"""
+        series = await SimulatedAdapter().get_history("A", datetime(2024, 1, 1), datetime(2024, 1, 10))
+        assert isinstance(series, BarSeries)
+        assert len(series) == 10
+        assert series[0].timestamp == datetime(2024, 1, 1)
+        assert np.all(series.high >= series.low)
+
+
+class CountingAdapter(SimulatedAdapter):
+    """记录 get_history 请求区间的模拟适配器 (每天零点一根K线，收盘价为日期序号)"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def get_history(self, symbol, start, end, interval="1d"):
+        self.requests.append((start, end))
+        days = np.arange(
+            np.datetime64(start, "D") + (start.time() != datetime.min.time()),
+            np.datetime64(end, "D") + 1,
+        )
+        close = days.astype(np.int64).astype(np.float64)
+        return BarSeries.from_arrays(symbol, interval, days, close, close, close, close)
+
+
+class TestHistoryCache:
+    """历史数据缓存测试"""
+
+    def test_ranges(self):
+        """测试区间合并与缺口计算"""
+        assert merge_ranges([(10_000, 20_000), (0, 5_000), (21_000, 30_000)]) == [
+            (0, 5_000), (10_000, 30_000)
+        ]
+        covered = [(10_000, 20_000), (30_000, 40_000)]
+        assert missing_ranges(covered, 0, 50_000) == [
+            (0, 9_000), (21_000, 29_000), (41_000, 50_000)
+        ]
+        assert missing_ranges(covered, 12_000, 18_000) == []
+        assert missing_ranges(covered, 15_000, 35_000) == [(21_000, 29_000)]
+
+    async def test_fetches_only_gaps(self, tmp_path):
+        """测试只向上游拉取未覆盖的区间，结果在重启后复用"""
+        upstream = CountingAdapter()
+        cache = CachedAdapter(upstream, str(tmp_path))
+
+        first = await cache.get_history("000001.SZ", datetime(2024, 1, 5), datetime(2024, 1, 10))
+        assert len(first) == 6 and len(upstream.requests) == 1
+
+        again = await cache.get_history("000001.SZ", datetime(2024, 1, 6), datetime(2024, 1, 9))
+        assert len(upstream.requests) == 1
+        np.testing.assert_array_equal(again.close, first.close[1:5])
+        assert isinstance(again.close.base, np.memmap) or isinstance(again.close, np.memmap)
+
+        wider = await cache.get_history("000001.SZ", datetime(2024, 1, 1), datetime(2024, 1, 15))
+        assert upstream.requests[1:] == [
+            (datetime(2024, 1, 1), datetime(2024, 1, 4, 23, 59, 59, 999999)),
+            (datetime(2024, 1, 10, 0, 0, 0, 1), datetime(2024, 1, 15)),
+        ]
+        assert [b.timestamp.day for b in wider] == list(range(1, 16))
+        np.testing.assert_array_equal(wider.close[4:10], first.close)
+        assert cache.coverage("000001.SZ") == [(datetime(2024, 1, 1), datetime(2024, 1, 15))]
+
+        reopened = CachedAdapter(CountingAdapter(), str(tmp_path))
+        cached = await reopened.get_history("000001.SZ", datetime(2024, 1, 1), datetime(2024, 1, 15))
+        assert reopened.upstream.requests == []
+        np.testing.assert_array_equal(cached.close, wider.close)
+
+        reopened.invalidate("000001.SZ")
+        assert reopened.coverage("000001.SZ") == []
+
+    async def test_recent_bars_not_cached(self, tmp_path):
+        """测试未收盘的近期K线不计入覆盖区间，下次请求重新拉取"""
+        upstream = CountingAdapter()
+        cache = CachedAdapter(upstream, str(tmp_path))
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = today - timedelta(days=5)
+
+        first = await cache.get_history("000001.SZ", start, datetime.now())
+        assert first.to_bars()[-1].timestamp == today
+        (_, covered_end), = cache.coverage("000001.SZ")
+        assert covered_end < today
+        assert len(cache.load("000001.SZ")) == 5
+
+        again = await cache.get_history("000001.SZ", start, datetime.now())
+        assert len(upstream.requests) == 2
+        assert upstream.requests[1][0] > covered_end
+        np.testing.assert_array_equal(again.close, first.close)
+
+
+def tick(minute: int, second: int, price: float, volume: int = 100, hour: int = 9) -> Quote:
+    """测试行情 (2024-01-02)"""
+    return Quote("000001.SZ", price, datetime(2024, 1, 2, hour, minute, second), volume=volume)
+
+
+class TestBarAggregator:
+    """K线合成测试"""
+
+    def test_parse_interval(self):
+        """测试周期解析"""
+        assert parse_interval("30s") == 30_000_000
+        assert parse_interval("5m") == 300_000_000
+        assert parse_interval("1d") == 86_400_000_000
+        for bad in ("0m", "2d", "25h", "1w", "m"):
+            with pytest.raises(ValueError):
+                parse_interval(bad)
+
+    def test_multi_interval_ohlcv(self):
+        """测试多周期 OHLCV/VWAP 与收盘事件"""
+        events = []
+        agg = BarAggregator(["5m", "1m"], session=CN_STOCK, post=events.append)
+        assert agg.intervals == ["1m", "5m"]
+
+        assert agg.on_quote(tick(30, 0, 10.0)) == []
+        agg.on_quote(tick(30, 20, 10.5, 300))
+        agg.on_quote(tick(30, 40, 9.8))
+        closed = agg.on_quote(tick(31, 5, 10.1))
+        assert len(closed) == 1
+        bar = closed[0]
+        assert (bar.interval, bar.timestamp) == ("1m", datetime(2024, 1, 2, 9, 30))
+        assert (bar.open, bar.high, bar.low, bar.close) == (10.0, 10.5, 9.8, 9.8)
+        assert bar.volume == 500
+        assert bar.vwap == pytest.approx((10.0 * 100 + 10.5 * 300 + 9.8 * 100) / 500)
+
+        assert len(events) == 1 and events[0].type == EventType.BAR
+        assert events[0].data is bar
+        assert ns_to_datetime(events[0].ts_ns) == datetime(2024, 1, 2, 9, 31)
+
+        closed = agg.on_quote(tick(35, 0, 10.2))
+        assert [b.interval for b in closed] == ["1m", "5m"]
+        assert closed[1].volume == 600 and closed[1].close == 10.1
+
+    def test_session_boundaries(self):
+        """测试段末快照计入最后一根K线，午休行情只触发收盘不计入K线"""
+        agg = BarAggregator(["1m", "1h"], session=CN_STOCK)
+        agg.on_quote(tick(29, 58, 10.0, hour=11))
+        agg.on_quote(tick(30, 0, 10.3, hour=11))
+        closed = agg.on_quote(tick(45, 0, 99.0, hour=11))
+        assert [(b.interval, b.timestamp) for b in closed] == [
+            ("1m", datetime(2024, 1, 2, 11, 29)),
+            ("1h", datetime(2024, 1, 2, 10, 30)),
+        ]
+        assert closed[0].close == 10.3 and closed[0].high == 10.3
+
+        assert agg.on_quote(tick(0, 30, 10.1, hour=13)) == []
+
+        agg.on_quote(tick(59, 0, 10.2, hour=14))
+        agg.on_quote(tick(0, 0, 10.4, hour=15))
+        closed = agg.flush()
+        assert [(b.interval, b.timestamp, b.close) for b in closed] == [
+            ("1m", datetime(2024, 1, 2, 14, 59), 10.4),
+            ("1h", datetime(2024, 1, 2, 14, 0), 10.4),
+        ]
+
+    def test_daily_and_cumulative_volume(self):
+        """测试日线与累计成交量差分"""
+        agg = BarAggregator(["1d"], session=CN_STOCK, cumulative_volume=True)
+        agg.on_quote(tick(30, 0, 10.0, volume=1_000))
+        agg.on_quote(tick(31, 0, 10.2, volume=1_500))
+        agg.on_quote(tick(0, 0, 10.1, volume=2_100, hour=15))
+        assert agg.advance(datetime(2024, 1, 2, 15, 0)) == []
+        bar, = agg.advance(datetime(2024, 1, 2, 15, 0, 1))
+        assert bar.timestamp == datetime(2024, 1, 2)
+        assert (bar.open, bar.close, bar.volume) == (10.0, 10.1, 1_100)
+
+    def test_late_tick_and_batch(self):
+        """测试迟到行情被丢弃，批量行情逐行合成"""
+        agg = BarAggregator(["1m"])
+        agg.on_quote(tick(31, 0, 10.0))
+        agg.on_quote(tick(30, 59, 11.0))
+        assert agg.late_ticks == 1
+
+        table = SymbolTable()
+        batch = QuoteBatch.from_quotes([tick(31, 30, 10.5), tick(32, 0, 10.6)], table)
+        closed = agg.on_batch(batch)
+        assert len(closed) == 1 and closed[0].high == 10.5
+
+
+class TestAdapterBatch:
+    """适配器批量推送测试"""
+
+    async def test_on_quotes_feeds_both_callbacks(self):
+        """测试批量回调收到快照, 逐笔回调收到 Quote"""
+        adapter = SimulatedAdapter()
+        batches, quotes = [], []
+        adapter.add_batch_callback(batches.append)
+        adapter.add_callback(quotes.append)
+
+        batch = QuoteBatch.from_arrays(SymbolTable(), ["A", "B"], last=[1.0, 2.0])
+        await adapter._on_quotes(batch)
+        assert batches == [batch]
+        assert [q.symbol for q in quotes] == ["A", "B"]
+
+        adapter.remove_batch_callback(batches.append)
+        await adapter._on_quotes(batch)
+        assert len(batches) == 1
@@ -0,0 +1,680 @@
+"""
+事件循环测试
+"""
+
+import asyncio
+import functools
+import multiprocessing
+
+import numpy as np
+import pytest
+from qtf.core.events import Event, EventType, TickEvent
+from qtf.engine.clock import VirtualClock
+from qtf.engine.event_loop import EventLoop
+from qtf.engine.event_queue import OverflowPolicy, PriorityEventQueue, QueueLimit
+from qtf.engine.instrumentation import LogHistogram
+from qtf.engine.sharded import ShardedEventLoop, shard_index
+from qtf.engine.timer_wheel import TimerWheel
+
+
+@pytest.fixture
+async def loop():
+    """已启动的事件循环"""
+    event_loop = EventLoop()
+    await event_loop.start()
+    yield event_loop
+    await event_loop.stop()
+
+
+class TestEventLoopDispatch:
+    """事件分发测试"""
+
+    async def test_dispatch_in_order(self, loop):
+        """测试按发布顺序分发"""
+        received = []
+        loop.register(EventType.TICK, lambda e: received.append(e.data))
+
+        for i in range(100):
+            loop.put_nowait(Event(type=EventType.TICK, data=i))
+
+        assert await loop.wait_empty(timeout=1.0)
+        assert received == list(range(100))
+
+    async def test_async_handler(self, loop):
+        """测试异步处理器"""
+        received = []
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            received.append(event.data)
+
+        loop.register(EventType.ORDER, handler)
+        await loop.put(Event(type=EventType.ORDER, data="o1"))
+        await loop.put(Event(type=EventType.ORDER, data="o2"))
+
+        assert await loop.wait_empty(timeout=1.0)
+        assert received == ["o1", "o2"]
+
+    async def test_handler_error_does_not_stop_loop(self, loop):
+        """测试处理器异常不影响后续事件"""
+        received = []
+
+        def handler(event):
+            if event.data == 0:
+                raise RuntimeError("boom")
+            received.append(event.data)
+
+        loop.register(EventType.TICK, handler)
+        for i in range(3):
+            loop.put_nowait(Event(type=EventType.TICK, data=i))
+
+        assert await loop.wait_empty(timeout=1.0)
+        assert received == [1, 2]
+
+    async def test_wait_empty_times_out(self):
+        """测试未启动时等待清空超时"""
+        event_loop = EventLoop()
+        event_loop.put_nowait(Event(type=EventType.TICK))
+        assert not await event_loop.wait_empty(timeout=0.01)
+
+    async def test_batch_yields_to_producers(self):
+        """测试批量处理时定期让出控制权"""
+        event_loop = EventLoop(max_batch=10)
+        seen = []
+        event_loop.register(EventType.TICK, lambda e: seen.append(e.data))
+
+        for i in range(50):
+            event_loop.put_nowait(Event(type=EventType.TICK, data=i))
+        await event_loop.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # 第一次唤醒只处理一批
+        assert 0 < len(seen) < 50
+
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+        assert seen == list(range(50))
+
+    async def test_stop_while_idle(self, loop):
+        """测试空闲时停止"""
+        assert loop.running
+        await loop.stop()
+        assert not loop.running
+
+
+class TestDispatchTable:
+    """分发表测试"""
+
+    def test_register_compiles_dispatch(self):
+        """测试注册时按同步/异步拆分处理器"""
+        event_loop = EventLoop()
+
+        def on_sync(event):
+            pass
+
+        async def on_async(event):
+            pass
+
+        event_loop.register(EventType.TICK, on_sync)
+        event_loop.register(EventType.TICK, on_async)
+        event_loop.register(EventType.TICK, on_sync)
+        assert event_loop.get_handlers(EventType.TICK) == ((on_sync,), (on_async,))
+
+        event_loop.unregister(EventType.TICK, on_sync)
+        assert event_loop.get_handlers(EventType.TICK) == ((), (on_async,))
+        event_loop.unregister(EventType.TICK, on_async)
+        assert event_loop.get_handlers(EventType.TICK) == ((), ())
+
+        event_loop.register(EventType.BAR, on_sync)
+        event_loop.unregister_all()
+        assert event_loop.get_handlers(EventType.BAR) == ((), ())
+
+    async def test_sync_handlers_run_before_async(self, loop):
+        """测试同步处理器先于异步处理器执行"""
+        received = []
+
+        async def on_async(event):
+            received.append("async")
+
+        loop.register(EventType.TICK, on_async)
+        loop.register(EventType.TICK, lambda e: received.append("sync"))
+        loop.put_nowait(Event(type=EventType.TICK))
+
+        assert await loop.wait_empty(timeout=1.0)
+        assert received == ["sync", "async"]
+
+    async def test_unregister_during_run(self, loop):
+        """测试运行中注销处理器"""
+        received = []
+
+        def handler(event):
+            received.append(event.data)
+
+        loop.register(EventType.TICK, handler)
+        loop.put_nowait(Event(type=EventType.TICK, data=1))
+        assert await loop.wait_empty(timeout=1.0)
+        loop.unregister(EventType.TICK, handler)
+        loop.put_nowait(Event(type=EventType.TICK, data=2))
+        assert await loop.wait_empty(timeout=1.0)
+        assert received == [1]
+
+
+class TestPriorityLanes:
+    """优先级通道测试"""
+
+    async def test_strict_priority(self):
+        """测试严格优先级: 订单事件越过积压的 Tick"""
+        event_loop = EventLoop()
+        received = []
+        event_loop.register(EventType.TICK, lambda e: received.append("tick"))
+        event_loop.register(EventType.BAR, lambda e: received.append("bar"))
+        event_loop.register(EventType.ORDER, lambda e: received.append("order"))
+
+        for _ in range(1000):
+            event_loop.put_nowait(Event(type=EventType.TICK))
+        event_loop.put_nowait(Event(type=EventType.BAR))
+        event_loop.put_nowait(Event(type=EventType.ORDER))
+
+        await event_loop.start()
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+        assert received[:2] == ["order", "bar"]
+        assert received.count("tick") == 1000
+
+    async def test_order_preempts_backlog(self):
+        """测试处理过程中到达的订单事件在下一个事件即被处理"""
+        event_loop = EventLoop()
+        received = []
+
+        def on_tick(event):
+            received.append(event.data)
+            if event.data == 10:
+                event_loop.put_nowait(Event(type=EventType.ORDER, data="order"))
+
+        event_loop.register(EventType.TICK, on_tick)
+        event_loop.register(EventType.ORDER, lambda e: received.append(e.data))
+        for i in range(100):
+            event_loop.put_nowait(Event(type=EventType.TICK, data=i))
+
+        await event_loop.start()
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+        assert received[11] == "order"
+
+    async def test_weighted_fair(self):
+        """测试加权公平调度"""
+        event_loop = EventLoop(
+            lanes=[[EventType.ORDER], [EventType.TICK]],
+            weights=[3, 1],
+        )
+        received = []
+        event_loop.register(EventType.TICK, lambda e: received.append("T"))
+        event_loop.register(EventType.ORDER, lambda e: received.append("O"))
+        for _ in range(8):
+            event_loop.put_nowait(Event(type=EventType.TICK))
+            event_loop.put_nowait(Event(type=EventType.ORDER))
+
+        await event_loop.start()
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+        assert "".join(received) == "OOOTOOOTOOTTTTTT"
+
+    def test_unlisted_type_goes_to_lowest_lane(self):
+        """测试未列出的事件类型进入最低优先级通道"""
+        queue = PriorityEventQueue(lanes=[[EventType.ORDER], [EventType.TICK]])
+        queue.put_nowait(Event(type=EventType.LOG))
+        queue.put_nowait(Event(type=EventType.ORDER))
+        assert queue.lane_sizes() == [1, 1]
+        assert queue.get_nowait().type == EventType.ORDER
+        assert queue.get_nowait().type == EventType.LOG
+        with pytest.raises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+    def test_invalid_weights(self):
+        """测试权重校验"""
+        with pytest.raises(ValueError):
+            PriorityEventQueue(weights=[1, 2])
+
+
+class TestQueueLimits:
+    """队列容量与溢出策略测试"""
+
+    def test_conflate_keeps_latest_per_symbol(self):
+        """测试同一标的只保留最新 Tick"""
+        queue = PriorityEventQueue(limits={EventType.TICK: OverflowPolicy.CONFLATE})
+        for price in (10.0, 10.1, 10.2):
+            queue.put_nowait(TickEvent(type=EventType.TICK, symbol="000001.SZ", last_price=price))
+        queue.put_nowait(TickEvent(type=EventType.TICK, symbol="600000.SH", last_price=8.0))
+        queue.put_nowait(TickEvent(type=EventType.TICK, symbol="000001.SZ", last_price=10.3))
+
+        assert queue.qsize() == 2
+        assert queue.conflated[EventType.TICK] == 3
+        first = queue.get_nowait()
+        assert (first.symbol, first.last_price) == ("000001.SZ", 10.3)
+        assert queue.get_nowait().symbol == "600000.SH"
+
+        # 已出队的标的重新开始排队
+        queue.put_nowait(TickEvent(type=EventType.TICK, symbol="000001.SZ", last_price=10.4))
+        assert queue.qsize() == 1
+
+    def test_conflate_by_data_symbol(self):
+        """测试按 data 的 symbol 合并"""
+        from qtf.data.models import Quote
+
+        queue = PriorityEventQueue(limits={EventType.TICK: OverflowPolicy.CONFLATE})
+        for price in (1.0, 2.0):
+            quote = Quote(symbol="000001.SZ", last_price=price)
+            queue.put_nowait(Event(type=EventType.TICK, data=quote))
+        assert queue.qsize() == 1
+        assert queue.get_nowait().data.last_price == 2.0
+
+    def test_drop_oldest(self):
+        """测试丢弃最旧事件"""
+        queue = PriorityEventQueue(
+            limits={EventType.BAR: QueueLimit(OverflowPolicy.DROP_OLDEST, maxsize=2)}
+        )
+        for i in range(5):
+            queue.put_nowait(Event(type=EventType.BAR, data=i))
+        queue.put_nowait(Event(type=EventType.ORDER, data="o"))
+
+        assert queue.qsize() == 3
+        assert queue.dropped[EventType.BAR] == 3
+        assert [queue.get_nowait().data for _ in range(3)] == ["o", 3, 4]
+        assert queue.counters() == {"conflated": {}, "dropped": {"bar": 3}}
+
+    def test_block_put_nowait_raises(self):
+        """测试阻塞策略下非阻塞入队抛出 QueueFull"""
+        queue = PriorityEventQueue(limits={EventType.TICK: QueueLimit(maxsize=1)})
+        queue.put_nowait(Event(type=EventType.TICK))
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(Event(type=EventType.TICK))
+        # 其他类型不受影响
+        queue.put_nowait(Event(type=EventType.BAR))
+
+    async def test_block_put_waits(self):
+        """测试阻塞策略下 put 等待空位"""
+        queue = PriorityEventQueue(limits={EventType.TICK: QueueLimit(maxsize=1)})
+        await queue.put(Event(type=EventType.TICK, data=1))
+        producer = asyncio.create_task(queue.put(Event(type=EventType.TICK, data=2)))
+        await asyncio.sleep(0)
+        assert not producer.done()
+
+        assert queue.get_nowait().data == 1
+        await asyncio.wait_for(producer, timeout=1.0)
+        assert queue.get_nowait().data == 2
+
+    async def test_wait_empty_with_conflation(self):
+        """测试合并/丢弃后 wait_empty 仍能完成"""
+        event_loop = EventLoop(limits={
+            EventType.TICK: QueueLimit(OverflowPolicy.CONFLATE, maxsize=2),
+        })
+        received = []
+        event_loop.register(EventType.TICK, lambda e: received.append(e.symbol))
+        for symbol in ("A", "B", "A", "C", "C"):
+            event_loop.put_nowait(TickEvent(type=EventType.TICK, symbol=symbol))
+
+        await event_loop.start()
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+        assert received == ["B", "C"]
+        assert event_loop.counters() == {
+            "conflated": {"tick": 2},
+            "dropped": {"tick": 1},
+        }
+
+
+class TestInstrumentation:
+    """监控测试"""
+
+    def test_histogram_buckets(self):
+        """测试对数分桶的边界与相对误差"""
+        histogram = LogHistogram(precision=3)
+        for index in range(len(histogram.counts) - 1):
+            lower, upper = histogram.bucket_range(index)
+            assert histogram._index(lower) == index
+            assert histogram._index(upper) == index
+            assert histogram.bucket_range(index + 1)[0] == upper + 1
+            assert upper - lower <= max(1, lower / 8)
+
+    def test_histogram_percentiles(self):
+        """测试分位数"""
+        histogram = LogHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+        assert histogram.total == 1000
+        assert (histogram.min, histogram.max) == (1000, 1_000_000)
+        assert histogram.mean == pytest.approx(500_500)
+        assert 500_000 <= histogram.percentile(50) <= 500_000 * 1.125
+        assert 990_000 <= histogram.percentile(99) <= 1_000_000
+        assert histogram.percentile(100) == 1_000_000
+
+        other = LogHistogram()
+        other.record(5)
+        histogram.merge(other)
+        assert (histogram.total, histogram.min) == (1001, 5)
+        snapshot = histogram.snapshot(buckets=True)
+        assert sum(count for _, _, count in snapshot["buckets"]) == 1001
+
+    async def test_disabled_by_default(self, loop):
+        """测试默认不开启监控"""
+        loop.put_nowait(Event(type=EventType.TICK))
+        assert await loop.wait_empty(timeout=1.0)
+        assert loop.stats is None
+        assert loop.snapshot() == {}
+
+    async def test_snapshot(self):
+        """测试监控快照"""
+        event_loop = EventLoop(
+            instrument=True,
+            limits={EventType.TICK: OverflowPolicy.CONFLATE},
+        )
+        exported = []
+        event_loop.stats.add_exporter(exported.append)
+
+        def on_tick(event):
+            pass
+
+        async def on_order(event):
+            await asyncio.sleep(0.001)
+
+        event_loop.register(EventType.TICK, on_tick)
+        event_loop.register(EventType.ORDER, on_order)
+        for symbol in ("A", "B", "A"):
+            event_loop.put_nowait(TickEvent(type=EventType.TICK, symbol=symbol))
+        await event_loop.put(Event(type=EventType.ORDER))
+        assert event_loop.depth(EventType.TICK) == 2
+        assert event_loop.snapshot()["events"]["tick"]["max_depth"] == 2
+
+        await event_loop.start()
+        assert await event_loop.wait_empty(timeout=1.0)
+        await event_loop.stop()
+
+        snapshot = event_loop.snapshot(export=True)
+        assert exported == [snapshot]
+        tick = snapshot["events"]["tick"]
+        assert (tick["enqueued"], tick["dispatched"], tick["depth"]) == (3, 2, 0)
+        assert tick["latency_ns"]["count"] == 2
+        order = snapshot["events"]["order"]
+        assert order["dispatched"] == 1
+        handlers = snapshot["handlers"]
+        assert handlers[on_tick.__qualname__]["count"] == 2
+        assert handlers[on_order.__qualname__]["min"] >= 1_000_000
+        assert snapshot["counters"]["conflated"] == {"tick": 1}
+
+        event_loop.disable_instrumentation()
+        assert event_loop.snapshot() == {}
+
+
+class TestVirtualClock:
+    """虚拟时钟测试"""
+
+    def test_advance_fires_in_time_order(self):
+        """测试定时器按到期时间触发，触发时时钟等于到期时间"""
+        clock = VirtualClock(start_ns=100)
+        fired = []
+        clock.call_at(300, lambda: fired.append(("b", clock.now_ns())))
+        clock.call_at(200, lambda: fired.append(("a", clock.now_ns())))
+        clock.call_at(250, fired.append, "cancelled").cancel()
+        clock.call_at(210, lambda: clock.call_at(320, fired.append, "nested"))
+        clock.call_later(1e-6, fired.append, "later")
+
+        assert clock.advance(350) == 4
+        assert fired == [("a", 200), ("b", 300), "nested"]
+        assert clock.now_ns() == 350
+        assert clock.next_timer_ns() == 1100
+
+        clock.advance(100)
+        assert clock.now_ns() == 350
+        clock.advance(1100)
+        assert fired[-1] == "later"
+
+    async def test_timers_interleave_with_events(self):
+        """测试回放时定时事件按虚拟时间插入事件流"""
+        clock = VirtualClock(start_ns=0)
+        event_loop = EventLoop(clock=clock)
+        seen = []
+        event_loop.register(EventType.TICK, lambda e: seen.append(("tick", e.ts_ns)))
+        event_loop.register(EventType.TIMER, lambda e: seen.append(("timer", e.ts_ns, clock.now_ns())))
+
+        event_loop.post_at(150, Event(EventType.TIMER))
+        event_loop.post_at(250, Event(EventType.TIMER)).cancel()
+        await event_loop.start()
+        for ts in (100, 200, 300):
+            await event_loop.put(TickEvent(symbol="A", ts_ns=ts))
+        await event_loop.wait_empty()
+        await event_loop.stop()
+
+        assert seen == [("tick", 100), ("timer", 150, 150), ("tick", 200), ("tick", 300)]
+        assert clock.now_ns() == 300
+
+    async def test_advance_clock_after_replay(self):
+        """测试回放结束后手动推进时钟 (异步回调被等待)"""
+        event_loop = EventLoop(clock=VirtualClock())
+        seen = []
+
+        async def on_timer(event):
+            seen.append(event.ts_ns)
+
+        event_loop.register(EventType.TIMER, on_timer)
+        event_loop.post_at(500, Event(EventType.TIMER))
+        assert await event_loop.advance_clock(1000) == 1
+        assert seen == [500]
+
+        with pytest.raises(TypeError):
+            await EventLoop().advance_clock(0)
+
+
+class TestTimerWheel:
+    """时间轮测试"""
+
+    def make_wheel(self, start_ns=0, resolution=0.01):
+        clock = VirtualClock(start_ns)
+        fired = []
+        wheel = TimerWheel(clock, lambda e: fired.append((e.data, e.source, clock.now_ns())), resolution)
+        return clock, wheel, fired
+
+    def test_periodic_is_drift_free(self):
+        """测试周期定时器按 起点 + k * 周期 触发，不早于到期时间且延迟小于一个刻度"""
+        clock, wheel, fired = self.make_wheel(start_ns=1_234_567)
+        wheel.schedule("t", 0.25, source="s")
+        clock.advance(1_234_567 + 10 * 250_000_000 + 10_000_000)
+
+        assert [f[:2] for f in fired] == [("t", "s")] * 10
+        for k, (_, _, at) in enumerate(fired, 1):
+            deadline = 1_234_567 + k * 250_000_000
+            assert deadline <= at < deadline + 10_000_000
+        assert len(wheel) == 1
+
+    def test_long_and_one_shot_timers(self):
+        """测试跨层定时器 (含超出最高层范围) 与一次性定时器"""
+        clock, wheel, fired = self.make_wheel(resolution=0.001)
+        wheel.schedule("once", 0.5, periodic=False)
+        wheel.schedule("hour", 3600)
+        wheel.schedule("year", 86400 * 365)        # 超出 64**5 毫秒
+        clock.advance(86400 * 366 * 1_000_000_000)
+
+        hits = {}
+        for timer_id, _, at in fired:
+            hits.setdefault(timer_id, []).append(at)
+        assert hits["once"] == [500_000_000]
+        assert hits["hour"][:2] == [3600 * 10**9, 7200 * 10**9]
+        assert len(hits["hour"]) == 366 * 24
+        assert hits["year"] == [86400 * 365 * 10**9]
+
+    def test_cancel(self):
+        """测试取消 (包括在回调中取消自身)"""
+        clock = VirtualClock()
+        fired = []
+        timers = {}
+
+        def post(event):
+            fired.append(event.data)
+            if event.data == "self":
+                timers["self"].cancel()
+
+        wheel = TimerWheel(clock, post)
+        timers["self"] = wheel.schedule("self", 1)
+        cancelled = wheel.schedule("cancelled", 1)
+        assert cancelled.cancel() and not cancelled.cancel()
+        clock.advance(10 * 10**9)
+        assert fired == ["self"]
+        assert len(wheel) == 0
+
+    async def test_posts_into_event_loop(self):
+        """测试向事件循环发布 TIMER 事件并路由到策略"""
+        clock = VirtualClock(0)
+        event_loop = EventLoop(clock=clock)
+        wheel = TimerWheel.attach(event_loop)
+        seen = []
+        event_loop.register(EventType.TIMER, lambda e: seen.append((e.data, e.source, e.ts_ns)))
+        event_loop.register(EventType.TICK, lambda e: seen.append(("tick", e.ts_ns)))
+
+        wheel.schedule("t", 1.0, source="s")
+        await event_loop.start()
+        for ts in (500_000_000, 2_500_000_000):
+            await event_loop.put(TickEvent(symbol="A", ts_ns=ts))
+        await event_loop.wait_empty()
+        await event_loop.stop()
+
+        assert seen == [
+            ("tick", 500_000_000),
+            ("t", "s", 1_000_000_000),
+            ("t", "s", 2_000_000_000),
+            ("tick", 2_500_000_000),
+        ]
+
+
+def record_ticks(results, loop, index):
+    """子进程分片初始化: 把收到的事件写入结果队列"""
+    loop.register(EventType.TICK, lambda e: results.put((index, e.symbol, e.data)))
+    loop.register(EventType.ACCOUNT, lambda e: results.put((index, "account", e.data)))
+
+
+class TestShardedEventLoop:
+    """分片事件循环测试"""
+
+    @staticmethod
+    def symbols_on_distinct_shards(n_shards):
+        """每个分片各取一个标的"""
+        symbols = {}
+        for i in range(1000):
+            symbol = f"{i:06d}.SZ"
+            symbols.setdefault(shard_index(symbol, n_shards), symbol)
+        return [symbols[i] for i in range(n_shards)]
+
+    def test_shard_of_is_stable(self):
+        """测试同一标的始终进入同一分片"""
+        bus = ShardedEventLoop(n_shards=8)
+        assert bus.shard_of("000001.SZ") == shard_index("000001.SZ", 8)
+        assert bus.shard_of("000001.SZ") == bus.shard_of("000001.SZ")
+        event = TickEvent(type=EventType.TICK, symbol="000001.SZ")
+        assert bus.route(event) == [bus.shards[bus.shard_of("000001.SZ")]]
+        assert bus.route(Event(type=EventType.LOG)) == [bus.shards[0]]
+        assert len(bus.route(Event(type=EventType.ACCOUNT))) == 8
+
+    async def test_per_symbol_order_and_broadcast(self):
+        """测试标的内保持顺序, 账户事件广播"""
+        bus = ShardedEventLoop(n_shards=4)
+        received = {}
+        accounts = []
+
+        async def on_tick(event):
+            await asyncio.sleep(0)
+            received.setdefault(event.symbol, []).append(event.data)
+
+        bus.register(EventType.TICK, on_tick)
+        bus.register(EventType.ACCOUNT, lambda e: accounts.append(e.data))
+        await bus.start()
+        symbols = [f"{i:06d}.SH" for i in range(20)]
+        for i in range(50):
+            for symbol in symbols:
+                bus.put_nowait(TickEvent(type=EventType.TICK, symbol=symbol, data=i))
+        await bus.put(Event(type=EventType.ACCOUNT, data="acc"))
+
+        assert await bus.wait_empty(timeout=2.0)
+        await bus.stop()
+        assert not bus.running
+        assert all(received[s] == list(range(50)) for s in symbols)
+        assert accounts == ["acc"] * 4
+
+    def test_broadcast_copies_per_shard(self):
+        """测试广播事件每个分片一个对象, 入队时刻互不覆盖"""
+        bus = ShardedEventLoop(n_shards=3, instrument=True)
+        event = Event(type=EventType.ACCOUNT, data="acc")
+        bus.put_nowait(event)
+        queued = [shard._queue.get_nowait() for shard in bus.shards]
+        assert len({id(e) for e in queued}) == 3
+        assert all(e.data == "acc" and e.ts_ns == event.ts_ns for e in queued)
+        assert queued[0].enqueue_ns <= queued[1].enqueue_ns <= queued[2].enqueue_ns
+
+    async def test_slow_symbol_does_not_block_others(self):
+        """测试慢标的不阻塞其他分片"""
+        slow, fast = self.symbols_on_distinct_shards(2)
+        bus = ShardedEventLoop(n_shards=2)
+        gate = asyncio.Event()
+        order = []
+
+        async def on_tick(event):
+            if event.symbol == slow:
+                await gate.wait()
+            order.append(event.symbol)
+
+        bus.register(EventType.TICK, on_tick)
+        await bus.start()
+        bus.put_nowait(TickEvent(type=EventType.TICK, symbol=slow))
+        bus.put_nowait(TickEvent(type=EventType.TICK, symbol=fast))
+        assert await bus.shards[1].wait_empty(timeout=1.0)
+        assert order == [fast]
+
+        gate.set()
+        assert await bus.wait_empty(timeout=1.0)
+        await bus.stop()
+        assert order == [fast, slow]
+
+    async def test_tick_batch_split_by_shard(self):
+        """测试批量行情按分片拆分"""
+        from qtf.core.events import TickBatchEvent
+        from qtf.data.batch import QuoteBatch, SymbolTable
+
+        bus = ShardedEventLoop(n_shards=4)
+        received = []
+        bus.register(EventType.TICK_BATCH, lambda e: received.append(e.batch))
+        symbols = [f"{i:06d}.SZ" for i in range(40)]
+        batch = QuoteBatch.from_arrays(SymbolTable(), symbols, last=np.arange(40.0))
+
+        await bus.start()
+        bus.put_nowait(TickBatchEvent(batch))
+        assert await bus.wait_empty(timeout=1.0)
+        await bus.stop()
+
+        assert sum(len(part) for part in received) == 40
+        for part in received:
+            assert len({bus.shard_of(s) for s in part.symbols}) == 1
+        prices = {s: p for part in received for s, p in zip(part.symbols, part.last)}
+        assert prices == {s: float(i) for i, s in enumerate(symbols)}
+
+    async def test_process_shards(self):
+        """测试子进程分片"""
+        results = multiprocessing.get_context().Queue()
+        bus = ShardedEventLoop(
+            n_shards=2,
+            processes=True,
+            setup=functools.partial(record_ticks, results),
+        )
+        with pytest.raises(RuntimeError):
+            bus.register(EventType.TICK, print)
+
+        symbols = self.symbols_on_distinct_shards(2)
+        await bus.start()
+        for i in range(10):
+            for symbol in symbols:
+                bus.put_nowait(TickEvent(type=EventType.TICK, symbol=symbol, data=i))
+        bus.put_nowait(Event(type=EventType.ACCOUNT, data="acc"))
+        assert await bus.wait_empty(timeout=10.0)
+        await bus.stop()
+
+        rows = [results.get(timeout=5.0) for _ in range(22)]
+        for index, symbol in enumerate(symbols):
+            assert [d for i, s, d in rows if s == symbol] == list(range(10))
+            assert {i for i, s, _ in rows if s == symbol} == {index}
+        assert sorted(i for i, s, _ in rows if s == "account") == [0, 1]
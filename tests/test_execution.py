@@ -0,0 +1,140 @@
+"""
+交易执行层测试
+"""
+
+from datetime import datetime
+
+import pytest
+
+from qtf.core.exceptions import OrderError
+from qtf.execution.matching import Fill, MatchingEngine
+from qtf.execution.models import Order, OrderDirection, OrderStatus, OrderType
+from qtf.execution.simulated import SimulatedAccount
+
+
+NOW = datetime(2024, 1, 2, 9, 30)
+
+
+def make_order(direction, price, order_type=OrderType.LIMIT, stop_price=None, volume=100):
+    """构造订单"""
+    return Order(
+        symbol="000001.SZ",
+        direction=direction,
+        price=price,
+        volume=volume,
+        order_type=order_type,
+        stop_price=stop_price,
+    )
+
+
+class TestMatchingEngine:
+    """模拟撮合测试"""
+    
+    def test_limit_orders_only_crossed(self):
+        """测试只成交被穿越的限价单"""
+        engine = MatchingEngine(commission=0.0, slippage=0.0)
+        ladder = [engine.submit(make_order(OrderDirection.BUY, 10.0 - i * 0.1)) for i in range(50)]
+        fills = engine.match("000001.SZ", 10.0, 10.1, 9.75, NOW)
+        assert [f.order_id for f in fills] == ladder[:3]
+        assert fills[0].price == 10.0
+        assert len(engine.book("000001.SZ")) == 47
+    
+    def test_limit_fills_at_better_open(self):
+        """测试跳空时按更优开盘价成交"""
+        engine = MatchingEngine(commission=0.0, slippage=0.0)
+        engine.submit(make_order(OrderDirection.SELL, 10.0))
+        fills = engine.match("000001.SZ", 10.5, 10.6, 10.4, NOW)
+        assert fills[0].price == 10.5
+    
+    def test_stop_and_stop_limit(self):
+        """测试止损单与止损限价单"""
+        engine = MatchingEngine(commission=0.0, slippage=0.01)
+        stop_id = engine.submit(make_order(OrderDirection.SELL, 9.5, OrderType.STOP))
+        stop_limit_id = engine.submit(
+            make_order(OrderDirection.BUY, 10.6, OrderType.STOP_LIMIT, stop_price=10.5)
+        )
+        
+        assert engine.match("000001.SZ", 10.0, 10.2, 9.8, NOW) == []
+        fills = engine.match("000001.SZ", 9.4, 10.7, 9.3, NOW)
+        by_id = {f.order_id: f for f in fills}
+        assert by_id[stop_id].price == pytest.approx(9.4 * 0.99)
+        # 盘中触发的止损限价单不能按触发前的开盘价成交，也不能劣于限价 (不计滑点)
+        assert by_id[stop_limit_id].price == 10.5
+        assert by_id[stop_limit_id].price <= 10.6
+        assert len(fills) == 2
+        assert engine.open_orders == []
+    
+    def test_stop_limit_ignores_pre_trigger_range(self):
+        """测试盘中触发的止损限价单不按触发前的最低价成交"""
+        engine = MatchingEngine(commission=0.0, slippage=0.01)
+        buy_id = engine.submit(
+            make_order(OrderDirection.BUY, 10.4, OrderType.STOP_LIMIT, stop_price=10.5)
+        )
+        sell_id = engine.submit(
+            make_order(OrderDirection.SELL, 9.6, OrderType.STOP_LIMIT, stop_price=9.5)
+        )
+        # 最低价 9.4 / 最高价 10.6 可能出现在触发之前
+        assert engine.match("000001.SZ", 10.0, 10.6, 9.4, NOW) == []
+        assert len(engine.open_orders) == 2
+        
+        # 下一根K线起按限价撮合 (卖单按更优的开盘价)
+        fills = engine.match("000001.SZ", 10.45, 10.5, 10.3, NOW)
+        assert {f.order_id: f.price for f in fills} == {buy_id: 10.4, sell_id: 10.45}
+    
+    def test_market_and_cancel(self):
+        """测试市价单与撤单"""
+        engine = MatchingEngine(commission=0.001, slippage=0.0)
+        order = make_order(OrderDirection.BUY, 0.0, OrderType.MARKET)
+        engine.submit(order)
+        cancelled = engine.submit(make_order(OrderDirection.BUY, 9.0))
+        assert engine.cancel(cancelled)
+        assert not engine.cancel(cancelled)
+        
+        fills = engine.match("000001.SZ", 10.0, 10.0, 8.0, NOW)
+        assert len(fills) == 1
+        assert fills[0].commission == pytest.approx(1.0)
+        assert order.status == OrderStatus.FILLED
+    
+    def test_stale_count_drops_when_popped(self):
+        """测试撤销的委托在弹出时不再计入待清理数"""
+        engine = MatchingEngine(commission=0.0, slippage=0.0)
+        book = engine.book("000001.SZ")
+        ids = [engine.submit(make_order(OrderDirection.BUY, 10.0)) for _ in range(3)]
+        engine.cancel(ids[0])
+        engine.cancel(ids[1])
+        assert book._stale == 2
+        fills = engine.match("000001.SZ", 10.0, 10.0, 9.9, NOW)
+        assert [f.order_id for f in fills] == [ids[2]]
+        assert book._stale == 0
+    
+    def test_invalid_volume(self):
+        """测试非法数量"""
+        with pytest.raises(OrderError):
+            MatchingEngine().submit(make_order(OrderDirection.BUY, 10.0, volume=0))
+
+
+class TestSimulatedAccount:
+    """模拟账户测试"""
+    
+    def fill(self, direction, price, volume, commission=0.0):
+        return Fill("1", "A", direction, price, volume, commission, NOW)
+    
+    def test_round_trip_pnl(self):
+        """测试开平仓盈亏"""
+        account = SimulatedAccount(10000.0)
+        assert account.apply_fill(self.fill(OrderDirection.BUY, 10.0, 100)) is None
+        account.update_price("A", 11.0)
+        assert account.equity == pytest.approx(10100.0)
+        pnl = account.apply_fill(self.fill(OrderDirection.SELL, 12.0, 100, commission=1.0))
+        assert pnl == pytest.approx(199.0)
+        assert account.positions == {}
+        assert account.cash == pytest.approx(10199.0)
+    
+    def test_reverse_position(self):
+        """测试反手"""
+        account = SimulatedAccount(10000.0)
+        account.apply_fill(self.fill(OrderDirection.BUY, 10.0, 100))
+        pnl = account.apply_fill(self.fill(OrderDirection.SELL, 9.0, 150))
+        assert pnl == pytest.approx(-100.0)
+        assert account.quantity("A") == -50
+        assert account.positions["A"].cost_price == 9.0